@@ -1,7 +1,58 @@
 # apps/home/admin.py
+import json
+from datetime import datetime, timezone
+
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
-from .models import ContactMessage, PortfolioCategory, PortfolioItem, PortfolioImage
+from . import profiling
+from .exports import EXPORT_FORMATS, streaming_export_response
+from .models import (
+    ContactMessage,
+    GalleryUpload,
+    ItemDailyViews,
+    Newsletter,
+    PortfolioCategory,
+    PortfolioItem,
+    PortfolioImage,
+    RequestProfile,
+    SlowQuery,
+)
+from .ordering import ReorderError, apply_reorder
+from .signals import notify_bulk_change
+from .uploads import UploadError, append_chunk, max_chunk_size
+
+
+# ----------------------------------------------------------
+# Drag-and-drop reordering (see ordering.py)
+def reorder_view(model_admin, request, queryset, title, image_field=None):
+    """GET -> sortable list of `queryset`; POST {"ids": [...]} -> new order"""
+    if not model_admin.has_change_permission(request):
+        raise PermissionDenied
+    if request.method == "POST":
+        try:
+            ids = [int(pk) for pk in json.loads(request.body)["ids"]]
+            updated = apply_reorder(queryset, ids)
+        except (ValueError, KeyError, TypeError) as e:
+            message = str(e) if isinstance(e, ReorderError) else "ids required"
+            return JsonResponse({"error": message}, status=400)
+        return JsonResponse({"updated": len(updated)})
+
+    rows = []
+    for obj in queryset:
+        image = getattr(obj, image_field) if image_field else None
+        rows.append({"pk": obj.pk, "label": str(obj), "image": image})
+    context = {
+        **model_admin.admin_site.each_context(request),
+        "opts": model_admin.model._meta,
+        "title": title,
+        "rows": rows,
+    }
+    return TemplateResponse(request, "admin/home/reorder.html", context)
 
 
 # ----------------------------------------------------------
@@ -20,6 +71,8 @@ class ContactMessageAdmin(admin.ModelAdmin):
     search_fields = ("name", "email", "subject", "message")
     readonly_fields = ("created_at",)
     list_editable = ("is_read",)
+    actions = ("export_as_csv", "export_as_ndjson")
+    change_list_template = "admin/home/contactmessage/change_list.html"
 
     fieldsets = (
         ("Contact Information", {"fields": ("name", "email", "phone")}),
@@ -28,24 +81,120 @@ class ContactMessageAdmin(admin.ModelAdmin):
         ("Timestamps", {"fields": ("created_at",), "classes": ("collapse",)}),
     )
 
+    def get_urls(self):
+        urls = [
+            path(
+                "export/<str:fmt>/",
+                self.admin_site.admin_view(self.export_view),
+                name="home_contactmessage_export",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def export_view(self, request, fmt):
+        """Stream every row matching the current changelist filters"""
+        if fmt not in EXPORT_FORMATS or not self.has_view_permission(request):
+            raise PermissionDenied
+        changelist = self.get_changelist_instance(request)
+        return streaming_export_response(changelist.get_queryset(request), fmt)
+
+    @admin.action(description="Export selected messages as CSV")
+    def export_as_csv(self, request, queryset):
+        return streaming_export_response(queryset, "csv")
+
+    @admin.action(description="Export selected messages as NDJSON")
+    def export_as_ndjson(self, request, queryset):
+        return streaming_export_response(queryset, "ndjson")
+
+
+# ----------------------------------------------------------
+@admin.register(Newsletter)
+class NewsletterAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "status",
+        "sent_count",
+        "failed_count",
+        "started_at",
+        "finished_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = (
+        "last_recipient",
+        "sent_count",
+        "failed_count",
+        "started_at",
+        "finished_at",
+        "created_at",
+    )
+
+    fieldsets = (
+        ("Content", {"fields": ("subject", "body")}),
+        (
+            "Delivery",
+            {
+                "fields": (
+                    "status",
+                    "last_recipient",
+                    "sent_count",
+                    "failed_count",
+                    "started_at",
+                    "finished_at",
+                    "created_at",
+                )
+            },
+        ),
+    )
+
 
 # ----------------------------------------------------------
 @admin.register(PortfolioCategory)
 class PortfolioCategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "slug", "order", "items_count", "is_active")
-    list_editable = ("order", "is_active")
+    list_display = (
+        "name",
+        "slug",
+        "order",
+        "items_count",
+        "reorder_items",
+        "is_active",
+    )
+    list_editable = ("is_active",)
     list_filter = ("is_active",)
     search_fields = ("name", "description")
     prepopulated_fields = {"slug": ("name",)}
 
     def items_count(self, obj):
-        count = obj.items.filter(is_active=True).count()
         return format_html(
             '<span style="background-color: #28a745; color: white; padding: 3px 8px; border-radius: 3px;">{}</span>',
-            count,
+            obj.active_items_count,
         )
 
     items_count.short_description = "Active Items"
+    items_count.admin_order_field = "active_items_count"
+
+    def reorder_items(self, obj):
+        return format_html(
+            '<a href="{}">Reorder</a>',
+            reverse("admin:home_portfolioitem_reorder", args=[obj.pk]),
+        )
+
+    reorder_items.short_description = "Items"
+
+    def get_urls(self):
+        urls = [
+            path(
+                "reorder/",
+                self.admin_site.admin_view(self.reorder_view),
+                name="home_portfoliocategory_reorder",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def reorder_view(self, request):
+        return reorder_view(
+            self, request, PortfolioCategory.objects.all(), "Reorder categories"
+        )
 
 
 # ----------------------------------------------------------
@@ -78,8 +227,9 @@ class PortfolioItemAdmin(admin.ModelAdmin):
         "order",
         "created_at",
     )
-    list_editable = ("order", "is_featured", "is_active")
+    list_editable = ("is_featured", "is_active")
     list_filter = ("category", "is_featured", "is_active", "created_at")
+    change_form_template = "admin/home/portfolioitem/change_form.html"
     search_fields = ("title", "short_description", "full_description", "technologies")
     prepopulated_fields = {"slug": ("title",)}
     date_hierarchy = "created_at"
@@ -120,13 +270,120 @@ class PortfolioItemAdmin(admin.ModelAdmin):
 
     class Media:
         css = {"all": ("admin/css/custom_admin.css",)}
+        js = ("admin/js/gallery_upload.js",)
+
+    # ------------------------------------------------------
+    # Reordering the items of a category and the images of a gallery
+    def reorder_view(self, request, category_id):
+        category = get_object_or_404(PortfolioCategory, pk=category_id)
+        return reorder_view(
+            self,
+            request,
+            category.items.all(),
+            f"Reorder {category.name} projects",
+            image_field="thumbnail",
+        )
+
+    def gallery_reorder_view(self, request, object_id):
+        item = get_object_or_404(PortfolioItem, pk=object_id)
+        response = reorder_view(
+            self,
+            request,
+            item.gallery_images.all(),
+            f"Reorder the {item.title} gallery",
+            image_field="image",
+        )
+        if request.method == "POST" and response.status_code == 200:
+            notify_bulk_change(PortfolioItem, [item.pk])
+        return response
+
+    # ------------------------------------------------------
+    # Chunked gallery uploads (see uploads.py)
+    def get_urls(self):
+        urls = [
+            path(
+                "reorder/<int:category_id>/",
+                self.admin_site.admin_view(self.reorder_view),
+                name="home_portfolioitem_reorder",
+            ),
+            path(
+                "<int:object_id>/gallery/reorder/",
+                self.admin_site.admin_view(self.gallery_reorder_view),
+                name="home_portfolioitem_gallery_reorder",
+            ),
+            path(
+                "<int:object_id>/gallery-uploads/",
+                self.admin_site.admin_view(self.gallery_upload_create_view),
+                name="home_portfolioitem_gallery_upload",
+            ),
+            path(
+                "gallery-uploads/<uuid:upload_id>/",
+                self.admin_site.admin_view(self.gallery_upload_view),
+                name="home_portfolioitem_gallery_upload_status",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def _upload_payload(self, upload):
+        return {
+            "id": str(upload.pk),
+            "offset": upload.received,
+            "size": upload.size,
+            "status": upload.status,
+            "images_created": upload.images_created,
+            "error": upload.error,
+            "chunk_size": max_chunk_size(),
+        }
+
+    def gallery_upload_create_view(self, request, object_id):
+        """POST {"filename", "size"} -> new upload session"""
+        if request.method != "POST":
+            return JsonResponse({"error": "POST required"}, status=405)
+        item = get_object_or_404(PortfolioItem, pk=object_id)
+        if not self.has_change_permission(request, item):
+            raise PermissionDenied
+        try:
+            data = json.loads(request.body)
+            filename = str(data["filename"])[:255]
+            size = int(data["size"])
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({"error": "filename and size required"}, status=400)
+        if size <= 0:
+            return JsonResponse({"error": "Empty file"}, status=400)
+        upload = GalleryUpload.objects.create(
+            portfolio_item=item, filename=filename, size=size
+        )
+        return JsonResponse(self._upload_payload(upload), status=201)
+
+    def gallery_upload_view(self, request, upload_id):
+        """GET -> status / resume offset; PUT with Upload-Offset -> append chunk"""
+        upload = get_object_or_404(GalleryUpload, pk=upload_id)
+        if not self.has_change_permission(request, upload.portfolio_item):
+            raise PermissionDenied
+        if request.method == "GET":
+            return JsonResponse(self._upload_payload(upload))
+        if request.method != "PUT":
+            return JsonResponse({"error": "GET or PUT required"}, status=405)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+            append_chunk(upload, request, offset, length)
+        except (KeyError, ValueError):
+            return JsonResponse(
+                {"error": "Upload-Offset and Content-Length required"}, status=400
+            )
+        except UploadError as e:
+            upload.refresh_from_db()
+            return JsonResponse(
+                {"error": str(e), **self._upload_payload(upload)}, status=409
+            )
+        return JsonResponse(self._upload_payload(upload))
 
 
 @admin.register(PortfolioImage)
 class PortfolioImageAdmin(admin.ModelAdmin):
     list_display = ("portfolio_item", "image_preview", "caption", "order")
     list_filter = ("portfolio_item__category",)
-    list_editable = ("order",)
 
     def image_preview(self, obj):
         if obj.image:
@@ -137,3 +394,174 @@ class PortfolioImageAdmin(admin.ModelAdmin):
         return "-"
 
     image_preview.short_description = "Preview"
+
+
+# ----------------------------------------------------------
+# Request profiles (stored on disk, see profiling.py)
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<str:profile_id>/download/<str:fmt>/",
+                self.admin_site.admin_view(self.download_view),
+                name="home_requestprofile_download",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def _load(self, request, profile_id):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = profiling.load_profile(profile_id)
+        if profile is None:
+            raise Http404("Profile not found")
+        profile["created_at"] = datetime.fromtimestamp(profile["created"], timezone.utc)
+        return profile
+
+    def changelist_view(self, request, extra_context=None):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profiles = []
+        for profile_id in profiling.profile_ids():
+            profile = profiling.load_profile(profile_id)
+            if profile is None:  # pruned meanwhile
+                continue
+            profiles.append(
+                {
+                    "id": profile_id,
+                    "created_at": datetime.fromtimestamp(
+                        profile["created"], timezone.utc
+                    ),
+                    "method": profile["method"],
+                    "path": profile["path"],
+                    "view": profile["view"],
+                    "status": profile["status"],
+                    "duration_ms": profile["duration"] * 1000,
+                    "query_count": len(profile["queries"]),
+                }
+            )
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Request profiles",
+            "profiles": profiles,
+            "token_header": profiling.TOKEN_HEADER,
+            "token": profiling.make_token(),
+            "query_parameter": profiling.QUERY_PARAMETER,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(
+            request, "admin/home/requestprofile/change_list.html", context
+        )
+
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        profile = self._load(request, object_id)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": f"{profile['method']} {profile['path']}",
+            "profile": profile,
+            "duration_ms": profile["duration"] * 1000,
+            "summary": profiling.summarize(profile),
+            **(extra_context or {}),
+        }
+        return TemplateResponse(
+            request, "admin/home/requestprofile/detail.html", context
+        )
+
+    def download_view(self, request, profile_id, fmt):
+        profile = self._load(request, profile_id)
+        if fmt == "folded":
+            response = HttpResponse(
+                profiling.collapsed_stacks(profile), content_type="text/plain"
+            )
+        elif fmt == "json":
+            profile.pop("created_at")
+            response = JsonResponse(profile)
+        else:
+            raise Http404("Unknown format")
+        response["Content-Disposition"] = (
+            f'attachment; filename="profile-{profile_id}.{fmt}"'
+        )
+        return response
+
+
+# ----------------------------------------------------------
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "duration",
+        "view",
+        "call_site",
+        "short_sql",
+        "plan_status",
+    )
+    list_filter = ("plan_status", "view")
+    search_fields = ("sql", "call_site", "fingerprint")
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "created_at",
+        "duration_ms",
+        "view",
+        "call_site",
+        "fingerprint",
+        "sql",
+        "params",
+        "plan_status",
+        "formatted_plan",
+    )
+    fields = readonly_fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def duration(self, obj):
+        return f"{obj.duration_ms:.0f} ms"
+
+    duration.short_description = "Duration"
+    duration.admin_order_field = "duration_ms"
+
+    def short_sql(self, obj):
+        return obj.sql if len(obj.sql) <= 80 else obj.sql[:80] + "…"
+
+    short_sql.short_description = "SQL"
+
+    def formatted_plan(self, obj):
+        if not obj.plan:
+            return "-"
+        return format_html(
+            '<pre style="white-space: pre-wrap; margin: 0;">{}</pre>', obj.plan
+        )
+
+    formatted_plan.short_description = "Plan"
+
+
+# ----------------------------------------------------------
+@admin.register(ItemDailyViews)
+class ItemDailyViewsAdmin(admin.ModelAdmin):
+    list_display = ("date", "item", "views")
+    list_filter = ("item__category",)
+    list_select_related = ("item",)
+    search_fields = ("item__title",)
+    date_hierarchy = "date"
+    readonly_fields = ("item", "date", "views")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,217 @@
+# apps/home/analytics.py
+import atexit
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import fragment_cache, metrics
+from .models import ItemDailyViews, PortfolioItem
+from .warmup import WARMUP_HEADER
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Buffered page-view analytics
+#
+# A portfolio_detail hit only increments an in-process counter keyed on
+# (item, day) under a lock. A background thread per worker merges the
+# counters into ItemDailyViews every ANALYTICS_FLUSH_INTERVAL seconds with
+# one batched INSERT ... ON CONFLICT DO UPDATE (PostgreSQL, SQLite), and
+# once more when the worker exits. At most ANALYTICS_MAX_PENDING keys are
+# buffered; views of further items are dropped until the next flush.
+# Pages answered by the CDN never reach Django and are not counted.
+
+# Crawlers and link previews are not views
+BOT_RE = re.compile(r"bot|crawl|spider|slurp|preview|monitor|curl|wget", re.IGNORECASE)
+
+# Bumped after every flush; "most viewed" fragments vary on it
+RANKING_DEPENDENCY = fragment_cache.dependency_key("home.itemdailyviews")
+
+BATCH_SIZE = 500
+
+_lock = threading.Lock()
+_pending = Counter()
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def is_enabled():
+    return getattr(settings, "ANALYTICS_ENABLED", True)
+
+
+def get_flush_interval():
+    return getattr(settings, "ANALYTICS_FLUSH_INTERVAL", 30)
+
+
+def should_count(request):
+    if request.method != "GET" or WARMUP_HEADER in request.headers:
+        return False
+    # Speculative loads (<link rel=prefetch>, Speculation Rules)
+    if "prefetch" in request.headers.get(
+        "Sec-Purpose", request.headers.get("Purpose", "")
+    ):
+        return False
+    return not BOT_RE.search(request.headers.get("User-Agent", ""))
+
+
+# ----------------------------------------------------------
+# Request path
+def record_view(request, item_id):
+    """Count one view of `item_id`; constant time, no database access"""
+    if not is_enabled() or not should_count(request):
+        return
+    key = (item_id, timezone.localdate())
+    with _lock:
+        if key in _pending or len(_pending) < getattr(
+            settings, "ANALYTICS_MAX_PENDING", 10000
+        ):
+            _pending[key] += 1
+            counted = True
+        else:
+            counted = False
+    metrics.ITEM_VIEWS.inc(result="counted" if counted else "dropped")
+    _start_flusher()
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_run_flusher, daemon=True)
+            _flusher.start()
+
+
+def _run_flusher():
+    while True:
+        time.sleep(get_flush_interval())
+        try:
+            flush()
+        except Exception:
+            logger.exception("Flushing page views failed")
+        finally:
+            close_old_connections()
+
+
+# ----------------------------------------------------------
+# Flushing
+def flush():
+    """Write the buffered counts to ItemDailyViews; returns the rows written"""
+    with _lock:
+        if not _pending:
+            return 0
+        batch = dict(_pending)
+        _pending.clear()
+    try:
+        written = upsert(batch)
+    except Exception:
+        # Keep the counts for the next attempt
+        with _lock:
+            _pending.update(batch)
+        raise
+    if written:
+        fragment_cache.touch([RANKING_DEPENDENCY])
+    return written
+
+
+def upsert(counts):
+    """Add {(item_id, date): views} to the daily rows in batches"""
+    with transaction.atomic():
+        # Items deleted since they were viewed would violate the foreign key
+        existing = set(
+            PortfolioItem.objects.filter(
+                pk__in={item_id for item_id, _ in counts}
+            ).values_list("pk", flat=True)
+        )
+        rows = [
+            (item_id, date, views)
+            for (item_id, date), views in sorted(counts.items())
+            if item_id in existing
+        ]
+
+        qn = connection.ops.quote_name
+        table = qn(ItemDailyViews._meta.db_table)
+        item, date, views = (
+            qn(ItemDailyViews._meta.get_field(name).column)
+            for name in ("item", "date", "views")
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), BATCH_SIZE):
+                chunk = rows[start : start + BATCH_SIZE]
+                values = ", ".join(["(%s, %s, %s)"] * len(chunk))
+                cursor.execute(
+                    f"INSERT INTO {table} ({item}, {date}, {views}) VALUES {values} "
+                    f"ON CONFLICT ({item}, {date}) "
+                    f"DO UPDATE SET {views} = {table}.{views} + EXCLUDED.{views}",
+                    [value for row in chunk for value in row],
+                )
+    return len(rows)
+
+
+def _flush_at_exit():
+    try:
+        flush()
+    except Exception:
+        logger.exception("Flushing page views at exit failed")
+
+
+atexit.register(_flush_at_exit)
+
+
+def _reset_after_fork():
+    # Threads do not survive fork(); the flusher is restarted lazily
+    global _lock, _pending, _flusher, _flusher_lock
+    _lock = threading.Lock()
+    _pending = Counter()
+    _flusher = None
+    _flusher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ----------------------------------------------------------
+# Reading
+def ranking_version():
+    """Changes whenever new view counts have been written"""
+    return fragment_cache.get_cache().get(RANKING_DEPENDENCY, "")
+
+
+def with_recent_views(queryset, days=None):
+    """Annotate items with `recent_views`, the views of the last `days` days"""
+    if days is None:
+        days = getattr(settings, "ANALYTICS_POPULAR_DAYS", 30)
+    since = timezone.localdate() - timedelta(days=days - 1)
+    views = (
+        ItemDailyViews.objects.filter(item=OuterRef("pk"), date__gte=since)
+        .order_by()
+        .values("item")
+        .annotate(total=Sum("views"))
+        .values("total")
+    )
+    return queryset.annotate(
+        recent_views=Coalesce(Subquery(views, output_field=IntegerField()), 0)
+    )
+
+
+def sort_order(request):
+    """The ?sort= of a listing: "popular" or "" (the default ordering)"""
+    return "popular" if request.GET.get("sort") == "popular" else ""
+
+
+def most_viewed(queryset, days=None):
+    """`queryset` ordered by recent views, then by its usual ordering"""
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return with_recent_views(queryset, days).order_by("-recent_views", *ordering)
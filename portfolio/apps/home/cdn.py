@@ -0,0 +1,199 @@
+# apps/home/cdn.py
+import atexit
+import json
+import logging
+import os
+import threading
+import urllib.request
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Surrogate keys
+#
+# Pages are tagged with the rows they render ("item-3", "category-1",
+# "image-7") plus list keys for pages whose membership changes when rows
+# are added or removed. Signal handlers purge exactly those keys: the keys
+# of one transaction are collected and, once it commits, sent by a
+# background thread in as few requests as CDN_PURGE_BATCH_SIZE allows, so
+# an admin save with inlines does not wait for one purge per row.
+
+KEY_PREFIXES = {
+    "home.portfoliocategory": "category",
+    "home.portfolioitem": "item",
+    "home.portfolioimage": "image",
+}
+
+ITEM_LIST_KEY = "portfolio-items"
+CATEGORY_LIST_KEY = "portfolio-categories"
+
+LIST_KEYS = {
+    "home.portfoliocategory": CATEGORY_LIST_KEY,
+    "home.portfolioitem": ITEM_LIST_KEY,
+}
+
+
+def model_key(model, pk):
+    return f"{KEY_PREFIXES[model._meta.label_lower]}-{pk}"
+
+
+def model_keys(model, pks):
+    return [model_key(model, pk) for pk in pks]
+
+
+def list_key(model):
+    return LIST_KEYS.get(model._meta.label_lower)
+
+
+def add_surrogate_keys(response, keys):
+    """Tag a response for Fastly (Surrogate-Key) and Cloudflare (Cache-Tag)"""
+    keys = sorted(set(keys))
+    if keys:
+        response["Surrogate-Key"] = " ".join(keys)
+        response["Cache-Tag"] = ",".join(keys)
+    return response
+
+
+# ----------------------------------------------------------
+# Purge backends (CDN_PURGE_BACKEND setting)
+class BasePurgeBackend:
+    def purge(self, keys):
+        raise NotImplementedError
+
+
+class NullPurgeBackend(BasePurgeBackend):
+    def purge(self, keys):
+        pass
+
+
+class LocMemPurgeBackend(BasePurgeBackend):
+    """Records purged keys in memory; for tests and local development"""
+
+    purged = []
+
+    def purge(self, keys):
+        self.purged.extend(keys)
+
+
+class HTTPPurgeBackend(BasePurgeBackend):
+    """
+    POSTs {"<CDN_PURGE_FIELD>": [keys...]} as JSON to CDN_PURGE_URL, in
+    batches of CDN_PURGE_BATCH_SIZE, with CDN_PURGE_TOKEN as bearer token.
+    The defaults match Cloudflare's purge_cache API ("tags").
+    """
+
+    def __init__(self):
+        self.url = settings.CDN_PURGE_URL
+        self.token = getattr(settings, "CDN_PURGE_TOKEN", "")
+        self.field = getattr(settings, "CDN_PURGE_FIELD", "tags")
+        self.batch_size = getattr(settings, "CDN_PURGE_BATCH_SIZE", 30)
+        self.timeout = getattr(settings, "CDN_PURGE_TIMEOUT", 5)
+
+    def purge(self, keys):
+        for start in range(0, len(keys), self.batch_size):
+            body = json.dumps({self.field: keys[start : start + self.batch_size]})
+            request = urllib.request.Request(
+                self.url,
+                data=body.encode(),
+                method="POST",
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {self.token}",
+                },
+            )
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+
+
+@lru_cache(maxsize=None)
+def get_purge_backend():
+    path = getattr(settings, "CDN_PURGE_BACKEND", "apps.home.cdn.NullPurgeBackend")
+    return import_string(path)()
+
+
+def purge(keys):
+    keys = sorted(set(keys))
+    if not keys:
+        return
+    try:
+        get_purge_backend().purge(keys)
+    except Exception as e:
+        logger.error("CDN purge of %s failed: %s", keys, e)
+
+
+# ----------------------------------------------------------
+# Purging after commit, off the request thread
+_pending = threading.local()
+_queue_lock = threading.Lock()
+_queued = set()
+_sender = None
+
+
+def schedule_purge(keys):
+    """Purge `keys` after the current transaction commits (now outside one)"""
+    pending = getattr(_pending, "keys", None)
+    if pending is None:
+        pending = _pending.keys = set()
+    pending.update(keys)
+    # Every call registers a callback; the first one to run takes the keys,
+    # so keys of a rolled-back transaction go out with the next commit
+    transaction.on_commit(_queue_pending)
+
+
+def _queue_pending():
+    keys = getattr(_pending, "keys", None)
+    _pending.keys = None
+    if keys:
+        with _queue_lock:
+            _queued.update(keys)
+        _start_sender()
+
+
+def _start_sender():
+    global _sender
+    with _queue_lock:
+        if _sender is None:
+            _sender = threading.Thread(target=_send_in_thread, daemon=True)
+            _sender.start()
+
+
+def _send_in_thread():
+    global _sender
+    try:
+        send_pending()
+    finally:
+        with _queue_lock:
+            _sender = None
+        # Keys queued after the last check get a new sender
+        if _queued:
+            _start_sender()
+
+
+def send_pending():
+    """Purge every queued key; returns the number of keys purged"""
+    with _queue_lock:
+        keys = list(_queued)
+        _queued.clear()
+    purge(keys)
+    return len(keys)
+
+
+atexit.register(send_pending)
+
+
+def _reset_after_fork():
+    # Threads do not survive fork(); the sender is restarted lazily
+    global _pending, _queue_lock, _queued, _sender
+    _pending = threading.local()
+    _queue_lock = threading.Lock()
+    _queued = set()
+    _sender = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,44 @@
+# apps/home/checks.py
+from django.core.checks import Tags, Warning, register
+
+from . import fragment_cache, sitemap
+
+
+# ----------------------------------------------------------
+# Deployment checks (manage.py check --deploy)
+@register(Tags.caches, deploy=True)
+def check_shared_fragment_cache(app_configs, **kwargs):
+    """Fragment version tokens only reach every worker through a shared cache"""
+    if not fragment_cache.is_process_local(fragment_cache.get_cache()):
+        return []
+    return [
+        Warning(
+            "FRAGMENT_CACHE_ALIAS points to a per-process cache.",
+            hint=(
+                "With more than one worker an edit only invalidates the "
+                "fragments of the worker that saved it; the others serve "
+                "stale fragments for up to FRAGMENT_CACHE_LOCAL_TIMEOUT "
+                "seconds. Set REDIS_URL to share the cache."
+            ),
+            id="home.W001",
+        )
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_sitemap_cache(app_configs, **kwargs):
+    """The prebuilt sitemap and feed are refreshed in the saving worker only"""
+    if not fragment_cache.is_process_local(sitemap.get_cache()):
+        return []
+    return [
+        Warning(
+            "SITEMAP_CACHE_ALIAS points to a per-process cache.",
+            hint=(
+                "With more than one worker the other workers serve the "
+                "sitemap and feed from before an edit for up to "
+                "SITEMAP_LOCAL_TIMEOUT seconds. Set REDIS_URL to share the "
+                "cache."
+            ),
+            id="home.W002",
+        )
+    ]
@@ -0,0 +1,175 @@
+# apps/home/compression.py
+import hashlib
+import re
+import secrets
+import struct
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import has_vary_header
+
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# ----------------------------------------------------------
+# Response compression
+#
+# Buffered responses are compressed once per distinct body: the compressed
+# bytes are cached under a hash of the body and encoding, so a page served
+# from the fragment cache (same bytes every time) is never compressed
+# twice. Streaming responses are compressed chunk by chunk and flushed
+# after every chunk, so compression does not hold back early bytes.
+#
+# BREACH: a compressed page that reflects attacker input next to a secret
+# leaks the secret through its length. Responses that may carry one (they
+# vary on Cookie, e.g. a CSRF token was rendered, or the visitor has a
+# session) are gzipped with a random-length file name in the gzip header,
+# like Django's GZipMiddleware ("Heal the BREACH"). They are never cached
+# and never brotli-encoded (brotli has no header field to pad). Public
+# anonymous pages are unaffected.
+
+COMPRESSIBLE_TYPES_RE = re.compile(
+    r"^(text/|application/(json|javascript|xml|atom\+xml|rss\+xml)|image/svg\+xml)"
+)
+
+KEY_PREFIX = "compressed"
+
+
+def get_cache():
+    return caches[getattr(settings, "COMPRESSION_CACHE_ALIAS", "default")]
+
+
+def min_size():
+    return getattr(settings, "COMPRESSION_MIN_SIZE", 200)
+
+
+def is_compressible(content_type):
+    return bool(COMPRESSIBLE_TYPES_RE.match(content_type or ""))
+
+
+def carries_secrets(request, response):
+    """True if the response may contain a per-visitor secret"""
+    # Added by the CSRF middleware once a token was rendered, and by the
+    # session middleware once the session was read
+    if has_vary_header(response, "Cookie"):
+        return True
+    # The session cookie, not request.user: that would load the session
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def max_random_bytes():
+    return getattr(settings, "COMPRESSION_MAX_RANDOM_BYTES", 100)
+
+
+def random_padding():
+    limit = max_random_bytes()
+    return secrets.randbelow(limit) if limit > 0 else 0
+
+
+def accepted_encoding(accept_encoding, padded=False):
+    """
+    The best encoding the client accepts: "br", "gzip" or None. With
+    `padded` only encodings that can be padded (gzip).
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        accepted[name.strip().lower()] = quality
+
+    if not padded and brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+# ----------------------------------------------------------
+# Compressors
+def gzip_level():
+    return getattr(settings, "COMPRESSION_GZIP_LEVEL", 6)
+
+
+def brotli_quality():
+    return getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+
+
+class GzipCompressor:
+    """
+    zlib.compressobj() for the gzip format, with `padding` bytes of file
+    name in the header
+    """
+
+    def __init__(self, padding=0):
+        self.deflate = zlib.compressobj(gzip_level(), zlib.DEFLATED, -zlib.MAX_WBITS)
+        self.crc = 0
+        self.size = 0
+        flags = 0x08 if padding else 0  # FNAME
+        # magic, deflate, flags, mtime 0, no extra flags, unknown OS
+        self.header = struct.pack("<BBBBIBB", 0x1F, 0x8B, 8, flags, 0, 0, 255)
+        if padding:
+            self.header += b"a" * padding + b"\0"
+
+    def _take_header(self):
+        header, self.header = self.header, b""
+        return header
+
+    def compress(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        return self._take_header() + self.deflate.compress(data)
+
+    def flush(self, mode=zlib.Z_FINISH):
+        data = self._take_header() + self.deflate.flush(mode)
+        if mode == zlib.Z_FINISH:
+            data += struct.pack("<II", self.crc, self.size & 0xFFFFFFFF)
+        return data
+
+
+def compress(data, encoding, padding=0):
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality())
+    compressor = GzipCompressor(padding)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_cached(data, encoding):
+    """Compress `data`, reusing the result for bodies seen before"""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    key = f"{KEY_PREFIX}:{encoding}:{digest}"
+    cache = get_cache()
+    compressed = cache.get(key)
+    metrics.cache_lookup("compression", hit=compressed is not None)
+    if compressed is None:
+        compressed = compress(data, encoding)
+        cache.set(key, compressed, getattr(settings, "COMPRESSION_CACHE_TIMEOUT", 3600))
+    return compressed
+
+
+def compress_stream(chunks, encoding, padding=0):
+    """Compress an iterable of byte chunks, flushing after each one"""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=brotli_quality())
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = GzipCompressor(padding)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
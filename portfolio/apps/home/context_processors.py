@@ -1,5 +1,9 @@
 # apps/home/context_processors.py
 
+from django.conf import settings
+
+from . import service_worker
+from .counters import active_items_total
 from .models import PortfolioCategory, PortfolioItem
 
 
@@ -12,5 +16,8 @@ def portfolio_context(request):
         "featured_portfolio_items": PortfolioItem.objects.filter(
             is_active=True, is_featured=True
         ).select_related("category")[:6],
-        "portfolio_items_count": PortfolioItem.objects.filter(is_active=True).count(),
+        "portfolio_items_count": active_items_total,
+        # Registered once built: /sw.js is a 404 until then
+        "service_worker_enabled": getattr(settings, "SERVICE_WORKER_ENABLED", False)
+        and service_worker.is_built(),
     }
@@ -0,0 +1,95 @@
+# apps/home/counters.py
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import PortfolioCategory, PortfolioItem, PortfolioStats
+
+# ----------------------------------------------------------
+# Denormalized active-item counters
+#
+# PortfolioCategory.active_items_count and PortfolioStats.active_items_count
+# are kept up to date with F() increments from the PortfolioItem signals,
+# in the same transaction as the change. An item counts while it is
+# active; it is identified by its (category_id, is_active) state before
+# (read from the locked row) and after a save. Writes that bypass signals
+# (queryset.update(), bulk_create()) are fixed by reconcile_counters(),
+# also run by the reconcile_counters management command; until then a
+# drifted counter stops at zero rather than failing the save.
+
+
+def apply_item_change(before, after):
+    """
+    Adjust the counters for one item going from `before` to `after`, each
+    a (category_id, is_active) pair or None (item did not exist).
+    """
+    deltas = Counter()
+    if before is not None and before[1]:
+        deltas[before[0]] -= 1
+    if after is not None and after[1]:
+        deltas[after[0]] += 1
+
+    total = 0
+    for category_id, delta in deltas.items():
+        if delta:
+            PortfolioCategory.objects.filter(pk=category_id).update(
+                active_items_count=Greatest(F("active_items_count") + delta, 0)
+            )
+            total += delta
+    if total:
+        updated = PortfolioStats.objects.filter(pk=PortfolioStats.SINGLETON_PK).update(
+            active_items_count=Greatest(F("active_items_count") + total, 0)
+        )
+        if not updated:
+            reconcile_counters()  # the stats row is missing
+
+
+def active_items_total():
+    """The global active-item count (one primary-key lookup)"""
+    total = (
+        PortfolioStats.objects.filter(pk=PortfolioStats.SINGLETON_PK)
+        .values_list("active_items_count", flat=True)
+        .first()
+    )
+    return total if total is not None else reconcile_counters()[0]
+
+
+def reconcile_counters():
+    """
+    Recount from PortfolioItem and fix any drift. Returns the total and the
+    number of counters (categories and the global one) that were wrong.
+    """
+    with transaction.atomic():
+        # Lock with a plain SELECT and count separately: PostgreSQL rejects
+        # FOR UPDATE on a query with GROUP BY
+        categories = list(
+            PortfolioCategory.objects.select_for_update()
+            .order_by("pk")
+            .values_list("pk", "active_items_count")
+        )
+        actual = dict(
+            PortfolioItem.objects.filter(is_active=True)
+            .order_by()
+            .values("category_id")
+            .annotate(count=Count("pk"))
+            .values_list("category_id", "count")
+        )
+        stale = [
+            PortfolioCategory(pk=pk, active_items_count=actual.get(pk, 0))
+            for pk, count in categories
+            if count != actual.get(pk, 0)
+        ]
+        PortfolioCategory.objects.bulk_update(stale, ["active_items_count"])
+
+        total = PortfolioItem.objects.filter(is_active=True).count()
+        stats, created = PortfolioStats.objects.select_for_update().get_or_create(
+            pk=PortfolioStats.SINGLETON_PK, defaults={"active_items_count": total}
+        )
+        drifted = len(stale)
+        if stats.active_items_count != total:
+            stats.active_items_count = total
+            stats.save(update_fields=["active_items_count"])
+            drifted += 1
+    return total, drifted
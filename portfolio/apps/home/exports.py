@@ -0,0 +1,73 @@
+# apps/home/exports.py
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# ----------------------------------------------------------
+# Contact message export (CSV / NDJSON)
+CONTACT_EXPORT_FIELDS = (
+    "id",
+    "name",
+    "email",
+    "phone",
+    "subject",
+    "category",
+    "urgency",
+    "message",
+    "subscribe_newsletter",
+    "is_read",
+    "created_at",
+)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """Pseudo-buffer for csv.writer: returns the row instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_contact_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield contact messages as tuples, fetched with a server-side cursor"""
+    return queryset.values_list(*CONTACT_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def iter_csv(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CONTACT_EXPORT_FIELDS)
+    for row in iter_contact_rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+def iter_ndjson(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in iter_contact_rows(queryset, chunk_size):
+        yield encoder.encode(dict(zip(CONTACT_EXPORT_FIELDS, row))) + "\n"
+
+
+def iter_export(queryset, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    if fmt == "csv":
+        return iter_csv(queryset, chunk_size)
+    if fmt == "ndjson":
+        return iter_ndjson(queryset, chunk_size)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def streaming_export_response(queryset, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Build a StreamingHttpResponse that sends rows as they are fetched"""
+    filename = f"contact-messages-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+    response = StreamingHttpResponse(
+        iter_export(queryset, fmt, chunk_size),
+        content_type=f"{EXPORT_FORMATS[fmt]}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
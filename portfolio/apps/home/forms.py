@@ -5,8 +5,28 @@ from django.core.validators import MinLengthValidator
 from django.core.mail import send_mail, EmailMessage
 from django.conf import settings
 from django.template.loader import render_to_string
+from . import metrics
 from .models import ContactMessage
+import logging
 import re
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_send(kind, *args, **kwargs):
+    """send_mail() recording success/failure and latency per email kind"""
+    started = time.perf_counter()
+    try:
+        sent = send_mail(*args, **kwargs)
+    except Exception:
+        metrics.EMAILS.inc(kind=kind, result="failure")
+        raise
+    finally:
+        metrics.EMAIL_DURATION.observe(time.perf_counter() - started, kind=kind)
+    # With fail_silently=True failures come back as 0 sent
+    metrics.EMAILS.inc(kind=kind, result="success" if sent else "failure")
+    return sent
 
 
 class ContactForm(forms.Form):
@@ -178,7 +198,8 @@ class ContactForm(forms.Form):
                 Newsletter Subscription: {'Yes' if self.cleaned_data['subscribe_newsletter'] else 'No'}
                             """
 
-            send_mail(
+            _timed_send(
+                "admin_notification",
                 admin_subject,
                 admin_message,
                 settings.DEFAULT_FROM_EMAIL,
@@ -197,7 +218,8 @@ class ContactForm(forms.Form):
                 The Team
                             """
 
-            send_mail(
+            _timed_send(
+                "thank_you",
                 user_subject,
                 user_message,
                 settings.DEFAULT_FROM_EMAIL,
@@ -206,6 +228,6 @@ class ContactForm(forms.Form):
             )
 
             return True
-        except Exception as e:
-            print(f"Email sending failed: {e}")
+        except Exception:
+            logger.exception("Sending contact form emails failed")
             return False
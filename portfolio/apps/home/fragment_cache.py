@@ -0,0 +1,167 @@
+# apps/home/fragment_cache.py
+import hashlib
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Model
+from django.db.models.query import QuerySet
+
+from . import metrics
+
+# ----------------------------------------------------------
+# Template fragment cache with model-dependency invalidation
+#
+# While a fragment renders, every tracked model instance that gets loaded
+# is recorded as a dependency: "<label>:<pk>" for the row itself and
+# "<label>" for the table it was queried from. Each dependency has a
+# version token in the cache; saving or deleting a row bumps the tokens
+# (see signals.py), and a cached fragment is only reused while all of its
+# recorded tokens are unchanged.
+#
+# Tokens only reach every worker through a shared cache (Redis). With a
+# per-process cache an edit bumps the tokens of the worker that handled it
+# alone, so there tokens and fragments expire after
+# FRAGMENT_CACHE_LOCAL_TIMEOUT, which bounds how long other workers serve
+# stale fragments (see also checks.py).
+
+TRACKED_MODELS = (
+    "home.portfoliocategory",
+    "home.portfolioitem",
+    "home.portfolioimage",
+)
+
+KEY_PREFIX = "fragment"
+
+_recorder = ContextVar("fragment_dependencies", default=None)
+
+
+def get_cache():
+    return caches[getattr(settings, "FRAGMENT_CACHE_ALIAS", "default")]
+
+
+def is_process_local(cache):
+    """True if every worker process has its own copy of `cache`"""
+    return isinstance(cache, LocMemCache)
+
+
+def get_local_timeout():
+    return getattr(settings, "FRAGMENT_CACHE_LOCAL_TIMEOUT", 60)
+
+
+def get_timeout():
+    timeout = getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 60 * 60)
+    if is_process_local(get_cache()):
+        return min(timeout, get_local_timeout())
+    return timeout
+
+
+def get_token_timeout():
+    """Version tokens never expire in a shared cache"""
+    return get_local_timeout() if is_process_local(get_cache()) else None
+
+
+def dependency_key(label, pk=None):
+    if pk is None:
+        return f"{KEY_PREFIX}:dep:{label}"
+    return f"{KEY_PREFIX}:dep:{label}:{pk}"
+
+
+def is_tracked(model):
+    return model._meta.label_lower in TRACKED_MODELS
+
+
+# ----------------------------------------------------------
+# Recording
+def record_loaded(instance):
+    """Called for every tracked instance loaded from the database"""
+    dependencies = _recorder.get()
+    if dependencies is not None and instance.pk is not None:
+        label = instance._meta.label_lower
+        dependencies.add(dependency_key(label))
+        dependencies.add(dependency_key(label, instance.pk))
+
+
+def record_instance(instance):
+    dependencies = _recorder.get()
+    if dependencies is not None and is_tracked(type(instance)):
+        dependencies.add(dependency_key(instance._meta.label_lower, instance.pk))
+
+
+# ----------------------------------------------------------
+# Invalidation
+def touch(keys):
+    """Give each dependency key a new version token"""
+    token = time.time_ns()
+    get_cache().set_many({key: token for key in keys}, get_token_timeout())
+
+
+def instance_keys(instance, table=False):
+    """
+    Dependency keys of fragments that rendered `instance`. With `table=True`
+    also those of fragments that queried its table (rows added, removed or
+    moved in or out of a listing).
+    """
+    label = instance._meta.label_lower
+    keys = [dependency_key(label, instance.pk)]
+    if table:
+        keys.append(dependency_key(label))
+    return keys
+
+
+# ----------------------------------------------------------
+# Lookup / store
+def _vary_part(value):
+    if isinstance(value, Model):
+        record_instance(value)
+        return f"{value._meta.label_lower}:{value.pk}"
+    if isinstance(value, (QuerySet, list, tuple)):
+        return "(" + ",".join(_vary_part(item) for item in value) + ")"
+    return str(value)
+
+
+def fragment_key(name, vary_on=()):
+    digest = hashlib.md5(
+        "|".join(_vary_part(value) for value in vary_on).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{name}:{digest}"
+
+
+def render_cached(name, vary_on, render):
+    """Return the cached output of `render()` or render and store it"""
+    cache = get_cache()
+    outer = _recorder.get()
+    dependencies = set()
+    token = _recorder.set(dependencies)
+    try:
+        key = fragment_key(name, vary_on)
+        entry = cache.get(key)
+        if entry is not None:
+            current = cache.get_many(list(entry["deps"]))
+            if all(
+                current.get(dep) == version for dep, version in entry["deps"].items()
+            ):
+                dependencies.update(entry["deps"])
+                metrics.cache_lookup("fragment", hit=True)
+                return entry["html"]
+        metrics.cache_lookup("fragment", hit=False)
+
+        started = time.time_ns()
+        html = render()
+    finally:
+        _recorder.reset(token)
+        if outer is not None:
+            outer.update(dependencies)
+
+    versions = cache.get_many(list(dependencies))
+    missing = {dep: started for dep in dependencies if dep not in versions}
+    if missing:
+        cache.set_many(missing, get_token_timeout())
+        versions.update(missing)
+    # A row changed while rendering: serve this output but do not keep it
+    if all(version <= started for version in versions.values()):
+        cache.set(key, {"deps": versions, "html": html}, get_timeout())
+    return html
@@ -0,0 +1,97 @@
+# apps/home/images.py
+import base64
+import io
+import logging
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Image metadata: intrinsic size + low-quality placeholder (LQIP)
+#
+# Models list their image fields in IMAGE_FIELDS and provide
+# `<field>_width`, `<field>_height` and `<field>_placeholder` columns.
+
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+# EXIF orientations that rotate the image by 90 degrees
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def read_image_metadata(file):
+    """Return (width, height, placeholder data URI) for an open image file"""
+    file.seek(0)
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        # draft() lets the JPEG decoder downscale while decoding
+        image.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        # The placeholder carries no EXIF: store it the way it is displayed
+        preview = ImageOps.exif_transpose(image).convert("RGB")
+    preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+
+    buffer = io.BytesIO()
+    preview.save(buffer, "JPEG", quality=PLACEHOLDER_QUALITY)
+    placeholder = "data:image/jpeg;base64," + base64.b64encode(
+        buffer.getvalue()
+    ).decode("ascii")
+    file.seek(0)
+    return width, height, placeholder
+
+
+def read_stored_metadata(storage, name):
+    """Same as read_image_metadata() for a file already in storage"""
+    with storage.open(name, "rb") as file:
+        return read_image_metadata(file)
+
+
+def set_metadata(instance, field_name, metadata):
+    width, height, placeholder = metadata or (None, None, "")
+    setattr(instance, f"{field_name}_width", width)
+    setattr(instance, f"{field_name}_height", height)
+    setattr(instance, f"{field_name}_placeholder", placeholder)
+
+
+def needs_metadata(instance, field_name):
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return getattr(instance, f"{field_name}_width") is not None
+    if not field_file._committed:
+        return True
+    if getattr(instance, f"{field_name}_placeholder"):
+        return False
+    # No metadata for a stored file: read it when it was just assigned. If it
+    # was loaded with the row, reading already failed once (unreadable or not
+    # an image) and would fail on every save; backfill_image_metadata retries.
+    loaded = getattr(instance, "_loaded_file_names", {})
+    return loaded.get(field_name) != field_file.name
+
+
+def update_image_metadata(instance, update_fields=None):
+    """
+    Fill the metadata of new uploads before the instance is saved.
+
+    Committed files that already have metadata are left alone, so saving
+    an unchanged item never opens its images.
+    """
+    for field_name in instance.IMAGE_FIELDS:
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        if not needs_metadata(instance, field_name):
+            continue
+        field_file = getattr(instance, field_name)
+        metadata = None
+        if field_file:
+            try:
+                field_file.open("rb")
+                metadata = read_image_metadata(field_file)
+            except (OSError, UnidentifiedImageError) as e:
+                logger.warning("Could not read %s: %s", field_file.name, e)
+            finally:
+                # Uploads stay open: the storage still has to read them
+                if field_file._committed:
+                    field_file.close()
+        set_metadata(instance, field_name, metadata)
@@ -0,0 +1,86 @@
+# apps/home/management/commands/backfill_image_metadata.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from PIL import UnidentifiedImageError
+from apps.home.images import read_stored_metadata, set_metadata
+from apps.home.models import PortfolioImage, PortfolioItem
+from apps.home.signals import notify_bulk_change
+
+
+class Command(BaseCommand):
+    help = "Compute width/height and placeholders for existing portfolio images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Images decoded in parallel"
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Recompute images that already have metadata",
+        )
+
+    def read(self, instance, field_name):
+        field_file = getattr(instance, field_name)
+        try:
+            return read_stored_metadata(field_file.storage, field_file.name)
+        except (OSError, UnidentifiedImageError) as e:
+            self.stderr.write(self.style.WARNING(f"- Skipped {field_file.name}: {e}"))
+            return None
+
+    def process(self, pool, model, instances):
+        jobs = [
+            (instance, field_name)
+            for instance in instances
+            for field_name in model.IMAGE_FIELDS
+            if getattr(instance, field_name)
+        ]
+        results = list(pool.map(lambda job: self.read(*job), jobs))
+        update_fields = set()
+        for (instance, field_name), metadata in zip(jobs, results):
+            if metadata is not None:
+                set_metadata(instance, field_name, metadata)
+                update_fields.update(
+                    f"{field_name}_{suffix}"
+                    for suffix in ("width", "height", "placeholder")
+                )
+        if update_fields:
+            model.objects.bulk_update(instances, sorted(update_fields))
+        return sum(metadata is not None for metadata in results)
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            for model in (PortfolioItem, PortfolioImage):
+                queryset = model.objects.order_by("pk")
+                if not options["force"]:
+                    missing = Q()
+                    for field_name in model.IMAGE_FIELDS:
+                        missing |= Q(**{f"{field_name}__gt": ""}) & Q(
+                            **{f"{field_name}_placeholder": ""}
+                        )
+                    queryset = queryset.filter(missing)
+
+                processed = 0
+                batch = []
+                pks = []
+                for instance in queryset.iterator(chunk_size=options["batch_size"]):
+                    batch.append(instance)
+                    if len(batch) == options["batch_size"]:
+                        processed += self.process(pool, model, batch)
+                        pks += [instance.pk for instance in batch]
+                        batch = []
+                if batch:
+                    processed += self.process(pool, model, batch)
+                    pks += [instance.pk for instance in batch]
+
+                if pks:
+                    notify_bulk_change(model, pks)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✓ {model._meta.verbose_name_plural}: {processed} images processed"
+                    )
+                )
@@ -0,0 +1,119 @@
+# apps/home/management/commands/benchmark_preload.py
+
+import re
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+ASSET_RE = re.compile(
+    r"<(?:link[^>]+rel=[\"']stylesheet[\"'][^>]*|script[^>]*|img[^>]*)>",
+    re.IGNORECASE,
+)
+URL_RE = re.compile(r"\b(?:href|src)=[\"']([^\"']+)[\"']", re.IGNORECASE)
+PRELOAD_RE = re.compile(r"<([^>]+)>;\s*rel=preload")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure full-load time of pages against a running server, with and "
+        "without following their preload Link headers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000", help="Base URL of the server"
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Page to load (repeatable, default /)",
+        )
+        parser.add_argument("--runs", type=int, default=10)
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=6,
+            help="Parallel asset fetches, like a browser's per-host limit",
+        )
+        parser.add_argument(
+            "--rtt",
+            type=float,
+            default=0,
+            help="Simulated round trip in ms added to every request",
+        )
+
+    # ------------------------------------------------------
+    # A simplified browser: the page, then every same-origin asset
+    def fetch(self, url):
+        if self.rtt:
+            time.sleep(self.rtt)
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+
+    def page_assets(self, page_url, html):
+        origin = urlsplit(page_url).netloc
+        assets = []
+        for tag in ASSET_RE.findall(html):
+            match = URL_RE.search(tag)
+            if match:
+                url = urljoin(page_url, match.group(1))
+                if urlsplit(url).netloc == origin:
+                    assets.append(url)
+        return list(dict.fromkeys(assets))
+
+    def load(self, pool, page_url, use_hints):
+        started = time.perf_counter()
+        if self.rtt:
+            time.sleep(self.rtt)
+        futures = {}
+        with urllib.request.urlopen(page_url, timeout=30) as response:
+            if use_hints:
+                # Start preloads as soon as the headers are in, before the
+                # body has been read and parsed
+                for href in PRELOAD_RE.findall(response.headers.get("Link", "")):
+                    url = urljoin(page_url, href)
+                    futures[url] = pool.submit(self.fetch, url)
+            html = response.read().decode("utf-8", "replace")
+
+        for url in self.page_assets(page_url, html):
+            if url not in futures:
+                futures[url] = pool.submit(self.fetch, url)
+        wait(futures.values())
+        for future in futures.values():
+            future.result()
+        return time.perf_counter() - started, len(futures)
+
+    def handle(self, *args, **options):
+        self.rtt = options["rtt"] / 1000
+        paths = options["paths"] or ["/"]
+
+        with ThreadPoolExecutor(max_workers=options["connections"]) as pool:
+            for path in paths:
+                page_url = urljoin(options["url"], path)
+                try:
+                    self.load(pool, page_url, use_hints=False)  # warm up
+                except OSError as e:
+                    raise CommandError(f"Could not load {page_url}: {e}")
+
+                timings = {False: [], True: []}
+                for _ in range(options["runs"]):
+                    for use_hints in (False, True):
+                        elapsed, assets = self.load(pool, page_url, use_hints)
+                        timings[use_hints].append(elapsed * 1000)
+
+                without = statistics.median(timings[False])
+                with_hints = statistics.median(timings[True])
+                self.stdout.write(f"{path} ({assets} requests, {options['runs']} runs)")
+                self.stdout.write(f"  without hints: {without:8.1f} ms median")
+                self.stdout.write(f"  with hints:    {with_hints:8.1f} ms median")
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✓ {without - with_hints:+.1f} ms "
+                        f"({(without - with_hints) / without:+.1%}) faster with hints"
+                    )
+                )
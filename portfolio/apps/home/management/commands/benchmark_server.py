@@ -0,0 +1,173 @@
+# apps/home/management/commands/benchmark_server.py
+
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.home.warmup import warmup_host
+
+# smaps_rollup fields, in KiB
+MEMORY_FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def child_pids(parent):
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat:
+                # The command name may contain spaces; ppid follows it
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent:
+            pids.append(int(entry))
+    return pids
+
+
+def memory(pid):
+    """smaps_rollup totals of `pid` in KiB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(":")
+            if name in MEMORY_FIELDS:
+                values[name] = int(rest.split()[0])
+    values["Private"] = values.pop("Private_Clean") + values.pop("Private_Dirty")
+    return values
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn.conf.py with and without preload_app and compare cold "
+        "start time and per-worker memory (Linux)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests sent before memory is measured",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Page requested (repeatable, default /)",
+        )
+        parser.add_argument("--timeout", type=float, default=60)
+
+    def get(self, url):
+        request = urllib.request.Request(url, headers={"Host": self.host})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def wait_until_serving(self, url, process, deadline):
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"gunicorn exited with {process.returncode}")
+            try:
+                if self.get(url) == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.02)
+        raise CommandError(f"No response from {url}")
+
+    def run_server(self, preload, options):
+        port = free_port()
+        base = f"http://127.0.0.1:{port}"
+        env = {
+            **os.environ,
+            "GUNICORN_PRELOAD": str(preload),
+            "GUNICORN_BIND": f"127.0.0.1:{port}",
+            "WEB_CONCURRENCY": str(options["workers"]),
+            "GUNICORN_THREADS": "1",
+            # No recycling while measuring
+            "GUNICORN_MAX_REQUESTS": "0",
+        }
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + options["timeout"]
+            self.wait_until_serving(base + self.paths[0], process, deadline)
+            cold_start = time.perf_counter() - started
+
+            # Every worker handles traffic before it is measured
+            urls = [
+                base + self.paths[index % len(self.paths)]
+                for index in range(options["requests"])
+            ]
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                statuses = list(pool.map(self.get, urls))
+            if any(status != 200 for status in statuses):
+                raise CommandError(f"Non-200 responses from {base}")
+
+            master = memory(process.pid)
+            workers = [memory(pid) for pid in child_pids(process.pid)]
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return cold_start, master, workers
+
+    def report(self, label, cold_start, master, workers):
+        count = len(workers) or 1
+        average = {
+            name: sum(worker[name] for worker in workers) / count
+            for name in ("Rss", "Pss", "Private")
+        }
+        total_pss = master["Pss"] + sum(worker["Pss"] for worker in workers)
+        self.stdout.write(self.style.SUCCESS(f"{label}:"))
+        self.stdout.write(f"  first response      {cold_start * 1000:8.1f} ms")
+        self.stdout.write(f"  workers             {len(workers):8d}")
+        self.stdout.write(f"  RSS per worker      {average['Rss'] / 1024:8.1f} MiB")
+        self.stdout.write(f"  private per worker  {average['Private'] / 1024:8.1f} MiB")
+        self.stdout.write(f"  PSS per worker      {average['Pss'] / 1024:8.1f} MiB")
+        self.stdout.write(f"  master RSS          {master['Rss'] / 1024:8.1f} MiB")
+        self.stdout.write(
+            f"  total PSS           {total_pss / 1024:8.1f} MiB (master + workers)"
+        )
+
+    def handle(self, *args, **options):
+        if importlib.util.find_spec("gunicorn") is None:
+            raise CommandError("gunicorn is not installed")
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            raise CommandError("Memory is read from /proc/<pid>/smaps_rollup (Linux)")
+
+        self.host = warmup_host()
+        self.paths = options["paths"] or ["/"]
+        for label, preload in (
+            ("Without preload (app imported in every worker)", False),
+            ("With preload (gunicorn.conf.py default)", True),
+        ):
+            self.report(label, *self.run_server(preload, options))
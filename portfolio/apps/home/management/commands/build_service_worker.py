@@ -0,0 +1,24 @@
+# apps/home/management/commands/build_service_worker.py
+
+from django.core.management.base import BaseCommand
+from apps.home.service_worker import build
+
+
+class Command(BaseCommand):
+    help = "Generate the service worker (/sw.js) and its versioned precache manifest"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list", action="store_true", help="List the precached files"
+        )
+
+    def handle(self, *args, **options):
+        path, version, manifest = build()
+        if options["list"]:
+            for url, revision in manifest:
+                self.stdout.write(f"{revision}  {url}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Wrote {path} (version {version}, {len(manifest)} precached files)"
+            )
+        )
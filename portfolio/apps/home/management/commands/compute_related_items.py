@@ -0,0 +1,19 @@
+# apps/home/management/commands/compute_related_items.py
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.home.recommendations import DEFAULT_TOP_K, refresh_related_items
+
+
+class Command(BaseCommand):
+    help = "Precompute content-similarity related projects for every active item"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+
+    def handle(self, *args, **options):
+        if options["top_k"] < 1:
+            raise CommandError("--top-k must be at least 1")
+        rewritten = refresh_related_items(top_k=options["top_k"])
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Updated related items for {rewritten} items")
+        )
@@ -0,0 +1,51 @@
+# apps/home/management/commands/export_contact_messages.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from apps.home.exports import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, iter_export
+from apps.home.models import ContactMessage
+
+
+class Command(BaseCommand):
+    help = "Stream contact messages as CSV or NDJSON with constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(EXPORT_FORMATS), default="csv", dest="fmt"
+        )
+        parser.add_argument(
+            "--output", "-o", help="Write to this file instead of stdout"
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--category", help="Only export this category")
+        parser.add_argument(
+            "--unread", action="store_true", help="Only export unread messages"
+        )
+        parser.add_argument(
+            "--since", help="Only export messages created at or after this ISO datetime"
+        )
+
+    def handle(self, *args, **options):
+        queryset = ContactMessage.objects.all()
+        if options["category"]:
+            queryset = queryset.filter(category=options["category"])
+        if options["unread"]:
+            queryset = queryset.filter(is_read=False)
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError(f"Invalid --since value: {options['since']}")
+            queryset = queryset.filter(created_at__gte=since)
+
+        chunks = iter_export(queryset, options["fmt"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as out:
+                out.writelines(chunks)
+            self.stderr.write(
+                self.style.SUCCESS(
+                    f"✓ Exported contact messages to {options['output']}"
+                )
+            )
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
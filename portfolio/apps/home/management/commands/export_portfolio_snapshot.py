@@ -0,0 +1,43 @@
+# apps/home/management/commands/export_portfolio_snapshot.py
+
+import sys
+
+from django.core.management.base import BaseCommand
+from apps.home.snapshots import export_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream portfolio categories, items, gallery images and their media "
+        "into a tar snapshot with constant memory"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Archive path, or - for stdout")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--no-media",
+            action="store_true",
+            help="Only export the rows; media files are expected to exist already",
+        )
+
+    def handle(self, *args, **options):
+        def missing(name):
+            self.stderr.write(self.style.WARNING(f"- Missing media file: {name}"))
+
+        export = {
+            "chunk_size": options["chunk_size"],
+            "include_media": not options["no_media"],
+            "on_missing": missing,
+        }
+        if options["output"] == "-":
+            counts, media = export_snapshot(sys.stdout.buffer, **export)
+            sys.stdout.buffer.flush()
+        else:
+            with open(options["output"], "wb") as out:
+                counts, media = export_snapshot(out, **export)
+
+        summary = ", ".join(f"{count} {member}" for member, count in counts.items())
+        self.stderr.write(
+            self.style.SUCCESS(f"✓ Exported {summary} and {media} media files")
+        )
@@ -0,0 +1,39 @@
+# apps/home/management/commands/import_portfolio_snapshot.py
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.home.snapshots import SnapshotError, import_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a snapshot written by export_portfolio_snapshot: media in "
+        "parallel, rows bulk-inserted with remapped foreign keys"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", help="Snapshot archive (a seekable file)")
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Media files written in parallel"
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Delete all existing categories, items and images first",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results, media = import_snapshot(
+                options["archive"],
+                workers=options["workers"],
+                replace=options["replace"],
+            )
+        except (OSError, SnapshotError) as e:
+            raise CommandError(e)
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Stored {media} media files"))
+        for member, (created, skipped) in results.items():
+            line = f"✓ {member}: {created} created"
+            if skipped:
+                line += f", {skipped} skipped (already present)"
+            self.stdout.write(self.style.SUCCESS(line))
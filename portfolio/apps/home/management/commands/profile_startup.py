@@ -0,0 +1,120 @@
+# apps/home/management/commands/profile_startup.py
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots Django the way a worker does (settings, apps, models, DB backend)
+# without opening a database connection, then reports its peak RSS.
+BOOT_SNIPPET = """
+import django
+django.setup()
+from django.db import connection
+connection.ops
+try:
+    import resource
+    print("MAXRSS", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+except ImportError:
+    pass
+"""
+
+IMPORT_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot Django in a fresh interpreter with -X importtime and report "
+        "import time per module, total cold start and peak memory"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top", type=int, default=25, help="Number of modules to list"
+        )
+        parser.add_argument(
+            "--sort",
+            choices=("cumulative", "self"),
+            default="cumulative",
+        )
+        parser.add_argument(
+            "--compare-gis",
+            action="store_true",
+            help="Profile with ENABLE_GIS off and on and compare the totals",
+        )
+
+    def boot(self, extra_env=None):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", settings.SETTINGS_MODULE
+            ),
+            **(extra_env or {}),
+        }
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SNIPPET],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - started
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        modules = []
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE_RE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                modules.append((name, int(self_us), int(cumulative_us), len(indent)))
+
+        maxrss = None
+        for line in result.stdout.splitlines():
+            if line.startswith("MAXRSS"):
+                # ru_maxrss is KiB on Linux and bytes on macOS
+                maxrss = int(line.split()[1])
+                if sys.platform == "darwin":
+                    maxrss //= 1024
+        return elapsed, modules, maxrss
+
+    def report(self, label, elapsed, modules, maxrss, top, sort):
+        # Top-level imports have the smallest indent; their cumulative times add up
+        min_indent = min((indent for *_, indent in modules), default=0)
+        imports_us = sum(
+            cumulative for _, _, cumulative, indent in modules if indent == min_indent
+        )
+        self.stdout.write(self.style.SUCCESS(f"{label}:"))
+        self.stdout.write(f"  wall clock     {elapsed * 1000:8.1f} ms")
+        self.stdout.write(f"  imports        {imports_us / 1000:8.1f} ms")
+        self.stdout.write(f"  modules        {len(modules):8d}")
+        if maxrss is not None:
+            self.stdout.write(f"  peak RSS       {maxrss / 1024:8.1f} MiB")
+
+        column = 2 if sort == "cumulative" else 1
+        if top:
+            self.stdout.write(f"  slowest modules by {sort} time:")
+            for module in sorted(modules, key=lambda m: m[column], reverse=True)[:top]:
+                self.stdout.write(
+                    f"    {module[2] / 1000:8.1f} ms cumulative "
+                    f"{module[1] / 1000:8.1f} ms self  {module[0]}"
+                )
+
+    def handle(self, *args, **options):
+        if options["compare_gis"]:
+            for label, value in (("GIS disabled", "False"), ("GIS enabled", "True")):
+                self.report(
+                    label,
+                    *self.boot({"ENABLE_GIS": value}),
+                    options["top"],
+                    options["sort"],
+                )
+        else:
+            self.report(
+                "Startup profile", *self.boot(), options["top"], options["sort"]
+            )
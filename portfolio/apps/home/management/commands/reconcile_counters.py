@@ -0,0 +1,16 @@
+# apps/home/management/commands/reconcile_counters.py
+
+from django.core.management.base import BaseCommand
+from apps.home.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recount active portfolio items and fix drifted category/global counters"
+
+    def handle(self, *args, **options):
+        total, drifted = reconcile_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ {total} active items; corrected {drifted} drifted counters"
+            )
+        )
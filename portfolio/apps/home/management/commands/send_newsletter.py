@@ -0,0 +1,87 @@
+# apps/home/management/commands/send_newsletter.py
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.home.models import Newsletter
+from apps.home.newsletter import NewsletterDispatcher, subscriber_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        "Send a newsletter to all subscribed contacts in throttled batches. "
+        "Interrupted runs resume from the last checkpoint. To test against a "
+        "local SMTP stand-in run `python -m aiosmtpd -n -l localhost:1025` and "
+        "set EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=False."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("newsletter_id", type=int)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--rate", type=float, default=None, help="Maximum messages per second"
+        )
+        parser.add_argument(
+            "--backend", help="Email backend path (defaults to EMAIL_BACKEND)"
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Discard the checkpoint and start from the first recipient",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Render and batch without sending or saving progress",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            newsletter = Newsletter.objects.get(pk=options["newsletter_id"])
+        except Newsletter.DoesNotExist:
+            raise CommandError(f"Newsletter {options['newsletter_id']} does not exist")
+
+        if options["restart"]:
+            newsletter.last_recipient = ""
+            newsletter.sent_count = newsletter.failed_count = 0
+            newsletter.started_at = newsletter.finished_at = None
+            if not options["dry_run"]:
+                newsletter.save()
+                newsletter.deliveries.all().delete()
+        elif newsletter.status == "sent":
+            raise CommandError("Newsletter already sent (use --restart to resend)")
+
+        pending = (
+            subscriber_queryset(newsletter.last_recipient).count()
+            - newsletter.deliveries.filter(email__gt=newsletter.last_recipient).count()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Sending '{newsletter.subject}' to {pending} recipients"
+                + (
+                    f" (resuming after {newsletter.last_recipient})"
+                    if newsletter.last_recipient
+                    else ""
+                )
+            )
+        )
+
+        def report(stats, last_email):
+            self.stdout.write(
+                f"  batch {stats.batches}: {stats} — checkpoint {last_email}"
+            )
+
+        dispatcher = NewsletterDispatcher(
+            newsletter,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            rate=options["rate"],
+            backend=options["backend"],
+            dry_run=options["dry_run"],
+        )
+        stats = dispatcher.run(on_batch=report)
+        if stats.stopped_at:
+            raise CommandError(
+                f"Stopped at {stats.stopped_at}: the mail server kept failing "
+                f"({stats}). Run the command again to resume from there."
+            )
+        self.stdout.write(self.style.SUCCESS(f"✓ Done: {stats}"))
@@ -0,0 +1,29 @@
+# apps/home/management/commands/sweep_media.py
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete content-addressed media no row references (uploads of saves "
+        "that failed) once they are older than the grace period"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Only delete blobs older than this (default: 24)",
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(default_storage, "sweep"):
+            raise CommandError("The default storage is not content-addressed")
+        swept = default_storage.sweep(grace=options["grace_hours"] * 60 * 60)
+        for name in swept:
+            self.stdout.write(f"  {name}")
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Deleted {len(swept)} unreferenced blobs")
+        )
@@ -0,0 +1,50 @@
+# apps/home/management/commands/warm_cache.py
+
+from django.core.management.base import BaseCommand
+from apps.home.warmup import page_urls, warm_pages
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch the index, every active category and every active item to fill "
+        "the page caches, and report per-URL warm times"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Requests in flight at once (default: WARMUP_CONCURRENCY)",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            help="Warm only this path (repeatable)",
+        )
+        parser.add_argument(
+            "--slowest", type=int, default=0, help="Only list the N slowest URLs"
+        )
+
+    def handle(self, *args, **options):
+        urls = options["urls"] or page_urls()
+        results = warm_pages(urls, options["concurrency"])
+        total = sum(seconds for _, _, seconds, _ in results)
+        failed = sum(1 for _, status, _, error in results if error or status != 200)
+
+        rows = sorted(results, key=lambda row: row[2], reverse=True)
+        if options["slowest"]:
+            rows = rows[: options["slowest"]]
+        for url, status, seconds, error in rows:
+            if error or status != 200:
+                self.stdout.write(self.style.ERROR(f"✗ {url}: {error or status}"))
+            else:
+                self.stdout.write(f"{seconds * 1000:8.2f} ms  {url}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Warmed {len(results) - failed} of {len(results)} pages "
+                f"({total * 1000:.1f} ms of request time)"
+            )
+        )
@@ -0,0 +1,46 @@
+# apps/home/management/commands/warm_templates.py
+
+from django.core.management.base import BaseCommand
+from apps.home.warmup import prime_model_caches, warm_templates
+
+
+class Command(BaseCommand):
+    help = "Compile all project templates and report per-template compile times"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="include_apps",
+            help="Also compile templates shipped by installed apps",
+        )
+        parser.add_argument(
+            "--prime-models",
+            action="store_true",
+            help="Also fill the model metadata and ContentType caches",
+        )
+        parser.add_argument(
+            "--slowest", type=int, default=0, help="Only list the N slowest templates"
+        )
+
+    def handle(self, *args, **options):
+        timings = warm_templates(include_apps=options["include_apps"])
+        total = sum(seconds for _, seconds, _ in timings)
+
+        rows = sorted(timings, key=lambda row: row[1], reverse=True)
+        if options["slowest"]:
+            rows = rows[: options["slowest"]]
+        for name, seconds, error in rows:
+            if error:
+                self.stdout.write(self.style.ERROR(f"✗ {name}: {error}"))
+            else:
+                self.stdout.write(f"{seconds * 1000:8.2f} ms  {name}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Compiled {len(timings)} templates in {total * 1000:.1f} ms"
+            )
+        )
+        if options["prime_models"]:
+            count = prime_model_caches()
+            self.stdout.write(self.style.SUCCESS(f"✓ Primed caches for {count} models"))
@@ -0,0 +1,287 @@
+# apps/home/metrics.py
+import atexit
+import json
+import math
+import os
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: dead workers' files are not archived
+    fcntl = None
+
+# ----------------------------------------------------------
+# Prometheus-style metrics
+#
+# A small registry of counters and histograms kept in memory per process.
+# Every worker writes its values to METRICS_DIR/<pid>.json at most once per
+# METRICS_FLUSH_INTERVAL; the scrape endpoint sums the files of all
+# workers. Files of workers that have exited are folded into archive.json
+# so counters never go backwards when a worker is recycled.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+ARCHIVE_NAME = "archive.json"
+
+_lock = threading.Lock()
+_metrics = {}
+_last_flush = 0.0
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, description, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        _metrics[name] = self
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labelnames)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, description, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            state = self.values.get(key)
+            if state is None:
+                # Per-bucket (not cumulative) counts, then sum and count
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    break
+            else:
+                index = len(self.buckets)
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+
+# ----------------------------------------------------------
+# Metrics of the home app
+REQUESTS = Counter(
+    "home_requests_total", "Requests to home views", ("view", "method", "status")
+)
+REQUEST_DURATION = Histogram(
+    "home_request_duration_seconds",
+    "Time to produce the full response, streamed bodies included",
+    ("view",),
+)
+DB_QUERIES = Counter("home_db_queries_total", "Database queries", ("view",))
+REQUEST_QUERIES = Histogram(
+    "home_request_db_queries",
+    "Database queries per request",
+    ("view",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+CACHE_REQUESTS = Counter(
+    "home_cache_requests_total",
+    "Lookups in the fragment and compressed-response caches",
+    ("cache", "result"),
+)
+CONTACT_SUBMISSIONS = Counter(
+    "home_contact_submissions_total", "Contact form submissions", ("result",)
+)
+ITEM_VIEWS = Counter(
+    "home_item_views_total", "Portfolio item views buffered for analytics", ("result",)
+)
+EMAILS = Counter("home_emails_sent_total", "Emails sent", ("kind", "result"))
+EMAIL_DURATION = Histogram(
+    "home_email_send_duration_seconds", "Time to send one email", ("kind",)
+)
+
+
+def cache_lookup(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# ----------------------------------------------------------
+# Aggregation across worker processes
+def get_metrics_dir():
+    path = getattr(settings, "METRICS_DIR", None)
+    if path:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def snapshot():
+    with _lock:
+        return {
+            name: [[list(key), value] for key, value in metric.values.items()]
+            for name, metric in _metrics.items()
+        }
+
+
+def _write(path, data):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
+def flush(force=False):
+    """Write this process' values, at most once per METRICS_FLUSH_INTERVAL"""
+    global _last_flush
+    directory = get_metrics_dir()
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < getattr(
+        settings, "METRICS_FLUSH_INTERVAL", 1.0
+    ):
+        return
+    _last_flush = now
+    _write(os.path.join(directory, f"{os.getpid()}.json"), snapshot())
+
+
+# The last values of a worker that is shutting down
+atexit.register(flush, force=True)
+
+
+def _reset_after_fork():
+    # A worker forked from a preloaded master starts from zero, or it would
+    # report the master's values again under its own pid
+    global _lock, _last_flush
+    _lock = threading.Lock()
+    _last_flush = 0.0
+    for metric in _metrics.values():
+        metric.values = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _merge(total, data):
+    for name, entries in data.items():
+        values = total.setdefault(name, {})
+        for key, value in entries:
+            key = tuple(key)
+            if isinstance(value, list):
+                current = values.get(key) or [0] * len(value)
+                values[key] = [a + b for a, b in zip(current, value)]
+            else:
+                values[key] = values.get(key, 0) + value
+    return total
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _archive_dead_workers(directory):
+    with open(os.path.join(directory, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE_NAME)
+        archive = None
+        for name in os.listdir(directory):
+            pid = name[: -len(".json")]
+            if not name.endswith(".json") or not pid.isdigit() or _is_alive(int(pid)):
+                continue
+            if archive is None:
+                archive = _merge({}, _read(archive_path))
+            _merge(archive, _read(os.path.join(directory, name)))
+            os.remove(os.path.join(directory, name))
+        if archive is not None:
+            _write(
+                archive_path,
+                {
+                    name: [[list(key), value] for key, value in values.items()]
+                    for name, values in archive.items()
+                },
+            )
+
+
+def collect():
+    """Values of every metric summed over all workers: {name: {key: value}}"""
+    directory = get_metrics_dir()
+    if not directory:
+        return _merge({}, snapshot())
+
+    flush(force=True)
+    if fcntl is not None:
+        _archive_dead_workers(directory)
+    total = {}
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            _merge(total, _read(os.path.join(directory, name)))
+    return total
+
+
+# ----------------------------------------------------------
+# Text exposition format
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_text():
+    totals = collect()
+    lines = []
+    for name, metric in _metrics.items():
+        lines.append(f"# HELP {name} {metric.description}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for key, value in sorted(totals.get(name, {}).items()):
+            if metric.kind == "counter":
+                lines.append(
+                    f"{name}{_labels(metric.labelnames, key)} {_number(value)}"
+                )
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, math.inf), value):
+                cumulative += count
+                le = (("le", _number(bound)),)
+                lines.append(
+                    f"{name}_bucket{_labels(metric.labelnames, key, le)} {cumulative}"
+                )
+            labels = _labels(metric.labelnames, key)
+            lines.append(f"{name}_sum{labels} {_number(value[-2])}")
+            lines.append(f"{name}_count{labels} {value[-1]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,199 @@
+# apps/home/middleware.py
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.cache import patch_vary_headers
+
+from . import compression, metrics, preload, profiling, slow_queries
+from .warmup import WARMUP_HEADER
+
+
+# ----------------------------------------------------------
+# Preload Link headers
+class PreloadLinkMiddleware:
+    """Add "Link: rel=preload" headers for the critical assets of HTML pages"""
+
+    def __init__(self, get_response):
+        if not preload.is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.status_code != 200 or not response.get(
+            "Content-Type", ""
+        ).startswith("text/html"):
+            return response
+
+        route = preload.route_name(request.resolver_match)
+        links = preload.route_links(route) if route else []
+        if links:
+            if response.has_header("Link"):
+                links = [response["Link"], *links]
+            response["Link"] = ", ".join(links)
+        return response
+
+
+# ----------------------------------------------------------
+# gzip/brotli compression
+class CompressionMiddleware:
+    """
+    Compress responses with brotli (when installed) or gzip. Streaming
+    responses are compressed incrementally; buffered ones go through the
+    compressed-variant cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.has_header("Content-Encoding")
+            or not compression.is_compressible(response.get("Content-Type"))
+            or (response.streaming and response.is_async)
+            or (
+                not response.streaming
+                and len(response.content) < compression.min_size()
+            )
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        # Length-randomized gzip only for pages that may hold a secret (BREACH)
+        secret = compression.carries_secrets(request, response)
+        encoding = compression.accepted_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""), padded=secret
+        )
+        if encoding is None:
+            return response
+        padding = compression.random_padding() if secret else 0
+
+        if response.streaming:
+            response.streaming_content = compression.compress_stream(
+                response.streaming_content, encoding, padding
+            )
+            del response.headers["Content-Length"]
+        else:
+            if secret:
+                content = compression.compress(response.content, encoding, padding)
+            else:
+                content = compression.compress_cached(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+# ----------------------------------------------------------
+# Per-request profiling
+class ProfilingMiddleware:
+    """Run opted-in requests to apps.home views under the profiler"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if profiling.should_profile(request, view_func):
+            return profiling.profile_view(request, view_func, view_args, view_kwargs)
+        return None
+
+
+# ----------------------------------------------------------
+# Metrics
+class RequestMetrics:
+    """Counts the queries of one request and records it when finished"""
+
+    def __init__(self, request):
+        self.request = request
+        self.queries = 0
+        self.started = time.perf_counter()
+        # The connection of this thread; a stream may be consumed elsewhere
+        self.connection = connections[DEFAULT_DB_ALIAS]
+        self.connection.execute_wrappers.append(self)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def finish(self, response):
+        if self in self.connection.execute_wrappers:
+            self.connection.execute_wrappers.remove(self)
+        match = self.request.resolver_match
+        view = match.view_name if match else ""
+        if not view.startswith("home:") or view == "home:metrics":
+            return
+        metrics.REQUESTS.inc(
+            view=view, method=self.request.method, status=response.status_code
+        )
+        metrics.REQUEST_DURATION.observe(time.perf_counter() - self.started, view=view)
+        metrics.DB_QUERIES.inc(self.queries, view=view)
+        metrics.REQUEST_QUERIES.observe(self.queries, view=view)
+        metrics.flush()
+
+    def wrap_stream(self, content, response):
+        try:
+            yield from content
+        finally:
+            self.finish(response)
+
+
+class MetricsMiddleware:
+    """Request count, latency and DB queries per home URL name"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if WARMUP_HEADER in request.headers:
+            # Cache warm-up is not traffic; it would skew latency and counts
+            return self.get_response(request)
+        request_metrics = RequestMetrics(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            request_metrics.connection.execute_wrappers.remove(request_metrics)
+            raise
+        if response.streaming and not response.is_async:
+            # Streamed pages are still rendering; finish when consumed
+            response.streaming_content = request_metrics.wrap_stream(
+                response.streaming_content, response
+            )
+        else:
+            request_metrics.finish(response)
+        return response
+
+
+# ----------------------------------------------------------
+# Slow-query capture
+class SlowQueryMiddleware:
+    """Tells the slow-query recorder which view is running"""
+
+    def __init__(self, get_response):
+        if not slow_queries.is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Not reset afterwards: a streamed body still runs queries
+        slow_queries.current_view.set("")
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        slow_queries.current_view.set(request.resolver_match.view_name)
+        return None
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0003_portfoliocategory_portfolioitem_portfolioimage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Newsletter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=200)),
+                (
+                    "body",
+                    models.TextField(
+                        help_text="Django template, rendered once. Use $name and $email for per-recipient values"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Draft"),
+                            ("sending", "Sending"),
+                            ("paused", "Paused"),
+                            ("sent", "Sent"),
+                        ],
+                        default="draft",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "last_recipient",
+                    models.EmailField(
+                        blank=True,
+                        help_text="Last email address of the last completed batch",
+                        max_length=254,
+                    ),
+                ),
+                ("sent_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Newsletter",
+                "verbose_name_plural": "Newsletters",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(
+                fields=["subscribe_newsletter", "email"],
+                name="contact_newsletter_email_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0004_newsletter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="home.portfolioitem",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="home.portfolioitem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Related Item",
+                "verbose_name_plural": "Related Items",
+                "ordering": ["item", "rank"],
+                "indexes": [
+                    models.Index(fields=["item", "rank"], name="related_item_rank_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("item", "related"), name="unique_related_item"
+                    )
+                ],
+            },
+        ),
+    ]
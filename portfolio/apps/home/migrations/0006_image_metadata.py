@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0005_relateditem"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="portfolioimage",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="portfolioimage",
+            name="image_placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="portfolioimage",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="portfolioitem",
+            name="detail_image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="portfolioitem",
+            name="detail_image_placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="portfolioitem",
+            name="detail_image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="portfolioitem",
+            name="thumbnail_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="portfolioitem",
+            name="thumbnail_placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="portfolioitem",
+            name="thumbnail_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0006_image_metadata"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("size", models.PositiveBigIntegerField()),
+                ("refcount", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Stored Blob",
+                "verbose_name_plural": "Stored Blobs",
+                "ordering": ["name"],
+            },
+        ),
+    ]
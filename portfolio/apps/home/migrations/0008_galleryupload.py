@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:01
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0007_storedblob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GalleryUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("size", models.PositiveBigIntegerField()),
+                ("received", models.PositiveBigIntegerField(default=0)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("uploading", "Uploading"),
+                            ("processing", "Processing"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="uploading",
+                        max_length=10,
+                    ),
+                ),
+                ("images_created", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "portfolio_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="gallery_uploads",
+                        to="home.portfolioitem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Gallery Upload",
+                "verbose_name_plural": "Gallery Uploads",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0008_galleryupload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestProfile",
+            fields=[
+                (
+                    "id",
+                    models.CharField(max_length=40, primary_key=True, serialize=False),
+                ),
+            ],
+            options={
+                "verbose_name": "Request Profile",
+                "verbose_name_plural": "Request Profiles",
+                "managed": False,
+                "default_permissions": ("view",),
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0009_requestprofile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sql", models.TextField()),
+                ("params", models.TextField(blank=True)),
+                ("fingerprint", models.CharField(db_index=True, max_length=32)),
+                ("duration_ms", models.FloatField()),
+                ("view", models.CharField(blank=True, max_length=100)),
+                ("call_site", models.CharField(max_length=255)),
+                ("plan", models.TextField(blank=True)),
+                (
+                    "plan_status",
+                    models.CharField(
+                        choices=[
+                            ("none", "Not sampled"),
+                            ("pending", "Pending"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="none",
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "verbose_name": "Slow Query",
+                "verbose_name_plural": "Slow Queries",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
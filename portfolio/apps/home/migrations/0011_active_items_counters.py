@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:18
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_active_items(apps, schema_editor):
+    PortfolioCategory = apps.get_model("home", "PortfolioCategory")
+    PortfolioItem = apps.get_model("home", "PortfolioItem")
+    PortfolioStats = apps.get_model("home", "PortfolioStats")
+
+    categories = list(
+        PortfolioCategory.objects.annotate(
+            actual=Count("items", filter=Q(items__is_active=True))
+        )
+    )
+    for category in categories:
+        category.active_items_count = category.actual
+    PortfolioCategory.objects.bulk_update(categories, ["active_items_count"])
+    PortfolioStats.objects.create(
+        pk=1, active_items_count=PortfolioItem.objects.filter(is_active=True).count()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0010_slowquery"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("active_items_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Portfolio Stats",
+                "verbose_name_plural": "Portfolio Stats",
+            },
+        ),
+        migrations.AddField(
+            model_name="portfoliocategory",
+            name="active_items_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_active_items, migrations.RunPython.noop),
+    ]
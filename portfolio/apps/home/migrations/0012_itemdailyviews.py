@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0011_active_items_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemDailyViews",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                (
+                    "item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_views",
+                        to="home.portfolioitem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Item Daily Views",
+                "verbose_name_plural": "Item Daily Views",
+                "ordering": ["-date", "-views"],
+                "indexes": [
+                    models.Index(
+                        fields=["date", "item"], name="item_daily_views_date_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("item", "date"), name="unique_item_daily_views"
+                    )
+                ],
+            },
+        ),
+    ]
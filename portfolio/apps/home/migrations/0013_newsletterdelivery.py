@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0012_itemdailyviews"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("email", models.EmailField(max_length=254)),
+                (
+                    "outcome",
+                    models.CharField(
+                        choices=[("sent", "Sent"), ("failed", "Failed")], max_length=10
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "newsletter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="home.newsletter",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Newsletter Delivery",
+                "verbose_name_plural": "Newsletter Deliveries",
+                "ordering": ["newsletter", "email"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("newsletter", "email"),
+                        name="unique_newsletter_delivery",
+                    )
+                ],
+            },
+        ),
+    ]
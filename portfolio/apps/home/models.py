@@ -1,8 +1,12 @@
 # apps/home/models.py
-from django.db import models
+import uuid
+
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.text import slugify
 
+from .images import update_image_metadata
+
 
 # ----------------------------------------------------------
 # ContactMessage model (existing)
@@ -39,11 +43,82 @@ class ContactMessage(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
+        indexes = [
+            models.Index(
+                fields=["subscribe_newsletter", "email"],
+                name="contact_newsletter_email_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.subject}"
 
 
+# ----------------------------------------------------------
+# Newsletter model (sent to contacts with subscribe_newsletter=True)
+class Newsletter(models.Model):
+    STATUS_CHOICES = [
+        ("draft", "Draft"),
+        ("sending", "Sending"),
+        ("paused", "Paused"),
+        ("sent", "Sent"),
+    ]
+
+    subject = models.CharField(max_length=200)
+    body = models.TextField(
+        help_text="Django template, rendered once. Use $name and $email for per-recipient values"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="draft")
+
+    # Progress checkpoint (recipients are sent in email order)
+    last_recipient = models.EmailField(
+        blank=True, help_text="Last email address of the last completed batch"
+    )
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Newsletter"
+        verbose_name_plural = "Newsletters"
+
+    def __str__(self):
+        return self.subject
+
+
+class NewsletterDelivery(models.Model):
+    """A recipient whose newsletter was sent or finally refused"""
+
+    OUTCOME_CHOICES = [
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    newsletter = models.ForeignKey(
+        Newsletter, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    email = models.EmailField()
+    outcome = models.CharField(max_length=10, choices=OUTCOME_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["newsletter", "email"]
+        verbose_name = "Newsletter Delivery"
+        verbose_name_plural = "Newsletter Deliveries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newsletter", "email"], name="unique_newsletter_delivery"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.newsletter} to {self.email}: {self.outcome}"
+
+
 # ----------------------------------------------------------
 # Portfolio Category model
 class PortfolioCategory(models.Model):
@@ -52,6 +127,8 @@ class PortfolioCategory(models.Model):
     description = models.TextField(blank=True)
     order = models.IntegerField(default=0, help_text="Lower numbers appear first")
     is_active = models.BooleanField(default=True)
+    # Maintained by counters.py
+    active_items_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -95,6 +172,20 @@ class PortfolioItem(models.Model):
         help_text="Larger image for detail page (optional)",
     )
 
+    # Image metadata (filled on upload, see images.py)
+    thumbnail_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    thumbnail_height = models.PositiveIntegerField(
+        blank=True, null=True, editable=False
+    )
+    thumbnail_placeholder = models.TextField(blank=True, editable=False)
+    detail_image_width = models.PositiveIntegerField(
+        blank=True, null=True, editable=False
+    )
+    detail_image_height = models.PositiveIntegerField(
+        blank=True, null=True, editable=False
+    )
+    detail_image_placeholder = models.TextField(blank=True, editable=False)
+
     # Project details
     client = models.CharField(max_length=100, blank=True)
     project_date = models.DateField(blank=True, null=True)
@@ -127,10 +218,15 @@ class PortfolioItem(models.Model):
         verbose_name = "Portfolio Item"
         verbose_name_plural = "Portfolio Items"
 
+    IMAGE_FIELDS = ("thumbnail", "detail_image")
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
+        update_image_metadata(self, kwargs.get("update_fields"))
+        # Uploads are stored and retained in one transaction (see storage.py)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -162,10 +258,194 @@ class PortfolioImage(models.Model):
     caption = models.CharField(max_length=200, blank=True)
     order = models.IntegerField(default=0)
 
+    # Image metadata (filled on upload, see images.py)
+    image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
+
+    IMAGE_FIELDS = ("image",)
+
     class Meta:
         ordering = ["order"]
         verbose_name = "Portfolio Image"
         verbose_name_plural = "Portfolio Images"
 
+    def save(self, *args, **kwargs):
+        update_image_metadata(self, kwargs.get("update_fields"))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.portfolio_item.title} - Image {self.order}"
+
+
+# ----------------------------------------------------------
+# Precomputed related projects (see recommendations.py)
+class RelatedItem(models.Model):
+    item = models.ForeignKey(
+        PortfolioItem, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(
+        PortfolioItem, on_delete=models.CASCADE, related_name="+"
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["item", "rank"]
+        verbose_name = "Related Item"
+        verbose_name_plural = "Related Items"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["item", "related"], name="unique_related_item"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["item", "rank"], name="related_item_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.item} -> {self.related} ({self.score:.2f})"
+
+
+# ----------------------------------------------------------
+# Daily view counts per item (flushed in batches by analytics.py)
+class ItemDailyViews(models.Model):
+    item = models.ForeignKey(
+        PortfolioItem, on_delete=models.CASCADE, related_name="daily_views"
+    )
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-date", "-views"]
+        verbose_name = "Item Daily Views"
+        verbose_name_plural = "Item Daily Views"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["item", "date"], name="unique_item_daily_views"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date", "item"], name="item_daily_views_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.item} on {self.date}: {self.views}"
+
+
+# ----------------------------------------------------------
+# Site-wide counters (single row, maintained by counters.py)
+class PortfolioStats(models.Model):
+    SINGLETON_PK = 1
+
+    active_items_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Portfolio Stats"
+        verbose_name_plural = "Portfolio Stats"
+
+    def __str__(self):
+        return f"{self.active_items_count} active items"
+
+
+# ----------------------------------------------------------
+# Reference counts of content-addressed media blobs (see storage.py)
+class StoredBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = "Stored Blob"
+        verbose_name_plural = "Stored Blobs"
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+
+# ----------------------------------------------------------
+# Chunked gallery upload session (see uploads.py)
+class GalleryUpload(models.Model):
+    STATUS_CHOICES = [
+        ("uploading", "Uploading"),
+        ("processing", "Processing"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    portfolio_item = models.ForeignKey(
+        PortfolioItem, on_delete=models.CASCADE, related_name="gallery_uploads"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default="uploading"
+    )
+    images_created = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Gallery Upload"
+        verbose_name_plural = "Gallery Uploads"
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+# ----------------------------------------------------------
+# Slow queries (recorded by slow_queries.py)
+class SlowQuery(models.Model):
+    PLAN_STATUS_CHOICES = [
+        ("none", "Not sampled"),
+        ("pending", "Pending"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    fingerprint = models.CharField(max_length=32, db_index=True)
+    duration_ms = models.FloatField()
+    view = models.CharField(max_length=100, blank=True)
+    call_site = models.CharField(max_length=255)
+    plan = models.TextField(blank=True)
+    plan_status = models.CharField(
+        max_length=10, choices=PLAN_STATUS_CHOICES, default="none"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Slow Query"
+        verbose_name_plural = "Slow Queries"
+
+    def __str__(self):
+        return f"{self.duration_ms:.0f} ms at {self.call_site}"
+
+
+# ----------------------------------------------------------
+# Request profiles
+class RequestProfile(models.Model):
+    """
+    Admin entry for the profiles stored on disk by profiling.py; there is
+    no table behind it.
+    """
+
+    id = models.CharField(max_length=40, primary_key=True)
+
+    class Meta:
+        managed = False
+        default_permissions = ("view",)
+        verbose_name = "Request Profile"
+        verbose_name_plural = "Request Profiles"
+
+    def __str__(self):
+        return self.id
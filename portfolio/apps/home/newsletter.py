@@ -0,0 +1,306 @@
+# apps/home/newsletter.py
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from string import Template as RecipientTemplate
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Max
+from django.template import Context, Template
+from django.utils import timezone
+
+from .models import ContactMessage, Newsletter, NewsletterDelivery
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------
+# Recipients
+def subscriber_queryset(after=""):
+    """
+    Unique subscribed emails in email order, one row per address.
+
+    GROUP BY email is the portable form of DISTINCT here and is served by
+    the (subscribe_newsletter, email) index.
+    """
+    queryset = (
+        ContactMessage.objects.filter(subscribe_newsletter=True)
+        .values("email")
+        .annotate(name=Max("name"))
+        .order_by("email")
+    )
+    if after:
+        queryset = queryset.filter(email__gt=after)
+    return queryset
+
+
+def render_newsletter(newsletter):
+    """Render the body template once; returns a per-recipient string.Template"""
+    rendered = Template(newsletter.body).render(Context({"newsletter": newsletter}))
+    return RecipientTemplate(rendered)
+
+
+# ----------------------------------------------------------
+# Dispatch
+
+# Refusals of a single message are final: it is counted as failed. Any other
+# transport error (SMTPServerDisconnected, socket errors) reopens the
+# connection and retries the message once.
+REFUSED_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+@dataclass
+class DispatchStats:
+    sent: int = 0
+    failed: int = 0
+    batches: int = 0
+    # First recipient that could not be attempted; the run stops there
+    stopped_at: str = ""
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self):
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.sent} sent, {self.failed} failed in {self.batches} batches "
+            f"({self.elapsed:.1f}s, {self.rate:.1f} msg/s)"
+        )
+
+
+class NewsletterDispatcher:
+    """
+    Sends a newsletter in throttled batches through a pool of worker threads.
+
+    Each worker keeps one SMTP connection open for the whole run and
+    reopens it after a transport error. Every recipient that was delivered
+    or refused gets a NewsletterDelivery row, so a resumed run never mails
+    anyone twice. The checkpoint on the Newsletter row only saves re-reading
+    recipients: it advances to the last recipient of the longest prefix that
+    has a delivery row. If a transport error persists the run stops there
+    (status "paused"), and resuming starts with that recipient, skipping the
+    ones already delivered after it.
+    """
+
+    def __init__(
+        self,
+        newsletter,
+        batch_size=100,
+        workers=4,
+        rate=None,
+        backend=None,
+        dry_run=False,
+    ):
+        self.newsletter = newsletter
+        self.batch_size = batch_size
+        self.workers = workers
+        self.rate = rate
+        self.backend = backend
+        self.dry_run = dry_run
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _get_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = get_connection(self.backend, fail_silently=False)
+            connection.open()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _reopen(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass  # the transport is already broken
+        connection.open()
+
+    def _deliver(self, connection, message, email):
+        """ "sent" or "failed", or None if the transport kept failing"""
+        for attempt in range(2):
+            try:
+                return "sent" if connection.send_messages([message]) else "failed"
+            except REFUSED_ERRORS as e:
+                logger.warning(
+                    "Newsletter %s to %s refused: %s", self.newsletter.pk, email, e
+                )
+                return "failed"
+            except OSError as e:
+                logger.warning(
+                    "Newsletter %s to %s failed: %s", self.newsletter.pk, email, e
+                )
+                if attempt:
+                    return None
+                try:
+                    self._reopen(connection)
+                except OSError as e:
+                    logger.warning("Reconnecting to the mail server failed: %s", e)
+                    return None
+        return None
+
+    def _close_connections(self):
+        for connection in self._connections:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning("Closing SMTP connection failed: %s", e)
+        self._connections = []
+
+    def _send_slice(self, template, recipients):
+        """One outcome per recipient: "sent", "failed" or None (not delivered)"""
+        if self.dry_run:
+            return ["sent"] * len(recipients)
+        try:
+            connection = self._get_connection()
+        except OSError as e:
+            logger.warning("Connecting to the mail server failed: %s", e)
+            return [None] * len(recipients)
+
+        outcomes = []
+        for recipient in recipients:
+            body = template.safe_substitute(
+                name=recipient["name"], email=recipient["email"]
+            )
+            message = EmailMessage(
+                self.newsletter.subject,
+                body,
+                settings.DEFAULT_FROM_EMAIL,
+                [recipient["email"]],
+                connection=connection,
+            )
+            outcome = self._deliver(connection, message, recipient["email"])
+            outcomes.append(outcome)
+            if outcome is None:
+                break
+        return outcomes + [None] * (len(recipients) - len(outcomes))
+
+    def _delivered(self, emails):
+        return set(
+            NewsletterDelivery.objects.filter(
+                newsletter=self.newsletter, email__in=emails
+            ).values_list("email", flat=True)
+        )
+
+    def _checkpoint(self, last_email, outcomes):
+        """Record final outcomes ({email: "sent"/"failed"}) and the checkpoint"""
+        NewsletterDelivery.objects.bulk_create(
+            [
+                NewsletterDelivery(
+                    newsletter=self.newsletter, email=email, outcome=outcome
+                )
+                for email, outcome in outcomes.items()
+            ],
+            ignore_conflicts=True,
+        )
+        outcomes = list(outcomes.values())
+        Newsletter.objects.filter(pk=self.newsletter.pk).update(
+            last_recipient=last_email,
+            sent_count=F("sent_count") + outcomes.count("sent"),
+            failed_count=F("failed_count") + outcomes.count("failed"),
+        )
+
+    def run(self, on_batch=None):
+        newsletter = self.newsletter
+        template = render_newsletter(newsletter)
+        stats = DispatchStats()
+
+        if not self.dry_run:
+            Newsletter.objects.filter(pk=newsletter.pk).update(
+                status="sending",
+                started_at=newsletter.started_at or timezone.now(),
+            )
+
+        last_email = newsletter.last_recipient
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while True:
+                    batch_started = time.monotonic()
+                    batch = list(subscriber_queryset(last_email)[: self.batch_size])
+                    if not batch:
+                        break
+
+                    # Delivered before an earlier run stopped
+                    delivered = set()
+                    if not self.dry_run:
+                        delivered = self._delivered([r["email"] for r in batch])
+                    pending = [r for r in batch if r["email"] not in delivered]
+
+                    outcomes = {}
+                    if pending:
+                        step = -(-len(pending) // self.workers)
+                        slices = [
+                            pending[i : i + step] for i in range(0, len(pending), step)
+                        ]
+                        for part, results in zip(
+                            slices,
+                            pool.map(
+                                lambda part: self._send_slice(template, part), slices
+                            ),
+                        ):
+                            for recipient, outcome in zip(part, results):
+                                if outcome is not None:
+                                    outcomes[recipient["email"]] = outcome
+                    delivered.update(outcomes)
+                    # Recipients from the first undelivered one on are read
+                    # again on resume; those already delivered are skipped
+                    done = next(
+                        (
+                            index
+                            for index, recipient in enumerate(batch)
+                            if recipient["email"] not in delivered
+                        ),
+                        len(batch),
+                    )
+
+                    stats.sent += list(outcomes.values()).count("sent")
+                    stats.failed += list(outcomes.values()).count("failed")
+                    stats.batches += 1
+                    if done:
+                        last_email = batch[done - 1]["email"]
+                    if not self.dry_run and (done or outcomes):
+                        self._checkpoint(last_email, outcomes)
+                    if on_batch:
+                        on_batch(stats, last_email)
+                    if done < len(batch):
+                        stats.stopped_at = batch[done]["email"]
+                        break
+
+                    # Throttle: never exceed `rate` messages per second
+                    if self.rate:
+                        remaining = len(batch) / self.rate - (
+                            time.monotonic() - batch_started
+                        )
+                        if remaining > 0:
+                            time.sleep(remaining)
+        except BaseException:
+            if not self.dry_run:
+                Newsletter.objects.filter(pk=newsletter.pk).update(status="paused")
+            raise
+        finally:
+            self._close_connections()
+
+        if self.dry_run:
+            return stats
+        if stats.stopped_at:
+            Newsletter.objects.filter(pk=newsletter.pk).update(status="paused")
+        else:
+            Newsletter.objects.filter(pk=newsletter.pk).update(
+                status="sent", finished_at=timezone.now()
+            )
+        return stats
@@ -0,0 +1,114 @@
+# apps/home/ordering.py
+from bisect import bisect_left
+
+from django.db import transaction
+from django.db.models import Max
+
+from .signals import notify_bulk_change
+
+# ----------------------------------------------------------
+# Sparse ordering for drag-and-drop reordering
+#
+# `order` values are spaced ORDER_GAP apart, so a row moved between two
+# others gets a value in the gap and is the only row written. A new
+# ordering keeps the longest run of rows that are already in increasing
+# order where they are and renumbers only the rest; when a gap is used up
+# the whole group is respaced. Changes are written with one bulk_update in
+# one transaction.
+
+ORDER_GAP = 1024
+
+
+class ReorderError(ValueError):
+    pass
+
+
+def next_order(queryset):
+    """The `order` value that puts a new row after every row of `queryset`"""
+    current = queryset.aggregate(order=Max("order"))["order"]
+    return ORDER_GAP if current is None else current + ORDER_GAP
+
+
+def _increasing_run(values):
+    """Indexes of a longest strictly increasing subsequence of `values`"""
+    tails, tail_indexes, previous = [], [], [None] * len(values)
+    for index, value in enumerate(values):
+        position = bisect_left(tails, value)
+        if position:
+            previous[index] = tail_indexes[position - 1]
+        if position == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[position] = value
+            tail_indexes[position] = index
+
+    run = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        run.add(index)
+        index = previous[index]
+    return run
+
+
+def plan_orders(current, ids):
+    """
+    New `order` values that put the rows in the sequence `ids`, given
+    their `current` values ({pk: order}); only rows that change are returned.
+    """
+    values = [current[pk] for pk in ids]
+    kept = _increasing_run(values)
+
+    new_values = list(values)
+    index = 0
+    while index < len(ids):
+        if index in kept:
+            index += 1
+            continue
+        end = index
+        while end < len(ids) and end not in kept:
+            end += 1
+        # Rows index..end-1 go between their kept neighbours
+        low = new_values[index - 1] if index else None
+        high = new_values[end] if end < len(ids) else None
+        count = end - index
+        if low is None:
+            start, step = high - ORDER_GAP * (count + 1), ORDER_GAP
+        elif high is None:
+            start, step = low, ORDER_GAP
+        else:
+            start, step = low, (high - low) // (count + 1)
+            if step < 1:
+                return _respace(current, ids)
+        for offset in range(count):
+            new_values[index + offset] = start + step * (offset + 1)
+        index = end
+
+    return {pk: value for pk, value in zip(ids, new_values) if value != current[pk]}
+
+
+def _respace(current, ids):
+    return {
+        pk: ORDER_GAP * (position + 1)
+        for position, pk in enumerate(ids)
+        if current[pk] != ORDER_GAP * (position + 1)
+    }
+
+
+def apply_reorder(queryset, ids):
+    """
+    Put the rows of `queryset` (a whole category or gallery) in the order
+    of `ids`; returns the primary keys of the rows that were written.
+    """
+    model = queryset.model
+    with transaction.atomic():
+        current = dict(queryset.select_for_update().values_list("pk", "order"))
+        if len(ids) != len(current) or set(ids) != set(current):
+            raise ReorderError("The new ordering must list every row exactly once")
+        changes = plan_orders(current, ids)
+        model.objects.bulk_update(
+            [model(pk=pk, order=order) for pk, order in changes.items()], ["order"]
+        )
+        if changes:
+            notify_bulk_change(model, list(changes))
+    return list(changes)
@@ -0,0 +1,245 @@
+# apps/home/preload.py
+import json
+import logging
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.templatetags.static import static
+
+from .warmup import get_engine
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Preload hints for critical assets
+#
+# The CSS, scripts and hero image in main_template.html are only
+# discovered by the browser while it parses the HTML. For every route we
+# compute the assets that page needs, either from a build manifest
+# (PRELOAD_MANIFEST) or by reading the route's template and the templates
+# it extends and includes. They are sent as "Link: rel=preload" headers,
+# and as a 103 Early Hints response where the ASGI server supports it, so
+# fetching overlaps with rendering.
+
+# Route ("namespace:url_name") -> template rendered by its view
+ROUTE_TEMPLATES = {
+    "home:index": "home/index.html",
+    "home:portfolio_detail": "home/portfolio_detail.html",
+    "home:portfolio_category": "home/portfolio_category.html",
+}
+
+DEFAULT_TYPES = ("style", "script", "image")
+
+EXTENDS_RE = re.compile(r"{%\s*extends\s+[\"']([^\"']+)[\"']\s*%}")
+INCLUDE_RE = re.compile(r"{%\s*include\s+[\"']([^\"']+)[\"']")
+STATIC_RE = re.compile(r"{%\s*static\s+[\"']([^\"']+)[\"']\s*%}")
+TAG_RE = re.compile(r"<(link|script|img)\b[^>]*>", re.IGNORECASE)
+REL_RE = re.compile(r"\brel=[\"']?([\w-]+)", re.IGNORECASE)
+HREF_RE = re.compile(r"\bhref=[\"'](https?://[^\"']+)[\"']", re.IGNORECASE)
+# Template tags and html tags may nest, so html tags are found after the
+# static tags are replaced by a marker
+STATIC_MARKER = "\x00static:{}\x00"
+STATIC_MARKER_RE = re.compile(r"\x00static:([^\x00]+)\x00")
+
+
+def is_enabled():
+    return getattr(settings, "PRELOAD_HINTS_ENABLED", True)
+
+
+# ----------------------------------------------------------
+# Template analysis
+def _template_source(name):
+    template = get_engine().get_template(name)
+    return template.source
+
+
+def _template_assets(name, seen, layout=False):
+    """
+    (kind, value, crossorigin) tuples in document order; value is a static
+    path, or a URL for preconnects
+    """
+    if name in seen:
+        return []
+    seen.add(name)
+    try:
+        source = _template_source(name)
+    except TemplateDoesNotExist:
+        logger.warning("Preload analysis: template %s does not exist", name)
+        return []
+
+    assets = []
+    parent = EXTENDS_RE.search(source)
+    if parent:
+        # Layout images (the logo) are cached after the first page; the
+        # largest contentful paint candidate is in the page's own content
+        assets += _template_assets(parent.group(1), seen, layout=True)
+
+    source = STATIC_RE.sub(lambda match: STATIC_MARKER.format(match.group(1)), source)
+    position = 0
+    for include in INCLUDE_RE.finditer(source):
+        assets += _tag_assets(source[position : include.start()])
+        assets += _template_assets(include.group(1), seen, layout)
+        position = include.end()
+    assets += _tag_assets(source[position:])
+    if layout:
+        assets = [asset for asset in assets if asset[0] != "image"]
+    return assets
+
+
+def _tag_assets(source):
+    assets = []
+    for match in TAG_RE.finditer(source):
+        tag_name, tag = match.group(1).lower(), match.group(0)
+        rel = REL_RE.search(tag)
+        rel = rel.group(1).lower() if rel else ""
+        path = STATIC_MARKER_RE.search(tag)
+        crossorigin = "crossorigin" in tag.lower()
+        if tag_name == "link" and rel == "preconnect":
+            href = HREF_RE.search(tag)
+            if href:
+                assets.append(("preconnect", href.group(1), crossorigin))
+        elif path is None:
+            continue
+        elif tag_name == "link" and rel == "stylesheet":
+            assets.append(("style", path.group(1), crossorigin))
+        elif tag_name == "script":
+            assets.append(("script", path.group(1), crossorigin))
+        elif tag_name == "img":
+            assets.append(("image", path.group(1), crossorigin))
+    return assets
+
+
+def analyze_template(name):
+    """Preload hints for a template: [{"href": ..., "as": ...}] or preconnects"""
+    types = getattr(settings, "PRELOAD_HINTS_TYPES", DEFAULT_TYPES)
+    # Only the first images can be the largest contentful paint
+    max_images = getattr(settings, "PRELOAD_MAX_IMAGES", 1)
+
+    hints = []
+    images = 0
+    for kind, value, crossorigin in dict.fromkeys(_template_assets(name, set())):
+        if kind == "preconnect":
+            hints.append(
+                {"href": value, "rel": "preconnect", "crossorigin": crossorigin}
+            )
+            continue
+        if kind not in types:
+            continue
+        if kind == "image":
+            if images >= max_images:
+                continue
+            images += 1
+        hints.append({"href": static(value), "as": kind, "crossorigin": crossorigin})
+    return hints
+
+
+# ----------------------------------------------------------
+# Build manifest
+@lru_cache(maxsize=1)
+def load_manifest():
+    """
+    Optional JSON file mapping routes to hints, written by the front-end
+    build: {"home:index": [{"href": "css/main.css", "as": "style"}], ...}.
+    Relative hrefs are static paths. "*" applies to routes not listed.
+    """
+    path = getattr(settings, "PRELOAD_MANIFEST", None)
+    if not path:
+        return {}
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        logger.error("Could not read preload manifest %s: %s", path, e)
+        return {}
+
+
+def _manifest_hints(entries):
+    hints = []
+    for entry in entries:
+        href = entry["href"]
+        if not href.startswith(("/", "http://", "https://")):
+            href = static(href)
+        hints.append({**entry, "href": href})
+    return hints
+
+
+# ----------------------------------------------------------
+# Per-route hints
+@lru_cache(maxsize=None)
+def route_hints(route):
+    manifest = load_manifest()
+    if route in manifest:
+        return _manifest_hints(manifest[route])
+
+    templates = {**ROUTE_TEMPLATES, **getattr(settings, "PRELOAD_ROUTE_TEMPLATES", {})}
+    if route in templates:
+        return analyze_template(templates[route])
+    if "*" in manifest:
+        return _manifest_hints(manifest["*"])
+    return []
+
+
+def format_link(hint):
+    value = f"<{hint['href']}>; rel={hint.get('rel', 'preload')}"
+    if "as" in hint:
+        value += f"; as={hint['as']}"
+    if hint.get("as") == "font" or hint.get("crossorigin"):
+        value += "; crossorigin"
+    return value
+
+
+def route_links(route):
+    return [format_link(hint) for hint in route_hints(route)]
+
+
+def route_name(resolver_match):
+    if resolver_match is None or not resolver_match.url_name:
+        return None
+    return resolver_match.view_name
+
+
+def clear_cache():
+    load_manifest.cache_clear()
+    route_hints.cache_clear()
+
+
+# ----------------------------------------------------------
+# 103 Early Hints (ASGI)
+class EarlyHintsMiddleware:
+    """
+    ASGI wrapper that sends the route's hints as 103 Early Hints before
+    Django starts rendering. Only servers that advertise the
+    "http.response.early_hint" extension in the scope get them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] in ("GET", "HEAD")
+            and "http.response.early_hint" in scope.get("extensions", {})
+            and is_enabled()
+        ):
+            links = self.links_for_path(scope["path"])
+            if links:
+                await send(
+                    {
+                        "type": "http.response.early_hint",
+                        "links": [link.encode("latin-1") for link in links],
+                    }
+                )
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def links_for_path(path):
+        from django.urls import Resolver404, resolve
+
+        try:
+            route = route_name(resolve(path))
+        except Resolver404:
+            return []
+        return route_links(route) if route else []
@@ -0,0 +1,294 @@
+# apps/home/profiling.py
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+# ----------------------------------------------------------
+# Per-request profiling
+#
+# A request to an apps.home view is profiled when it carries a signed
+# X-Profile header (see make_token) or, for staff users, ?_profile=1. A
+# sampling thread records the request thread's stack every
+# PROFILING_INTERVAL seconds, a DB execute wrapper records every query and
+# a hook on Template.render records template timings. Profiles are written
+# as JSON files to PROFILING_DIR, keeping the newest PROFILING_MAX_PROFILES,
+# and are browsed in the admin (RequestProfile). Stacks are exported in the
+# "collapsed" format read by flamegraph.pl, speedscope and inferno.
+
+TOKEN_SALT = "apps.home.profiling"
+TOKEN_HEADER = "X-Profile"
+QUERY_PARAMETER = "_profile"
+
+_active = ContextVar("profile", default=None)
+_template_hook_lock = threading.Lock()
+_template_hook_installed = False
+
+
+def get_profile_dir():
+    path = getattr(
+        settings,
+        "PROFILING_DIR",
+        os.path.join(tempfile.gettempdir(), "portfolio", "profiles"),
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_interval():
+    return getattr(settings, "PROFILING_INTERVAL", 0.001)
+
+
+# ----------------------------------------------------------
+# Triggers
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign("profile")
+
+
+def has_valid_token(request):
+    token = request.headers.get(TOKEN_HEADER)
+    if not token:
+        return False
+    max_age = getattr(settings, "PROFILING_TOKEN_MAX_AGE", 60 * 60)
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request, view_func):
+    if not getattr(settings, "PROFILING_ENABLED", False):
+        return False
+    if not getattr(view_func, "__module__", "").startswith("apps.home."):
+        return False
+    if has_valid_token(request):
+        return True
+    return QUERY_PARAMETER in request.GET and request.user.is_staff
+
+
+# ----------------------------------------------------------
+# Collectors
+class StackSampler(threading.Thread):
+    """Samples the stack of one thread until stopped"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.labels = {}
+        self.path_prefixes = sorted(
+            (str(entry) for entry in sys.path if entry), key=len, reverse=True
+        )
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self.frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def frame_label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            for prefix in self.path_prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix) :].lstrip(os.sep)
+                    break
+            # ";" separates frames in the collapsed format
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            label = self.labels[code] = label.replace(";", ":")
+        return label
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class QueryRecorder:
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "alias": self.alias,
+                    "sql": sql,
+                    "params": repr(params)[:500],
+                    "many": many,
+                    "duration": time.perf_counter() - started,
+                }
+            )
+
+
+def _install_template_hook():
+    """Wrap Template.render once; it only records while a profile is active"""
+    global _template_hook_installed
+    with _template_hook_lock:
+        if _template_hook_installed:
+            return
+        from django.template.base import Template
+
+        render = Template.render
+
+        def profiled_render(self, context):
+            profile = _active.get()
+            if profile is None:
+                return render(self, context)
+            started = time.perf_counter()
+            depth = profile["template_depth"]
+            profile["template_depth"] += 1
+            try:
+                return render(self, context)
+            finally:
+                profile["template_depth"] -= 1
+                profile["templates"].append(
+                    {
+                        "name": self.origin.template_name or self.origin.name,
+                        "depth": depth,
+                        "duration": time.perf_counter() - started,
+                    }
+                )
+
+        Template.render = profiled_render
+        _template_hook_installed = True
+
+
+# ----------------------------------------------------------
+# Profiling a view
+def profile_view(request, view_func, args, kwargs):
+    """Call the view under the profiler, store the profile, return the response"""
+    _install_template_hook()
+    profile = {"templates": [], "template_depth": 0}
+    recorders = [QueryRecorder(connection.alias) for connection in connections.all()]
+    sampler = StackSampler(threading.get_ident(), get_interval())
+
+    token = _active.set(profile)
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        with ExitStack() as stack:
+            for connection, recorder in zip(connections.all(), recorders):
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, "render") and callable(response.render):
+                response = response.render()
+            if response.streaming:
+                # Streamed pages render while being consumed
+                content = b"".join(response.streaming_content)
+                response.streaming_content = [content]
+    finally:
+        duration = time.perf_counter() - started
+        sampler.stop()
+        _active.reset(token)
+
+    profile_id = save_profile(
+        {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "view": f"{view_func.__module__}.{getattr(view_func, '__name__', '')}",
+            "status": response.status_code,
+            "duration": duration,
+            "interval": sampler.interval,
+            "queries": [query for recorder in recorders for query in recorder.queries],
+            "templates": profile["templates"],
+            "stacks": [
+                [";".join(stack), count] for stack, count in sampler.stacks.items()
+            ],
+        }
+    )
+    response["X-Profile-Id"] = profile_id
+    return response
+
+
+# ----------------------------------------------------------
+# Ring buffer on disk
+def save_profile(data):
+    profile_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    data = {"id": profile_id, "created": time.time(), **data}
+    directory = get_profile_dir()
+    temp_path = os.path.join(directory, f".{profile_id}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temp_path, os.path.join(directory, f"{profile_id}.json"))
+    prune_profiles()
+    return profile_id
+
+
+def profile_ids():
+    """Stored profile ids, newest first"""
+    names = [
+        name[: -len(".json")]
+        for name in os.listdir(get_profile_dir())
+        if name.endswith(".json")
+    ]
+    return sorted(names, key=lambda name: int(name.split("-")[0]), reverse=True)
+
+
+def prune_profiles():
+    keep = getattr(settings, "PROFILING_MAX_PROFILES", 50)
+    for profile_id in profile_ids()[keep:]:
+        try:
+            os.remove(os.path.join(get_profile_dir(), f"{profile_id}.json"))
+        except FileNotFoundError:
+            pass
+
+
+def load_profile(profile_id):
+    """The stored profile, or None (ids are validated against the directory)"""
+    if profile_id not in profile_ids():
+        return None
+    with open(
+        os.path.join(get_profile_dir(), f"{profile_id}.json"), encoding="utf-8"
+    ) as file:
+        return json.load(file)
+
+
+def collapsed_stacks(profile):
+    """Stacks in the collapsed ("folded") flamegraph format"""
+    return "".join(f"{stack} {count}\n" for stack, count in profile["stacks"])
+
+
+def summarize(profile, limit=20):
+    """Figures shown in the admin: totals, slowest queries, hottest frames"""
+    queries = profile["queries"]
+    leaves = Counter()
+    for stack, count in profile["stacks"]:
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    samples = sum(leaves.values())
+    return {
+        "query_count": len(queries),
+        "query_time": sum(query["duration"] for query in queries),
+        "slowest_queries": sorted(queries, key=lambda q: q["duration"], reverse=True)[
+            :limit
+        ],
+        "templates": sorted(
+            profile["templates"], key=lambda t: t["duration"], reverse=True
+        )[:limit],
+        "samples": samples,
+        "hot_frames": [
+            (frame, count, count / samples)
+            for frame, count in leaves.most_common(limit)
+        ],
+    }
@@ -0,0 +1,191 @@
+# apps/home/recommendations.py
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .models import PortfolioItem, RelatedItem
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Feature extraction
+DEFAULT_TOP_K = 6
+
+FEATURE_FIELDS = ("title", "short_description", "full_description", "technologies")
+
+# Technologies are matched as whole names, text fields as words
+FIELD_WEIGHTS = {
+    "technologies": 3.0,
+    "title": 2.0,
+    "short_description": 1.0,
+    "full_description": 0.5,
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9\u0600-\u06FF][a-z0-9\u0600-\u06FF+#.]*")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with can all also into their our your".split()
+)
+
+
+def item_features(item):
+    """Weighted term counts for one item"""
+    features = Counter()
+    for tech in item.get_technologies_list():
+        if tech:
+            features[f"tech:{tech.lower()}"] += FIELD_WEIGHTS["technologies"]
+    for field in ("title", "short_description", "full_description"):
+        for token in TOKEN_RE.findall(getattr(item, field).lower()):
+            token = token.rstrip(".")
+            if len(token) > 2 and token not in STOP_WORDS:
+                features[token] += FIELD_WEIGHTS[field]
+    return features
+
+
+def similarity_matrix(items):
+    """Cosine similarity of the TF-IDF vectors of `items` (n x n)"""
+    import numpy as np  # deferred: only needed when recommendations are rebuilt
+
+    documents = [item_features(item) for item in items]
+    vocabulary = {}
+    for document in documents:
+        for term in document:
+            vocabulary.setdefault(term, len(vocabulary))
+
+    matrix = np.zeros((len(items), len(vocabulary)), dtype=np.float32)
+    for row, document in enumerate(documents):
+        for term, weight in document.items():
+            # Sublinear tf damps long descriptions repeating the same word
+            matrix[row, vocabulary[term]] = 1.0 + math.log(weight)
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(items)) / (1 + document_frequency)) + 1.0
+    matrix *= idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix @ matrix.T
+
+
+def compute_related(items, top_k=DEFAULT_TOP_K):
+    """Return {item_id: [(related_id, score), ...]} for the top-k neighbours"""
+    import numpy as np
+
+    k = min(top_k, len(items) - 1)
+    if k < 1:
+        return {item.pk: [] for item in items}
+
+    similarity = similarity_matrix(items)
+    np.fill_diagonal(similarity, -1.0)
+    # argpartition finds the k best in O(n), then only those k are sorted
+    candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+
+    related = {}
+    for row, item in enumerate(items):
+        columns = sorted(candidates[row], key=lambda column: -similarity[row, column])
+        related[item.pk] = [
+            (items[column].pk, float(similarity[row, column]))
+            for column in columns
+            if similarity[row, column] > 0
+        ]
+    return related
+
+
+# ----------------------------------------------------------
+# Storage
+def refresh_related_items(top_k=DEFAULT_TOP_K):
+    """
+    Recompute recommendations and rewrite only the items whose list changed.
+
+    Similarity is recomputed for all active items (IDF is global), but most
+    edits only move a handful of neighbour lists, so only those rows are
+    deleted and re-inserted. Returns the number of items rewritten.
+    """
+    items = list(
+        PortfolioItem.objects.filter(is_active=True).only("id", *FEATURE_FIELDS)
+    )
+    related = compute_related(items, top_k)
+
+    stored = {}
+    for item_id, related_id in RelatedItem.objects.order_by("item", "rank").values_list(
+        "item_id", "related_id"
+    ):
+        stored.setdefault(item_id, []).append(related_id)
+
+    changed = [
+        item_id
+        for item_id, neighbours in related.items()
+        if [related_id for related_id, _ in neighbours] != stored.get(item_id, [])
+    ]
+    stale = set(stored) - set(related)
+
+    with transaction.atomic():
+        RelatedItem.objects.filter(item_id__in=[*changed, *stale]).delete()
+        RelatedItem.objects.bulk_create(
+            RelatedItem(item_id=item_id, related_id=related_id, score=score, rank=rank)
+            for item_id in changed
+            for rank, (related_id, score) in enumerate(related[item_id])
+        )
+    return len(changed) + len(stale)
+
+
+# ----------------------------------------------------------
+# Background refresh (scheduled after commit, see signals.py)
+#
+# A rebuild compares every active item with every other one, so it never
+# runs on the request that saved an item. Edits within RELATED_REFRESH_DELAY
+# seconds share one rebuild in a background thread; an edit arriving while
+# a rebuild runs schedules another, since rebuilding is idempotent.
+_refresh_lock = threading.Lock()
+_refresh_timer = None
+
+
+def _reset_after_fork():
+    global _refresh_lock, _refresh_timer
+    _refresh_lock = threading.Lock()
+    _refresh_timer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def schedule_refresh():
+    global _refresh_timer
+    with _refresh_lock:
+        if _refresh_timer is None:
+            _refresh_timer = threading.Timer(
+                getattr(settings, "RELATED_REFRESH_DELAY", 2.0), _run_refresh
+            )
+            _refresh_timer.daemon = True
+            _refresh_timer.start()
+
+
+def _run_refresh():
+    global _refresh_timer
+    with _refresh_lock:
+        _refresh_timer = None
+    try:
+        refresh_related_items()
+    except Exception:
+        logger.exception("Refreshing related items failed")
+    finally:
+        connections.close_all()
+
+
+def get_related_items(item, limit=3):
+    """Precomputed related items for the detail page (one indexed join)"""
+    return [
+        link.related
+        for link in RelatedItem.objects.filter(item=item, related__is_active=True)
+        .select_related("related")
+        .order_by("rank")[:limit]
+    ]
@@ -0,0 +1,167 @@
+# apps/home/service_worker.py
+import hashlib
+import json
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.loader import render_to_string
+
+from .preload import STATIC_RE
+from .storage import CAS_PREFIX
+from .warmup import template_names
+
+# ----------------------------------------------------------
+# Generated service worker
+#
+# build() writes SERVICE_WORKER_PATH (served at /sw.js) from the
+# home/sw.js template. The precache manifest lists every static file the
+# project templates reference, the files their CSS pulls in with url()
+# (icon fonts) and everything under img/, each with a content hash; the
+# worker version is a hash of the manifest, so a deploy that changes any
+# static file installs a new precache and drops the old one. At runtime
+# the worker serves precached files cache-first, content-addressed media
+# (MEDIA_URL/cas/...) cache-first, and navigations to the portfolio
+# pages stale-while-revalidate. The index is left out: it carries the
+# contact form's CSRF token and the flash messages.
+
+CSS_URL_RE = re.compile(r"""url\(\s*["']?([^"')]+?)["']?\s*\)""")
+
+# Always precached: the site's own images
+PRECACHE_DIRECTORIES = ("img/",)
+
+# Pages answered stale-while-revalidate
+PAGE_PATTERN = r"^/portfolio/"
+
+MAX_PAGES = 50
+MAX_MEDIA = 200
+
+
+def get_output_path():
+    return getattr(
+        settings,
+        "SERVICE_WORKER_PATH",
+        os.path.join(settings.BASE_DIR, "build", "sw.js"),
+    )
+
+
+def max_file_size():
+    return getattr(settings, "SERVICE_WORKER_MAX_FILE_SIZE", 2 * 1024 * 1024)
+
+
+def _referenced_static_paths():
+    from django.template import engines
+
+    engine = engines["django"].engine
+    paths = set()
+    for name in template_names():
+        try:
+            source = engine.find_template(name)[0].source
+        except Exception:
+            continue
+        if not name.startswith("admin/"):
+            paths.update(STATIC_RE.findall(source))
+    return paths
+
+
+def _css_dependencies(path, source):
+    """Static paths a stylesheet loads with url()"""
+    directory = posixpath.dirname(path)
+    for reference in CSS_URL_RE.findall(source):
+        reference = reference.split("?")[0].split("#")[0]
+        if not reference or reference.startswith(
+            ("data:", "http:", "https:", "//", "/")
+        ):
+            continue
+        yield posixpath.normpath(posixpath.join(directory, reference))
+
+
+def _directory_paths(prefix):
+    for directory in settings.STATICFILES_DIRS:
+        root = os.path.join(directory, prefix)
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                if not filename.startswith("."):
+                    full_path = os.path.join(dirpath, filename)
+                    yield os.path.relpath(full_path, directory).replace(os.sep, "/")
+
+
+def precache_paths():
+    """Static paths to precache, with their files on disk"""
+    pending = _referenced_static_paths()
+    for prefix in PRECACHE_DIRECTORIES:
+        pending.update(_directory_paths(prefix))
+
+    found = {}
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        full_path = finders.find(path)
+        if not full_path or os.path.getsize(full_path) > max_file_size():
+            continue
+        found[path] = full_path
+        if path.endswith(".css"):
+            with open(full_path, encoding="utf-8", errors="replace") as file:
+                pending.update(_css_dependencies(path, file.read()))
+    return found
+
+
+def _file_hash(full_path):
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(full_path, "rb") as file:
+        while block := file.read(64 * 1024):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def build_manifest():
+    """[[url, revision], ...] sorted by url"""
+    return sorted(
+        [staticfiles_storage.url(path), _file_hash(full_path)]
+        for path, full_path in precache_paths().items()
+    )
+
+
+def build():
+    """Write the service worker; returns (path, version, manifest)"""
+    manifest = build_manifest()
+    version = hashlib.md5(
+        json.dumps(manifest).encode(), usedforsecurity=False
+    ).hexdigest()[:12]
+    source = render_to_string(
+        "home/sw.js",
+        {
+            "version_json": json.dumps(version),
+            "precache_json": json.dumps(manifest, indent=1),
+            "page_pattern_json": json.dumps(PAGE_PATTERN),
+            "media_prefix_json": json.dumps(
+                "/" + settings.MEDIA_URL.lstrip("/") + f"{CAS_PREFIX}/"
+            ),
+            "max_pages": MAX_PAGES,
+            "max_media": MAX_MEDIA,
+        },
+    )
+    path = get_output_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(source)
+    os.replace(temp_path, path)
+    return path, version, manifest
+
+
+def is_built():
+    return os.path.exists(get_output_path())
+
+
+def load():
+    """The generated worker source, or None before the first build"""
+    try:
+        with open(get_output_path(), encoding="utf-8") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
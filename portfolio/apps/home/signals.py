@@ -0,0 +1,385 @@
+# apps/home/signals.py
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import (
+    cdn,
+    counters,
+    fragment_cache,
+    recommendations,
+    sitemap,
+    slow_queries,
+    warmup,
+)
+from .models import PortfolioCategory, PortfolioImage, PortfolioItem
+from .recommendations import FEATURE_FIELDS
+
+_pending = threading.local()
+
+# Fields that decide which rows a listing shows, and in which order
+LISTING_FIELDS = {
+    PortfolioCategory: ("is_active", "order"),
+    PortfolioItem: ("category_id", "is_active", "is_featured", "order"),
+    PortfolioImage: ("portfolio_item_id", "order"),
+}
+
+# Changing a child row also changes how its parent renders
+PARENT_FIELDS = {
+    PortfolioItem: "category",
+    PortfolioImage: "portfolio_item",
+}
+
+
+# ----------------------------------------------------------
+# Bulk operations
+@contextmanager
+def suppress_signals():
+    """
+    Skip the per-row handlers below in this thread, e.g. for a delete whose
+    cascade would otherwise invalidate, purge and re-warm row by row. The
+    caller reports the change once with notify_bulk_change() and settles
+    counters and media references itself.
+    """
+    previous = getattr(_pending, "suppressed", False)
+    _pending.suppressed = True
+    try:
+        yield
+    finally:
+        _pending.suppressed = previous
+
+
+def signals_suppressed():
+    return getattr(_pending, "suppressed", False)
+
+
+# ----------------------------------------------------------
+# Loaded-state tracking for portfolio models
+def _listing_state(instance):
+    # Read __dict__ directly so deferred fields are not fetched one by one
+    fields = LISTING_FIELDS[type(instance)]
+    return tuple(instance.__dict__.get(field) for field in fields)
+
+
+def listing_changed(instance):
+    """True if a listing field differs from the value loaded from the DB"""
+    return getattr(instance, "_loaded_listing_state", None) != _listing_state(instance)
+
+
+def _saved_listing_state(instance, update_fields):
+    """The listing state now in the DB (fields left out of update_fields kept)"""
+    state = _listing_state(instance)
+    loaded = getattr(instance, "_loaded_listing_state", None)
+    if update_fields is None or loaded is None:
+        return state
+    return tuple(
+        value if is_written(field, update_fields) else old
+        for field, value, old in zip(LISTING_FIELDS[type(instance)], state, loaded)
+    )
+
+
+def is_written(attname, update_fields):
+    """True if a save with `update_fields` writes the field `attname`"""
+    return (
+        update_fields is None
+        or attname in update_fields
+        or attname.removesuffix("_id") in update_fields
+    )
+
+
+def _file_names(instance):
+    # Deferred (not loaded) file fields are left out
+    return {
+        field: str(instance.__dict__[field] or "")
+        for field in getattr(instance, "IMAGE_FIELDS", ())
+        if field in instance.__dict__
+    }
+
+
+def _portfolio_instance_loaded(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._loaded_listing_state = _listing_state(instance)
+        instance._loaded_file_names = _file_names(instance)
+        fragment_cache.record_loaded(instance)
+
+
+def _portfolio_instance_saved(sender, instance, created, update_fields=None, **kwargs):
+    if signals_suppressed():
+        return
+    if sender is PortfolioItem:
+        _update_item_counters(instance, created, update_fields)
+    table = created or listing_changed(instance)
+    _invalidate_fragments(instance, table)
+    _purge_cdn(instance, table)
+    if not kwargs.get("raw"):
+        _schedule_rewarm(instance)
+    instance._loaded_listing_state = _saved_listing_state(instance, update_fields)
+    _update_file_references(instance, created, update_fields)
+
+
+def _portfolio_instance_deleted(sender, instance, **kwargs):
+    if signals_suppressed():
+        return
+    if sender is PortfolioItem:
+        _update_item_counters(instance, False, None, deleted=True)
+    _invalidate_fragments(instance, True)
+    _purge_cdn(instance, True)
+    _schedule_rewarm(instance)
+    for field, name in _file_names(instance).items():
+        if name:
+            _release_file(instance, field, name)
+
+
+for _model in LISTING_FIELDS:
+    post_init.connect(_portfolio_instance_loaded, sender=_model)
+    post_save.connect(_portfolio_instance_saved, sender=_model)
+    post_delete.connect(_portfolio_instance_deleted, sender=_model)
+
+
+# ----------------------------------------------------------
+# Active-item counters (see counters.py)
+COUNTER_FIELDS = ("category_id", "is_active")
+
+
+def _lock_counter_fields(sender, instance, update_fields=None, **kwargs):
+    """
+    Before a save or delete changes them, lock the row and read the stored
+    counter fields, so the change is counted from what is in the DB: not
+    from a stale or deferred (.only()/.defer()) copy, and not twice when
+    two requests toggle the same item
+    """
+    if kwargs.get("raw") or instance.pk is None or signals_suppressed():
+        return
+    if not any(is_written(field, update_fields) for field in COUNTER_FIELDS):
+        return
+    row = (
+        PortfolioItem.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list(*COUNTER_FIELDS)
+        .first()
+    )
+    if row is None:
+        return  # not stored yet: the save inserts it
+    fields = LISTING_FIELDS[PortfolioItem]
+    state = list(
+        getattr(instance, "_loaded_listing_state", None) or (None,) * len(fields)
+    )
+    for field, value in zip(COUNTER_FIELDS, row):
+        state[fields.index(field)] = value
+    instance._loaded_listing_state = tuple(state)
+
+
+pre_save.connect(_lock_counter_fields, sender=PortfolioItem)
+pre_delete.connect(_lock_counter_fields, sender=PortfolioItem)
+
+
+def _update_item_counters(instance, created, update_fields, deleted=False):
+    """Move the item's contribution from its old to its new counters"""
+    fields = LISTING_FIELDS[PortfolioItem]
+    before = None
+    if not created:
+        loaded = getattr(instance, "_loaded_listing_state", None)
+        if loaded is None:
+            return  # state before the write is unknown; reconcile_counters fixes it
+        before = tuple(loaded[fields.index(field)] for field in COUNTER_FIELDS)
+
+    after = None
+    if not deleted:
+        current = _listing_state(instance)
+        after = []
+        for index, field in enumerate(COUNTER_FIELDS):
+            value = current[fields.index(field)]
+            written = is_written(field, update_fields)
+            if before is not None and (value is None or not written):
+                value = before[index]  # deferred, or not part of this save
+            after.append(value)
+        after = tuple(after)
+
+    if None in (before or ()) or None in (after or ()):
+        return
+    counters.apply_item_change(before, after)
+
+
+# ----------------------------------------------------------
+# Media references (content-addressed blobs are shared between rows)
+def _update_file_references(instance, created, update_fields):
+    """Retain the media files a save started referencing, release replaced ones"""
+    loaded = {} if created else getattr(instance, "_loaded_file_names", {})
+    saved = dict(loaded)
+    for field, name in _file_names(instance).items():
+        if not is_written(field, update_fields):
+            continue
+        # None: the field was deferred when the row was loaded. The new name
+        # is still retained; an unknown old name is never released
+        old = loaded.get(field)
+        if name == old:
+            continue
+        if name:
+            _retain_file(instance, field, name)
+        if old:
+            _release_file(instance, field, old)
+        saved[field] = name
+    instance._loaded_file_names = saved
+
+
+def _retain_file(instance, field, name):
+    # Counted inside the save's transaction, so a rollback undoes it
+    storage = instance._meta.get_field(field).storage
+    if hasattr(storage, "retain"):
+        storage.retain(name)
+
+
+def _release_file(instance, field, name):
+    storage = instance._meta.get_field(field).storage
+    if hasattr(storage, "release"):
+        transaction.on_commit(partial(storage.release, name))
+
+
+# ----------------------------------------------------------
+# Parent rows (current one, and the previous one if the row moved)
+def _parents(instance):
+    parent_field = PARENT_FIELDS.get(type(instance))
+    if not parent_field:
+        return None, []
+    model = type(instance)
+    parent_model = model._meta.get_field(parent_field).related_model
+    attname = f"{parent_field}_id"
+    # Not getattr(): a deferred field would be fetched, after a delete too
+    pks = {instance.__dict__.get(attname)}
+    loaded = getattr(instance, "_loaded_listing_state", None)
+    if loaded is not None:
+        pks.add(loaded[LISTING_FIELDS[model].index(attname)])
+    return parent_model, [pk for pk in pks if pk is not None]
+
+
+# ----------------------------------------------------------
+# Fragment cache invalidation (after commit, so re-renders see new rows)
+def _invalidate_fragments(instance, table):
+    keys = fragment_cache.instance_keys(instance, table=table)
+    parent_model, parent_pks = _parents(instance)
+    for pk in parent_pks:
+        keys.append(fragment_cache.dependency_key(parent_model._meta.label_lower, pk))
+    transaction.on_commit(partial(fragment_cache.touch, keys))
+
+
+# ----------------------------------------------------------
+# CDN purge by surrogate key
+def _purge_cdn(instance, table):
+    keys = [cdn.model_key(type(instance), instance.pk)]
+    parent_model, parent_pks = _parents(instance)
+    if parent_pks:
+        keys += cdn.model_keys(parent_model, parent_pks)
+    if table and cdn.list_key(type(instance)):
+        keys.append(cdn.list_key(type(instance)))
+    cdn.schedule_purge(keys)
+
+
+# ----------------------------------------------------------
+# Re-warm the affected pages once the invalidations above have run
+def _schedule_rewarm(instance):
+    targets = {type(instance): {instance.pk}}
+    parent_model, parent_pks = _parents(instance)
+    if parent_pks:
+        targets[parent_model] = set(parent_pks)
+    transaction.on_commit(partial(warmup.schedule_rewarm, targets))
+
+
+# ----------------------------------------------------------
+# Related items: rebuilt in the background after a committed item change.
+# Nothing is remembered per transaction, so a rollback (which drops the
+# callback) cannot block later refreshes; extra callbacks are no-ops while a
+# rebuild is already scheduled.
+def schedule_related_refresh():
+    transaction.on_commit(recommendations.schedule_refresh)
+
+
+@receiver(post_save, sender=PortfolioItem)
+def portfolio_item_saved(sender, instance, created, update_fields=None, **kwargs):
+    if signals_suppressed():
+        return
+    relevant = {*FEATURE_FIELDS, "is_active"}
+    if update_fields is None or relevant.intersection(update_fields):
+        schedule_related_refresh()
+
+
+@receiver(post_delete, sender=PortfolioItem)
+def portfolio_item_deleted(sender, instance, **kwargs):
+    if not signals_suppressed():
+        schedule_related_refresh()
+
+
+# ----------------------------------------------------------
+# Sitemap and feed: rebuild the touched sections once per transaction
+def _run_sitemap_refresh():
+    item_pks = getattr(_pending, "sitemap_items", None)
+    if item_pks is None:
+        return  # already refreshed by an earlier callback of this commit
+    _pending.sitemap_items = None
+    sitemap.refresh(item_pks)
+
+
+def schedule_sitemap_refresh(item_pks=()):
+    # Every call registers a callback: one registered in a transaction that
+    # was rolled back never runs, and its items are refreshed with the next
+    # commit instead of blocking later refreshes
+    pending = getattr(_pending, "sitemap_items", None)
+    if pending is None:
+        pending = _pending.sitemap_items = set()
+    pending.update(item_pks)
+    # Runs immediately outside a transaction
+    transaction.on_commit(_run_sitemap_refresh)
+
+
+@receiver(post_save, sender=PortfolioItem)
+@receiver(post_delete, sender=PortfolioItem)
+def portfolio_item_changed_sitemap(sender, instance, **kwargs):
+    if not signals_suppressed():
+        schedule_sitemap_refresh([instance.pk])
+
+
+@receiver(post_save, sender=PortfolioCategory)
+@receiver(post_delete, sender=PortfolioCategory)
+def portfolio_category_changed_sitemap(sender, instance, **kwargs):
+    if not signals_suppressed():
+        schedule_sitemap_refresh()
+
+
+# ----------------------------------------------------------
+# Bulk writes (bulk_update / queryset.update, deletes under
+# suppress_signals()) bypass the signals above;
+# callers report them here so derived caches stay in sync.
+def notify_bulk_change(model, pks):
+    label = model._meta.label_lower
+    keys = [fragment_cache.dependency_key(label)]
+    keys += [fragment_cache.dependency_key(label, pk) for pk in pks]
+    transaction.on_commit(partial(fragment_cache.touch, keys))
+
+    surrogate_keys = cdn.model_keys(model, pks)
+    if cdn.list_key(model):
+        surrogate_keys.append(cdn.list_key(model))
+    cdn.schedule_purge(surrogate_keys)
+
+    transaction.on_commit(partial(warmup.schedule_rewarm, {model: set(pks)}))
+
+    if model is PortfolioItem:
+        schedule_sitemap_refresh(pks)
+    elif model is PortfolioCategory:
+        schedule_sitemap_refresh()
+
+
+# ----------------------------------------------------------
+# Slow-query capture on every new database connection
+@receiver(connection_created)
+def database_connection_created(sender, connection, **kwargs):
+    slow_queries.install_wrapper(connection)
@@ -0,0 +1,227 @@
+# apps/home/sitemap.py
+import re
+from datetime import timezone as dt_timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, Max, Q
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .fragment_cache import is_process_local
+from .models import PortfolioCategory, PortfolioItem
+
+# ----------------------------------------------------------
+# Pre-generated sitemap.xml and Atom feed
+#
+# The sitemap is kept in sections: "pages" (home page and categories) and
+# "items-<n>", the active items with pk in [n * SITEMAP_BUCKET_SIZE,
+# (n + 1) * SITEMAP_BUCKET_SIZE). Each section's <url> entries are cached;
+# a change to an item rebuilds only its own section, the pages section and
+# the root document (see signals.py), which is assembled from the cached
+# sections without touching item rows. While all URLs fit in one file
+# (MAX_URLS) /sitemap.xml is a single <urlset>; beyond that it becomes a
+# <sitemapindex> of /sitemap-<section>.xml files. The feed lists the
+# newest FEED_ITEMS items and is rebuilt with them.
+#
+# Entries never expire in a shared cache. A per-process cache (no
+# REDIS_URL) only sees the rebuilds of the worker that saved the change,
+# so there they expire after SITEMAP_LOCAL_TIMEOUT seconds and the other
+# workers rebuild them from the database.
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+# Protocol limit per sitemap file (the 50 MB limit is far off at this size)
+MAX_URLS = 50000
+
+FEED_ITEMS = 20
+
+KEY_PREFIX = "sitemap"
+SECTION_RE = re.compile(r"^(pages|items-\d+)$")
+
+
+def get_cache():
+    return caches[getattr(settings, "SITEMAP_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    if is_process_local(get_cache()):
+        return getattr(settings, "SITEMAP_LOCAL_TIMEOUT", 5 * 60)
+    return None
+
+
+def bucket_size():
+    return min(getattr(settings, "SITEMAP_BUCKET_SIZE", 10000), MAX_URLS)
+
+
+def absolute_url(path):
+    return getattr(settings, "SITE_URL", "http://localhost:8000").rstrip("/") + path
+
+
+def _w3c_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _url_entry(path, lastmod=None):
+    entry = f"<url><loc>{escape(absolute_url(path))}</loc>"
+    if lastmod is not None:
+        entry += f"<lastmod>{_w3c_datetime(lastmod)}</lastmod>"
+    return entry + "</url>\n"
+
+
+def _urlset(xml):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="{SITEMAP_NS}">\n{xml}</urlset>\n'
+    )
+
+
+# ----------------------------------------------------------
+# Sections
+def build_pages():
+    latest = PortfolioItem.objects.filter(is_active=True).aggregate(
+        lastmod=Max("updated_at")
+    )["lastmod"]
+    entries = [_url_entry(reverse("home:index"), latest)]
+    categories = (
+        PortfolioCategory.objects.filter(is_active=True)
+        .annotate(lastmod=Max("items__updated_at", filter=Q(items__is_active=True)))
+        .values_list("slug", "lastmod")
+    )
+    for slug, lastmod in categories:
+        entries.append(
+            _url_entry(reverse("home:portfolio_category", args=[slug]), lastmod)
+        )
+    return {"xml": "".join(entries), "count": len(entries), "lastmod": latest}
+
+
+def build_items(bucket):
+    size = bucket_size()
+    rows = (
+        PortfolioItem.objects.filter(
+            is_active=True, pk__gte=bucket * size, pk__lt=(bucket + 1) * size
+        )
+        .order_by("pk")
+        .values_list("slug", "updated_at")
+    )
+    entries, lastmod = [], None
+    for slug, updated_at in rows.iterator():
+        entries.append(
+            _url_entry(reverse("home:portfolio_detail", args=[slug]), updated_at)
+        )
+        lastmod = updated_at if lastmod is None else max(lastmod, updated_at)
+    return {"xml": "".join(entries), "count": len(entries), "lastmod": lastmod}
+
+
+def _section_key(name):
+    return f"{KEY_PREFIX}:section:{name}"
+
+
+def rebuild_section(name):
+    if name == "pages":
+        section = build_pages()
+    else:
+        section = build_items(int(name.split("-")[1]))
+    get_cache().set(_section_key(name), section, get_timeout())
+    return section
+
+
+def get_section(name):
+    section = get_cache().get(_section_key(name))
+    return section if section is not None else rebuild_section(name)
+
+
+def section_names():
+    """The pages section and one items section per non-empty pk bucket"""
+    buckets = (
+        PortfolioItem.objects.filter(is_active=True)
+        .annotate(bucket=F("pk") / bucket_size())
+        .values_list("bucket", flat=True)
+        .distinct()
+        .order_by("bucket")
+    )
+    return ["pages", *(f"items-{bucket}" for bucket in buckets)]
+
+
+# ----------------------------------------------------------
+# Root document
+def rebuild_root():
+    sections = [(name, get_section(name)) for name in section_names()]
+    sections = [(name, section) for name, section in sections if section["count"]]
+    if sum(section["count"] for _, section in sections) <= MAX_URLS:
+        document = _urlset("".join(section["xml"] for _, section in sections))
+    else:
+        entries = []
+        for name, section in sections:
+            entry = (
+                f"<sitemap><loc>{escape(absolute_url(f'/sitemap-{name}.xml'))}</loc>"
+            )
+            if section["lastmod"] is not None:
+                entry += f"<lastmod>{_w3c_datetime(section['lastmod'])}</lastmod>"
+            entries.append(entry + "</sitemap>\n")
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<sitemapindex xmlns="{SITEMAP_NS}">\n{"".join(entries)}</sitemapindex>\n'
+        )
+    get_cache().set(f"{KEY_PREFIX}:root", document, get_timeout())
+    return document
+
+
+def sitemap_document(name=None):
+    """/sitemap.xml (name=None) or one /sitemap-<name>.xml; None if unknown"""
+    if name is None:
+        document = get_cache().get(f"{KEY_PREFIX}:root")
+        return document if document is not None else rebuild_root()
+    if not SECTION_RE.match(name):
+        return None
+    section = get_section(name)
+    return _urlset(section["xml"]) if section["count"] else None
+
+
+# ----------------------------------------------------------
+# Atom feed
+def rebuild_feed():
+    feed = Atom1Feed(
+        title="Alireza Anari - Portfolio",
+        link=absolute_url(reverse("home:index")),
+        description="Recent portfolio projects",
+        feed_url=absolute_url(reverse("home:feed")),
+        language=settings.LANGUAGE_CODE,
+    )
+    items = (
+        PortfolioItem.objects.filter(is_active=True)
+        .select_related("category")
+        .order_by("-created_at")[:FEED_ITEMS]
+    )
+    for item in items:
+        link = absolute_url(reverse("home:portfolio_detail", args=[item.slug]))
+        feed.add_item(
+            title=item.title,
+            link=link,
+            description=item.short_description,
+            unique_id=link,
+            pubdate=item.created_at,
+            updateddate=item.updated_at,
+            categories=[item.category.name],
+        )
+    document = feed.writeString("utf-8")
+    get_cache().set(f"{KEY_PREFIX}:feed", document, get_timeout())
+    return document
+
+
+def feed_document():
+    document = get_cache().get(f"{KEY_PREFIX}:feed")
+    return document if document is not None else rebuild_feed()
+
+
+# ----------------------------------------------------------
+# Incremental refresh (after commit, see signals.py)
+def refresh(item_pks=()):
+    """Rebuild the sections of `item_pks`, the pages section, root and feed"""
+    size = bucket_size()
+    for bucket in sorted({pk // size for pk in item_pks if pk is not None}):
+        rebuild_section(f"items-{bucket}")
+    rebuild_section("pages")
+    rebuild_root()
+    rebuild_feed()
@@ -0,0 +1,262 @@
+# apps/home/slow_queries.py
+import hashlib
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Slow-query capture
+#
+# Every connection gets an execute wrapper (installed on connection_created,
+# see signals.py). Queries slower than SLOW_QUERY_THRESHOLD_MS that were
+# issued from code in apps/home are recorded with the current view and the
+# innermost apps/home call site. Recording, and for a sample of SELECTs
+# running EXPLAIN (ANALYZE, BUFFERS) in a transaction that is rolled back
+# (plain EXPLAIN for WITH queries), happens in one background thread with
+# its own connection; the request only pays for a queue put. SlowQuery
+# keeps the newest SLOW_QUERY_MAX_ROWS rows.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Execute wrappers and middleware sit on every query's stack; the call
+# site is the code that issued the query
+SKIPPED_FILES = {
+    os.path.join(APP_DIR, name)
+    for name in ("slow_queries.py", "middleware.py", "profiling.py")
+}
+
+SELECT_RE = re.compile(r"^\s*(\(\s*)*(SELECT|WITH)\b", re.IGNORECASE)
+# EXPLAIN ANALYZE runs the statement; never sample anything that locks rows
+LOCKING_RE = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE)\b", re.IGNORECASE)
+# ...and only analyze a bare SELECT: a WITH may hold a data-modifying CTE
+BARE_SELECT_RE = re.compile(r"^\s*(\(\s*)*SELECT\b", re.IGNORECASE)
+
+PRUNE_EVERY = 50
+
+current_view = ContextVar("slow_query_view", default="")
+_in_wrapper = threading.local()
+_queue = queue.Queue(maxsize=200)
+_worker = None
+_worker_lock = threading.Lock()
+_recorded = 0
+
+
+def _reset_after_fork():
+    # Threads do not survive fork(); the worker is restarted lazily
+    global _queue, _worker, _worker_lock, _recorded
+    _queue = queue.Queue(maxsize=200)
+    _worker = None
+    _worker_lock = threading.Lock()
+    _recorded = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def is_enabled():
+    return getattr(settings, "SLOW_QUERY_ENABLED", True)
+
+
+def get_threshold():
+    return getattr(settings, "SLOW_QUERY_THRESHOLD_MS", 100) / 1000
+
+
+def fingerprint(sql):
+    return hashlib.md5(" ".join(sql.split()).encode()).hexdigest()
+
+
+def call_site():
+    """Innermost frame in apps/home (outside SKIPPED_FILES), or None"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename not in SKIPPED_FILES:
+            path = os.path.relpath(filename, os.path.dirname(os.path.dirname(APP_DIR)))
+            return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+# ----------------------------------------------------------
+# Execute wrapper
+def slow_query_wrapper(execute, sql, params, many, context):
+    if getattr(_in_wrapper, "active", False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        if duration >= get_threshold():
+            site = call_site()
+            if site is not None:
+                enqueue(
+                    {
+                        "sql": sql,
+                        "params": params,
+                        "many": many,
+                        "duration_ms": duration * 1000,
+                        "view": current_view.get(),
+                        "call_site": site,
+                        "alias": context["connection"].alias,
+                    }
+                )
+
+
+def install_wrapper(db_connection):
+    if is_enabled() and slow_query_wrapper not in db_connection.execute_wrappers:
+        db_connection.execute_wrappers.append(slow_query_wrapper)
+
+
+# ----------------------------------------------------------
+# Background recording
+def enqueue(entry):
+    _start_worker()
+    try:
+        _queue.put_nowait(entry)
+    except queue.Full:
+        logger.warning("Slow query queue is full; dropped %s", entry["call_site"])
+
+
+def _start_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, daemon=True)
+            _worker.start()
+
+
+def _work():
+    _in_wrapper.active = True
+    while True:
+        entry = _queue.get()
+        try:
+            record(entry)
+        except Exception:
+            logger.exception("Recording a slow query failed")
+        finally:
+            close_old_connections()
+
+
+def has_recent_plan(sql_fingerprint):
+    """One plan per query shape and SLOW_QUERY_EXPLAIN_INTERVAL is enough"""
+    from .models import SlowQuery
+
+    interval = getattr(settings, "SLOW_QUERY_EXPLAIN_INTERVAL", 60 * 60)
+    return SlowQuery.objects.filter(
+        fingerprint=sql_fingerprint,
+        plan_status="done",
+        created_at__gte=timezone.now() - timedelta(seconds=interval),
+    ).exists()
+
+
+def should_explain(sql):
+    rate = getattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 0.1)
+    return (
+        SELECT_RE.match(sql) is not None
+        and LOCKING_RE.search(sql) is None
+        and random.random() < rate
+    )
+
+
+def record(entry):
+    global _recorded
+    from .models import SlowQuery
+
+    sql_fingerprint = fingerprint(entry["sql"])
+    explain = (
+        entry["alias"] == connection.alias
+        and not entry["many"]
+        and should_explain(entry["sql"])
+        and not has_recent_plan(sql_fingerprint)
+    )
+    slow_query = SlowQuery.objects.create(
+        sql=entry["sql"],
+        params=repr(entry["params"])[:2000],
+        fingerprint=sql_fingerprint,
+        duration_ms=entry["duration_ms"],
+        view=entry["view"][:100],
+        call_site=entry["call_site"][:255],
+        plan_status="pending" if explain else "none",
+    )
+    if explain:
+        explain_query(slow_query, entry["params"])
+
+    _recorded += 1
+    if _recorded % PRUNE_EVERY == 0:
+        prune()
+
+
+# ----------------------------------------------------------
+# EXPLAIN
+class _RollBack(Exception):
+    """Raised to leave the EXPLAIN transaction through a rollback"""
+
+
+def run_explain(sql, params):
+    """
+    The plan of `sql` on the default database, as text. Runs in a
+    transaction that is always rolled back, since EXPLAIN ANALYZE executes
+    the statement (functions called by a SELECT can write too).
+    """
+    timeout_ms = getattr(settings, "SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 5000)
+    plan = None
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+                if BARE_SELECT_RE.match(sql):
+                    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", params)
+                else:
+                    cursor.execute(f"EXPLAIN {sql}", params)
+            elif connection.vendor == "sqlite":
+                # SQLite has no ANALYZE variant; the query plan still shows scans
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            else:
+                cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(
+                " ".join(str(value) for value in row) for row in cursor.fetchall()
+            )
+            raise _RollBack
+    except _RollBack:
+        pass
+    return plan
+
+
+def explain_query(slow_query, params):
+    try:
+        slow_query.plan = run_explain(slow_query.sql, params)
+        slow_query.plan_status = "done"
+    except Exception as e:
+        slow_query.plan = f"{type(e).__name__}: {e}"
+        slow_query.plan_status = "failed"
+    slow_query.save(update_fields=["plan", "plan_status"])
+
+
+def prune():
+    """Keep the newest SLOW_QUERY_MAX_ROWS rows"""
+    from .models import SlowQuery
+
+    keep = getattr(settings, "SLOW_QUERY_MAX_ROWS", 1000)
+    # The rows beyond the limit by pk: deleting everything up to the cutoff's
+    # timestamp also removed newer rows that share it
+    rows = SlowQuery.objects.order_by("-created_at", "-pk")
+    stale = list(rows.values_list("pk", flat=True)[keep:])
+    if stale:
+        SlowQuery.objects.filter(pk__in=stale).delete()
@@ -0,0 +1,400 @@
+# apps/home/snapshots.py
+import io
+import json
+import tarfile
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .counters import reconcile_counters
+from .models import PortfolioCategory, PortfolioImage, PortfolioItem, StoredBlob
+from .signals import notify_bulk_change, schedule_related_refresh, suppress_signals
+
+# ----------------------------------------------------------
+# Portfolio snapshots (export_portfolio_snapshot / import_portfolio_snapshot)
+#
+# A snapshot is an uncompressed tar archive:
+#
+#   manifest.json       format version, record and media counts
+#   categories.ndjson   one JSON object per row, fields by attname
+#   items.ndjson
+#   images.ndjson
+#   media/<name>        every file referenced by an image field
+#
+# Export streams rows with a server-side cursor into temporary files (a tar
+# header needs the member size up front) and copies media from storage in
+# chunks, so memory does not grow with the number of rows. Import writes
+# the media first, in parallel (each worker reads its member through its own
+# file handle, which is why the archive is not compressed; the images in it
+# already are), then bulk-inserts the rows in batches with the category and
+# item foreign keys remapped to the new primary keys, all in one
+# transaction. Existing categories with the same slug or name are reused;
+# items whose slug already exists are skipped along with their images.
+# Media stored for skipped rows, or by an import that fails, is deleted
+# again unless another row references it.
+#
+# --replace deletes the existing rows with the per-row signal handlers
+# suppressed; caches, counters and media references are settled once for
+# the whole import instead.
+
+FORMAT_VERSION = 1
+
+BATCH_SIZE = 500
+
+MEDIA_PREFIX = "media/"
+
+# (member, model, foreign key attname -> member it points into)
+SECTIONS = (
+    ("categories", PortfolioCategory, {}),
+    ("items", PortfolioItem, {"category_id": "categories"}),
+    ("images", PortfolioImage, {"portfolio_item_id": "items"}),
+)
+
+# Rows matching an existing row on one of these fields are not inserted
+UNIQUE_FIELDS = {
+    PortfolioCategory: ("slug", "name"),
+    PortfolioItem: ("slug",),
+}
+
+# ...and their children are attached to the existing row instead of skipped
+REUSED_MODELS = {PortfolioCategory}
+
+# Recomputed on import instead of copied
+DERIVED_FIELDS = {"active_items_count"}
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def snapshot_fields(model):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname not in DERIVED_FIELDS
+    ]
+
+
+def _add_file(tar, name, fileobj, size):
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    tar.addfile(info, fileobj)
+
+
+# ----------------------------------------------------------
+# Export
+def _spool_rows(model, chunk_size, media):
+    """Write `model` as NDJSON to a temporary file; collects media names"""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    fields = snapshot_fields(model)
+    image_fields = getattr(model, "IMAGE_FIELDS", ())
+    spool = tempfile.TemporaryFile()
+    count = 0
+    rows = model.objects.order_by("pk").values_list(*fields)
+    for row in rows.iterator(chunk_size=chunk_size):
+        record = dict(zip(fields, row))
+        media.update(record[name] for name in image_fields if record[name])
+        spool.write((encoder.encode(record) + "\n").encode())
+        count += 1
+    size = spool.tell()
+    spool.seek(0)
+    return spool, size, count
+
+
+def export_snapshot(fileobj, chunk_size=2000, include_media=True, on_missing=None):
+    """
+    Write a snapshot of the portfolio to the binary file `fileobj`
+    (seekable or not). Returns the record counts and the media file count.
+    """
+    media = set()
+    spools = []
+    counts = {}
+    try:
+        for member, model, _ in SECTIONS:
+            spool, size, counts[member] = _spool_rows(model, chunk_size, media)
+            spools.append((member, spool, size))
+
+        stored = []
+        if include_media:
+            for name in sorted(media):
+                if default_storage.exists(name):
+                    stored.append(name)
+                elif on_missing is not None:
+                    on_missing(name)
+
+        manifest = json.dumps(
+            {
+                "format": FORMAT_VERSION,
+                "created_at": timezone.now().isoformat(),
+                "counts": counts,
+                "media": len(stored),
+            },
+            indent=2,
+        ).encode()
+
+        with tarfile.open(fileobj=fileobj, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+            _add_file(tar, "manifest.json", io.BytesIO(manifest), len(manifest))
+            for member, spool, size in spools:
+                _add_file(tar, f"{member}.ndjson", spool, size)
+            for name in stored:
+                with default_storage.open(name, "rb") as media_file:
+                    _add_file(
+                        tar, MEDIA_PREFIX + name, media_file, default_storage.size(name)
+                    )
+    finally:
+        for _, spool, _ in spools:
+            spool.close()
+    return counts, len(stored)
+
+
+# ----------------------------------------------------------
+# Import
+def _write_media(path, members, workers, media):
+    """
+    Store the media members of the archive at `path` in parallel, adding
+    {archived name: (stored name, size)} to `media`. Every member is
+    attempted; the first error is raised once all have finished, so `media`
+    lists everything that was stored.
+    """
+    storage = default_storage
+    # Content-addressed storage: refcounts are set once the rows are in
+    write_blob = getattr(storage, "write_blob", None)
+
+    def extract(member):
+        name = member.name[len(MEDIA_PREFIX) :]
+        # Opening only reads the first header; each worker seeks on its own
+        with tarfile.open(path, "r:") as tar:
+            content = File(tar.extractfile(member), name=name)
+            if write_blob is not None:
+                # No database in the workers; retain() checks the blobs later
+                return name, write_blob(name, content, lock=False)
+            return name, (storage.save(name, content), None)
+
+    error = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(extract, member) for member in members]:
+            try:
+                name, stored = future.result()
+            except Exception as e:
+                error = error or e
+            else:
+                media[name] = stored
+    if error is not None:
+        raise error
+
+
+def _discard_media(media):
+    """Delete media stored by the import that no row references"""
+    names = sorted({stored for stored, _ in media.values()})
+    if hasattr(default_storage, "retain"):
+        # Content-addressed: a blob may have been stored before the import
+        for start in range(0, len(names), BATCH_SIZE):
+            batch = names[start : start + BATCH_SIZE]
+            referenced = set(
+                StoredBlob.objects.filter(name__in=batch).values_list("name", flat=True)
+            )
+            for name in batch:
+                if name not in referenced:
+                    default_storage.delete(name)
+    else:
+        for name in names:
+            default_storage.delete(name)
+
+
+def _delete_existing():
+    """
+    Delete every category, item and image without the per-row signal
+    handlers. Returns {model: deleted pks} and a Counter of the media names
+    the deleted rows referenced.
+    """
+    deleted, files = {}, Counter()
+    for _, model, _ in SECTIONS:
+        image_fields = getattr(model, "IMAGE_FIELDS", ())
+        pks = []
+        rows = model.objects.values_list("pk", *image_fields)
+        for pk, *names in rows.iterator(chunk_size=BATCH_SIZE):
+            pks.append(pk)
+            files.update(name for name in names if name)
+        deleted[model] = pks
+    with suppress_signals():
+        PortfolioCategory.objects.all().delete()
+    return deleted, files
+
+
+def _release_media(files):
+    for name, count in files.items():
+        default_storage.release(name, count=count)
+
+
+def _timestamp_fields(model):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+
+
+def _insert(model, batch, pk_map, created, references):
+    """bulk_create one batch of (old pk, instance); returns the rows skipped"""
+    unique = UNIQUE_FIELDS.get(model, ())
+    existing = {}
+    if unique:
+        query = Q()
+        for field in unique:
+            query |= Q(**{f"{field}__in": [getattr(obj, field) for _, obj in batch]})
+        for row in model.objects.filter(query).values("pk", *unique):
+            existing.update(((field, row[field]), row["pk"]) for field in unique)
+
+    new, skipped = [], 0
+    for old_pk, obj in batch:
+        match = next(
+            (
+                existing[(field, getattr(obj, field))]
+                for field in unique
+                if (field, getattr(obj, field)) in existing
+            ),
+            None,
+        )
+        if match is None:
+            new.append((old_pk, obj))
+        elif model in REUSED_MODELS:
+            pk_map[old_pk] = match
+        else:
+            skipped += 1
+    if not new:
+        return skipped
+
+    # bulk_create() stamps auto_now(_add) fields; put the exported values back
+    timestamps = _timestamp_fields(model)
+    saved = [{name: getattr(obj, name) for name in timestamps} for _, obj in new]
+    objs = model.objects.bulk_create([obj for _, obj in new])
+    if timestamps:
+        for obj, values in zip(objs, saved):
+            for name, value in values.items():
+                setattr(obj, name, value)
+        model.objects.bulk_update(objs, timestamps)
+
+    for old_pk, obj in new:
+        pk_map[old_pk] = obj.pk
+        created.append(obj.pk)
+        for name in getattr(model, "IMAGE_FIELDS", ()):
+            stored = obj.__dict__.get(name)
+            if stored in references:
+                references[stored] += 1
+    return skipped
+
+
+def _import_rows(fileobj, model, foreign_keys, pk_maps, media, references):
+    fields = [model._meta.get_field(name) for name in snapshot_fields(model)]
+    pk_name = model._meta.pk.attname
+    image_fields = getattr(model, "IMAGE_FIELDS", ())
+    pk_map, created, skipped, batch = {}, [], 0, []
+    for line in fileobj:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        old_pk = record.pop(pk_name)
+        parents = {
+            name: pk_maps[target].get(record[name])
+            for name, target in foreign_keys.items()
+        }
+        if None in parents.values():
+            skipped += 1  # the parent was skipped
+            continue
+        record.update(parents)
+        for name in image_fields:
+            if record.get(name) in media:
+                record[name] = media[record[name]][0]
+        values = {
+            field.attname: field.to_python(record[field.attname])
+            for field in fields
+            if field.attname in record and field.attname != pk_name
+        }
+        batch.append((old_pk, model(**values)))
+        if len(batch) == BATCH_SIZE:
+            skipped += _insert(model, batch, pk_map, created, references)
+            batch = []
+    if batch:
+        skipped += _insert(model, batch, pk_map, created, references)
+    return pk_map, created, skipped
+
+
+def import_snapshot(path, workers=4, replace=False):
+    """
+    Load the snapshot at `path`. With `replace` the existing categories,
+    items and images are deleted first. Returns {member: (created, skipped)}
+    and the number of media files the imported rows use.
+    """
+    with tarfile.open(path, "r:") as tar:
+        records, media_members = {}, []
+        for member in tar:
+            if not member.isfile():
+                continue
+            if member.name.startswith(MEDIA_PREFIX):
+                media_members.append(member)
+            else:
+                records[member.name] = member
+        if "manifest.json" not in records:
+            raise SnapshotError("Not a portfolio snapshot (no manifest.json)")
+        manifest = json.load(tar.extractfile(records["manifest.json"]))
+        if manifest.get("format") != FORMAT_VERSION:
+            raise SnapshotError(
+                f"Unsupported snapshot format: {manifest.get('format')}"
+            )
+
+        media = {}
+        try:
+            _write_media(path, media_members, workers, media)
+            results, references = _import_sections(tar, records, media, replace)
+        except BaseException:
+            _discard_media(media)
+            raise
+    # Only referenced by rows that were skipped
+    unused = {
+        name: stored for name, stored in media.items() if not references[stored[0]]
+    }
+    _discard_media(unused)
+    return results, len(media) - len(unused)
+
+
+def _import_sections(tar, records, media, replace):
+    results = {}
+    with transaction.atomic():
+        if replace:
+            deleted, released = _delete_existing()
+
+        references = Counter({stored: 0 for stored, _ in media.values()})
+        pk_maps = {}
+        for member, model, foreign_keys in SECTIONS:
+            fileobj = tar.extractfile(records[f"{member}.ndjson"])
+            pk_maps[member], created, skipped = _import_rows(
+                fileobj, model, foreign_keys, pk_maps, media, references
+            )
+            results[member] = (len(created), skipped)
+            if created:
+                notify_bulk_change(model, created)
+
+        if replace:
+            for model, pks in deleted.items():
+                if pks:
+                    notify_bulk_change(model, pks)
+            if hasattr(default_storage, "release"):
+                transaction.on_commit(partial(_release_media, released))
+        if hasattr(default_storage, "retain"):
+            sizes = dict(media.values())
+            for stored, count in references.items():
+                if count:
+                    default_storage.retain(stored, sizes[stored], count=count)
+        reconcile_counters()
+        schedule_related_refresh()
+    return results, references
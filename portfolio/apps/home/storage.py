@@ -0,0 +1,188 @@
+# apps/home/storage.py
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import nullcontext
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+# ----------------------------------------------------------
+# Content-addressed media storage
+#
+# Every upload is hashed while it is streamed to a temporary file and then
+# stored once as cas/<aa>/<sha256><ext>, whatever upload_to says. Uploading
+# the same bytes again reuses the existing blob. StoredBlob rows count the
+# model fields referencing each blob so it is only removed with the last
+# reference; they are kept by the model signals (signals.py), which retain
+# a name when a field starts referencing it and release it when the field is
+# cleared, changed or deleted, so re-saving the same content is a no-op.
+# Because the name changes whenever the content does, blobs can
+# be served with "Cache-Control: immutable" (see views.serve_media).
+#
+# write_blob() checks for an existing blob under the StoredBlob row lock
+# that release() takes, and the portfolio models save in one transaction,
+# so the last reference cannot delete a blob between the upload reusing
+# it and the post_save retain(). Blobs no row references (a save that
+# failed after its upload was stored) are removed by sweep() (manage.py
+# sweep_media) once they are older than a grace period.
+
+CAS_PREFIX = "cas"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def is_content_addressed(name):
+    return bool(name) and name.startswith(f"{CAS_PREFIX}/")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def blob_name(self, digest, original_name):
+        extension = os.path.splitext(original_name)[1].lower()
+        return f"{CAS_PREFIX}/{digest[:2]}/{digest}{extension}"
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is chosen from the content in _save()
+        return name
+
+    def _save(self, name, content):
+        # References are counted when the row is saved (signals.py)
+        name, _ = self.write_blob(name, content)
+        return name
+
+    def write_blob(self, name, content, lock=True):
+        """
+        Store `content` under its content hash without touching refcounts.
+
+        Without `lock` the database is not used (for worker threads); the
+        caller's retain() then fails if the blob was released meanwhile.
+        """
+        temp_dir = os.path.join(self.location, CAS_PREFIX, "tmp")
+        os.makedirs(temp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp:
+            if hasattr(content, "seek"):
+                content.seek(0)
+            for chunk in content.chunks():
+                digest.update(chunk)
+                temp.write(chunk)
+                size += len(chunk)
+
+        name = self.blob_name(digest.hexdigest(), name)
+        path = self.path(name)
+        with transaction.atomic() if lock else nullcontext():
+            if lock:
+                # Held until the caller's transaction ends: release() waits
+                list(self._lock_blob(name))
+            if os.path.exists(path):
+                os.remove(temp.name)
+                # Reused: sweep() leaves it alone until it is retained
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp.name, path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(path, self.file_permissions_mode)
+        return name, size
+
+    def _lock_blob(self, name):
+        from .models import StoredBlob
+
+        return StoredBlob.objects.select_for_update().filter(name=name)
+
+    # ------------------------------------------------------
+    # Reference counting
+    def retain(self, name, size=None, count=1):
+        """Record `count` more references to a stored blob"""
+        from .models import StoredBlob
+
+        if not is_content_addressed(name):
+            return
+        # The row is locked so a concurrent release() cannot delete it between
+        # the lookup and the increment
+        with transaction.atomic():
+            blob = self._lock_blob(name).first()
+            if blob is None:
+                # Unreferenced until now: the file must still be there
+                if not self.exists(name):
+                    raise FileNotFoundError(
+                        f"Blob {name} was deleted before it was retained"
+                    )
+                blob, created = StoredBlob.objects.get_or_create(
+                    name=name,
+                    defaults={
+                        "size": self.size(name) if size is None else size,
+                        "refcount": count,
+                    },
+                )
+                if created:
+                    return
+            StoredBlob.objects.filter(pk=blob.pk).update(refcount=F("refcount") + count)
+
+    def release(self, name, count=1):
+        """Drop `count` references; the blob is deleted with its last reference"""
+        from .models import StoredBlob
+
+        if not is_content_addressed(name):
+            return
+        with transaction.atomic():
+            blob = self._lock_blob(name).first()
+            if blob is None:
+                return
+            if blob.refcount > count:
+                StoredBlob.objects.filter(pk=blob.pk).update(
+                    refcount=F("refcount") - count
+                )
+                return
+            blob.delete()
+            self.delete(name)
+
+    # ------------------------------------------------------
+    # Unreferenced blobs
+    def sweep(self, grace=24 * 60 * 60):
+        """
+        Delete blobs no StoredBlob row references, and temporary files left
+        by an interrupted write, once they are older than `grace` seconds.
+        Returns the names of the deleted blobs.
+        """
+        from .models import StoredBlob
+
+        cutoff = time.time() - grace
+        root = self.path(CAS_PREFIX)
+        temp_dir = os.path.join(root, "tmp")
+        swept = []
+        for dirpath, _, filenames in os.walk(root):
+            if dirpath == temp_dir:
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                continue
+            names = {}
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                names[os.path.relpath(path, self.location).replace(os.sep, "/")] = path
+            referenced = set(
+                StoredBlob.objects.filter(name__in=names).values_list("name", flat=True)
+            )
+            for name, path in names.items():
+                if name in referenced or os.path.getmtime(path) >= cutoff:
+                    continue
+                # Moved aside first: a write_blob() reusing it meanwhile
+                # either refreshed its mtime or finds it gone and rewrites it
+                os.makedirs(temp_dir, exist_ok=True)
+                aside = os.path.join(temp_dir, f"swept-{os.path.basename(path)}")
+                os.replace(path, aside)
+                if (
+                    os.path.getmtime(aside) >= cutoff
+                    or StoredBlob.objects.filter(name=name).exists()
+                ):
+                    os.replace(aside, path)
+                else:
+                    os.remove(aside)
+                    swept.append(name)
+        return swept
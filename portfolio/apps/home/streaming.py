@@ -0,0 +1,172 @@
+# apps/home/streaming.py
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import render
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.template.loader_tags import (
+    BLOCK_CONTEXT_KEY,
+    BlockContext,
+    BlockNode,
+    ExtendsNode,
+)
+from django.template.base import TextNode
+
+from .preload import EXTENDS_RE, INCLUDE_RE
+from .warmup import get_engine
+
+# ----------------------------------------------------------
+# Streaming template rendering
+#
+# Django renders a whole template into one string. For the big pages we
+# walk the node tree instead (through {% extends %} and into {% block %}s)
+# and send the output as soon as a chunk is ready: the <head>, with its
+# stylesheets, goes out before the portfolio grid is even queried.
+# Blocks and extends are resolved exactly as ExtendsNode/BlockNode do.
+
+
+def _iter_nodelist(nodelist, context):
+    for node in nodelist:
+        if isinstance(node, ExtendsNode):
+            yield from _iter_extends(node, context)
+        elif isinstance(node, BlockNode):
+            yield from _iter_block(node, context)
+        else:
+            yield node.render_annotated(context)
+
+
+def _iter_extends(node, context):
+    compiled_parent = node.get_parent(context)
+
+    if BLOCK_CONTEXT_KEY not in context.render_context:
+        context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+    block_context = context.render_context[BLOCK_CONTEXT_KEY]
+    block_context.add_blocks(node.blocks)
+
+    # A parent without an extends node is the root: add its blocks too
+    for parent_node in compiled_parent.nodelist:
+        if not isinstance(parent_node, TextNode):
+            if not isinstance(parent_node, ExtendsNode):
+                blocks = {
+                    n.name: n
+                    for n in compiled_parent.nodelist.get_nodes_by_type(BlockNode)
+                }
+                block_context.add_blocks(blocks)
+            break
+
+    with context.render_context.push_state(compiled_parent, isolated_context=False):
+        yield from _iter_nodelist(compiled_parent.nodelist, context)
+
+
+def _iter_block(node, context):
+    block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+    with context.push():
+        if block_context is None:
+            context["block"] = node
+            yield from _iter_nodelist(node.nodelist, context)
+            return
+        push = block = block_context.pop(node.name)
+        if block is None:
+            block = node
+        block = type(node)(block.name, block.nodelist)
+        block.context = context
+        context["block"] = block
+        yield from _iter_nodelist(block.nodelist, context)
+        if push is not None:
+            block_context.push(node.name, push)
+
+
+def iter_template(template_name, context, request):
+    """Yield the rendered output of a template node by node"""
+    backend_template = get_template(template_name)
+    template = backend_template.template
+    context = make_context(
+        context, request, autoescape=backend_template.backend.engine.autoescape
+    )
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            yield from _iter_nodelist(template.nodelist, context)
+
+
+def _chunks(parts, chunk_size):
+    """Join small parts into chunks; the document head is sent on its own"""
+    buffer = []
+    size = 0
+    head_sent = False
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size or (not head_sent and "</head>" in part):
+            head_sent = True
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+# ----------------------------------------------------------
+# CSRF tokens
+#
+# A page whose CSRF token is created gets the CSRF cookie and "Vary:
+# Cookie", and compression.carries_secrets() then pads it and keeps it out
+# of the compressed-response cache. Only pages that render {% csrf_token %}
+# (through their parents and includes) need the token up front.
+CSRF_TOKEN_RE = re.compile(r"{%\s*csrf_token\s*%}")
+# {% extends var %} / {% include var %}: not resolvable from the source
+DYNAMIC_TEMPLATE_RE = re.compile(r"{%\s*(?:extends|include)\s+(?![\"'])")
+
+
+def uses_csrf_token(template_name):
+    """True if the template, its parents or its includes render {% csrf_token %}"""
+    if settings.DEBUG:
+        # Templates change without a restart during development
+        return _uses_csrf_token(template_name, set())
+    return _cached_uses_csrf_token(template_name)
+
+
+@lru_cache(maxsize=None)
+def _cached_uses_csrf_token(template_name):
+    return _uses_csrf_token(template_name, set())
+
+
+def _uses_csrf_token(name, seen):
+    if name in seen:
+        return False
+    seen.add(name)
+    source = get_engine().get_template(name).source
+    if CSRF_TOKEN_RE.search(source) or DYNAMIC_TEMPLATE_RE.search(source):
+        return True
+    names = EXTENDS_RE.findall(source) + INCLUDE_RE.findall(source)
+    return any(_uses_csrf_token(other, seen) for other in names)
+
+
+def stream_template(request, template_name, context=None):
+    """
+    Like render(), but returns a StreamingHttpResponse.
+
+    Falls back to render() when the page has queued messages: they are
+    marked as seen by the messages middleware, which runs before a stream
+    is consumed.
+    """
+    if not getattr(settings, "STREAMING_TEMPLATES_ENABLED", True) or len(
+        get_messages(request)
+    ):
+        return render(request, template_name, context)
+
+    # The CSRF cookie is set with the response headers, so the token
+    # has to exist before rendering starts
+    if uses_csrf_token(template_name):
+        get_token(request)
+
+    chunk_size = getattr(settings, "STREAMING_CHUNK_SIZE", 16 * 1024)
+    return StreamingHttpResponse(
+        _chunks(iter_template(template_name, context, request), chunk_size),
+        content_type="text/html; charset=utf-8",
+    )
@@ -0,0 +1,48 @@
+# apps/home/templatetags/portfolio_cache.py
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..fragment_cache import render_cached
+
+register = template.Library()
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        vary_on = [value.resolve(context) for value in self.vary_on]
+        return mark_safe(
+            render_cached(name, vary_on, lambda: self.nodelist.render(context))
+        )
+
+
+@register.tag("cachefragment")
+def do_cachefragment(parser, token):
+    """
+    Cache a template fragment until a model row it depends on changes.
+
+    Usage::
+
+        {% cachefragment "portfolio-grid" %}...{% endcachefragment %}
+        {% cachefragment "detail-gallery" item %}...{% endcachefragment %}
+
+    Extra arguments are added to the cache key; model instances among them
+    are also recorded as dependencies.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least a fragment name"
+        )
+    nodelist = parser.parse(("endcachefragment",))
+    parser.delete_first_token()
+    return CacheFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
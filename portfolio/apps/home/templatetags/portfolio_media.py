@@ -0,0 +1,30 @@
+# apps/home/templatetags/portfolio_media.py
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_attrs(instance, field_name):
+    """
+    Intrinsic size and placeholder attributes for an <img>, read from the
+    stored metadata columns (never from the file itself).
+
+    Usage: <img src="{{ item.thumbnail.url }}" {% image_attrs item "thumbnail" %}>
+    """
+    width = getattr(instance, f"{field_name}_width", None)
+    height = getattr(instance, f"{field_name}_height", None)
+    placeholder = getattr(instance, f"{field_name}_placeholder", "")
+
+    attrs = mark_safe("")
+    if width and height:
+        attrs = format_html('width="{}" height="{}"', width, height)
+    if placeholder:
+        attrs = format_html(
+            '{} style="background: center / cover no-repeat url({});"',
+            attrs,
+            placeholder,
+        )
+    return attrs
@@ -0,0 +1,47 @@
+# apps/home/tests/test_analytics.py
+from unittest import mock
+
+from django.urls import reverse
+
+from apps.home import analytics
+from apps.home.models import ItemDailyViews, PortfolioItem
+from apps.home.warmup import WARMUP_HEADER
+
+from .utils import MediaTestCase, image_file, make_category, make_item
+
+
+class PageViewTests(MediaTestCase):
+    def setUp(self):
+        analytics._pending.clear()
+        self.enterContext(mock.patch.object(analytics, "_start_flusher"))
+        category = make_category()
+        # Related items are shown with their thumbnails
+        self.item = make_item(category, thumbnail=image_file())
+        self.other = make_item(category, "Other", thumbnail=image_file())
+
+    def visit(self, item, **headers):
+        url = reverse("home:portfolio_detail", args=[item.slug])
+        self.client.get(url, headers=headers).getvalue()
+
+    def test_views_are_buffered_then_upserted(self):
+        self.visit(self.item)
+        self.visit(self.item)
+        self.assertFalse(ItemDailyViews.objects.exists())
+
+        self.assertEqual(analytics.flush(), 1)
+        self.visit(self.item)
+        analytics.flush()
+        self.assertEqual(ItemDailyViews.objects.get(item=self.item).views, 3)
+
+    def test_bots_and_warmup_are_not_counted(self):
+        self.visit(self.item, **{"User-Agent": "Googlebot/2.1"})
+        self.visit(self.item, **{WARMUP_HEADER: "1"})
+        self.visit(self.item, **{"Sec-Purpose": "prefetch"})
+        self.assertEqual(analytics.flush(), 0)
+
+    def test_most_viewed_ordering(self):
+        self.visit(self.other)
+        analytics.flush()
+        ranked = analytics.most_viewed(PortfolioItem.objects.all())
+        self.assertEqual(list(ranked)[:2], [self.other, self.item])
+        self.assertEqual(ranked[0].recent_views, 1)
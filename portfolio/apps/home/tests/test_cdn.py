@@ -0,0 +1,77 @@
+# apps/home/tests/test_cdn.py
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.home import cdn
+
+from .utils import make_category, make_item
+
+
+@override_settings(CDN_PURGE_BACKEND="apps.home.cdn.LocMemPurgeBackend")
+class SurrogateKeyTests(TestCase):
+    def setUp(self):
+        cdn.get_purge_backend.cache_clear()
+        self.addCleanup(cdn.get_purge_backend.cache_clear)
+        cdn.LocMemPurgeBackend.purged = []
+        self.sender = self.enterContext(mock.patch.object(cdn, "_start_sender"))
+        self.category = make_category()
+        self.item = make_item(self.category)
+        # Creating the fixtures never commits in a TestCase
+        cdn._pending.keys = None
+
+    def test_detail_page_is_tagged_with_its_rows(self):
+        response = self.client.get(
+            reverse("home:portfolio_detail", args=[self.item.slug])
+        )
+        keys = response["Surrogate-Key"].split()
+        self.assertIn(f"item-{self.item.pk}", keys)
+        self.assertIn(f"category-{self.category.pk}", keys)
+        self.assertEqual(response["Cache-Tag"], ",".join(keys))
+
+    def test_edit_purges_only_affected_keys(self):
+        self.item.full_description = "Changed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+        cdn.send_pending()
+        self.assertEqual(
+            sorted(cdn.LocMemPurgeBackend.purged),
+            [f"category-{self.category.pk}", f"item-{self.item.pk}"],
+        )
+
+    def test_listing_change_purges_the_list_key(self):
+        self.item.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+        cdn.send_pending()
+        self.assertIn(cdn.ITEM_LIST_KEY, cdn.LocMemPurgeBackend.purged)
+
+    def test_transaction_is_purged_once_off_the_request(self):
+        other = make_item(self.category, "Other")
+        cdn._pending.keys = None
+        with mock.patch.object(
+            cdn.LocMemPurgeBackend, "purge", autospec=True
+        ) as purge, self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for item in (self.item, other):
+                    item.full_description = "Changed"
+                    item.save()
+            purge.assert_not_called()
+        purge.assert_not_called()
+        self.sender.assert_called()
+
+        with mock.patch.object(cdn.LocMemPurgeBackend, "purge", autospec=True) as purge:
+            cdn.send_pending()
+        purge.assert_called_once()
+        self.assertEqual(
+            sorted(purge.call_args.args[1]),
+            sorted(
+                [
+                    f"category-{self.category.pk}",
+                    f"item-{self.item.pk}",
+                    f"item-{other.pk}",
+                ]
+            ),
+        )
@@ -0,0 +1,72 @@
+# apps/home/tests/test_compression.py
+import gzip
+from unittest import mock
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.home import compression, streaming
+
+
+class GzipCompressorTests(SimpleTestCase):
+    def test_padded_output_is_valid_gzip(self):
+        data = b"<p>hello</p>" * 100
+        plain = compression.compress(data, "gzip")
+        padded = compression.compress(data, "gzip", padding=40)
+        self.assertEqual(gzip.decompress(padded), data)
+        self.assertEqual(len(padded), len(plain) + 41)
+
+    def test_stream_is_valid_gzip(self):
+        chunks = [b"<p>%d</p>" % index for index in range(50)]
+        stream = b"".join(compression.compress_stream(chunks, "gzip", padding=7))
+        self.assertEqual(gzip.decompress(stream), b"".join(chunks))
+
+    def test_padded_responses_are_never_brotli(self):
+        self.assertEqual(compression.accepted_encoding("br, gzip", padded=True), "gzip")
+        self.assertIsNone(compression.accepted_encoding("br", padded=True))
+
+
+class CompressionMiddlewareTests(TestCase):
+    def get(self, path, **extra):
+        return self.client.get(path, HTTP_ACCEPT_ENCODING="gzip, br", **extra)
+
+    def test_page_with_csrf_token_is_padded_and_not_cached(self):
+        with mock.patch.object(compression, "compress_cached") as cached:
+            lengths = {len(self.get("/contact/").content) for _ in range(10)}
+        cached.assert_not_called()
+        self.assertGreater(len(lengths), 1)
+
+        response = self.get("/contact/")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn(b"csrfmiddlewaretoken", gzip.decompress(response.content))
+
+    @override_settings(COMPRESSION_MIN_SIZE=100)
+    def test_public_response_uses_the_compression_cache(self):
+        with mock.patch.object(
+            compression, "compress_cached", wraps=compression.compress_cached
+        ) as cached:
+            response = self.get("/sitemap.xml")
+        cached.assert_called_once()
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    @override_settings(COMPRESSION_MIN_SIZE=100)
+    def test_streamed_page_without_a_form_is_not_padded(self):
+        self.assertFalse(streaming.uses_csrf_token("home/index.html"))
+        self.assertTrue(streaming.uses_csrf_token("home/partials/contact.html"))
+        response = self.get("/")
+        stream = b"".join(response.streaming_content)
+        self.assertNotIn(settings.CSRF_COOKIE_NAME, response.cookies)
+        self.assertFalse(compression.carries_secrets(response.wsgi_request, response))
+        # Padding goes into the gzip header's FNAME field
+        self.assertFalse(stream[3] & gzip.FNAME)
+        self.assertIn(b"<html", gzip.decompress(stream))
+
+    def test_session_cookie_marks_a_secret(self):
+        request = mock.Mock(COOKIES={"sessionid": "x"})
+        response = HttpResponse()
+        self.assertTrue(compression.carries_secrets(request, response))
+        request.COOKIES = {}
+        self.assertFalse(compression.carries_secrets(request, response))
+        response["Vary"] = "Cookie"
+        self.assertTrue(compression.carries_secrets(request, response))
@@ -0,0 +1,68 @@
+# apps/home/tests/test_counters.py
+from django.test import TestCase
+
+from apps.home.counters import active_items_total, reconcile_counters
+from apps.home.models import PortfolioCategory, PortfolioItem
+
+from .utils import make_category, make_item
+
+
+class ActiveItemCounterTests(TestCase):
+    def setUp(self):
+        self.web = make_category("Web")
+        self.mobile = make_category("Mobile")
+        self.item = make_item(self.web)
+        make_item(self.web, "Second")
+
+    def counts(self):
+        return {
+            category.name: category.active_items_count
+            for category in PortfolioCategory.objects.all()
+        }
+
+    def test_saves_move_the_counters(self):
+        self.assertEqual(self.counts(), {"Web": 2, "Mobile": 0})
+        self.item.category = self.mobile
+        self.item.save()
+        self.assertEqual(self.counts(), {"Web": 1, "Mobile": 1})
+        self.item.delete()
+        self.assertEqual(self.counts(), {"Web": 1, "Mobile": 0})
+        self.assertEqual(active_items_total(), 1)
+
+    def test_deferred_fields_are_counted(self):
+        item = PortfolioItem.objects.only("title").get(pk=self.item.pk)
+        item.is_active = False
+        item.save()
+        self.assertEqual(self.counts()["Web"], 1)
+
+        item = PortfolioItem.objects.only("title").get(pk=self.item.pk)
+        item.is_active = True
+        item.category_id = self.mobile.pk
+        item.save(update_fields=["is_active", "category_id"])
+        self.assertEqual(self.counts(), {"Web": 1, "Mobile": 1})
+
+        PortfolioItem.objects.only("title").get(pk=self.item.pk).delete()
+        self.assertEqual(self.counts(), {"Web": 1, "Mobile": 0})
+
+    def test_stale_copies_are_counted_from_the_stored_row(self):
+        first = PortfolioItem.objects.get(pk=self.item.pk)
+        second = PortfolioItem.objects.get(pk=self.item.pk)
+        first.is_active = second.is_active = False
+        first.save()
+        second.save()
+        self.assertEqual(self.counts()["Web"], 1)
+        self.assertEqual(active_items_total(), 1)
+
+    def test_drifted_counter_stops_at_zero(self):
+        PortfolioCategory.objects.filter(pk=self.web.pk).update(active_items_count=0)
+        self.item.is_active = False
+        self.item.save()
+        self.assertEqual(self.counts()["Web"], 0)
+
+    def test_reconcile_fixes_drift(self):
+        PortfolioItem.objects.filter(pk=self.item.pk).update(is_active=False)
+        PortfolioCategory.objects.filter(pk=self.mobile.pk).update(active_items_count=5)
+        total, drifted = reconcile_counters()
+        self.assertEqual((total, drifted), (1, 3))
+        self.assertEqual(self.counts(), {"Web": 1, "Mobile": 0})
+        self.assertEqual(reconcile_counters(), (1, 0))
@@ -0,0 +1,50 @@
+# apps/home/tests/test_exports.py
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from apps.home.exports import (
+    CONTACT_EXPORT_FIELDS,
+    iter_export,
+    streaming_export_response,
+)
+from apps.home.models import ContactMessage
+
+
+class ContactExportTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            ContactMessage.objects.create(
+                name=f"Sender {index}",
+                email=f"sender{index}@example.com",
+                subject="Hello, world",
+                message="Line one\nline two",
+            )
+
+    def test_csv_has_header_and_one_row_per_message(self):
+        queryset = ContactMessage.objects.order_by("pk")
+        content = "".join(iter_export(queryset, "csv", chunk_size=2))
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(tuple(rows[0]), CONTACT_EXPORT_FIELDS)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            rows[1][CONTACT_EXPORT_FIELDS.index("message")], "Line one\nline two"
+        )
+
+    def test_ndjson_is_one_object_per_line(self):
+        lines = list(iter_export(ContactMessage.objects.order_by("pk"), "ndjson"))
+        self.assertEqual(len(lines), 3)
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(records[0]["email"], "sender0@example.com")
+        self.assertEqual(set(records[0]), set(CONTACT_EXPORT_FIELDS))
+
+    def test_response_streams(self):
+        response = streaming_export_response(ContactMessage.objects.all(), "csv")
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment;", response["Content-Disposition"])
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            iter_export(ContactMessage.objects.all(), "xml")
@@ -0,0 +1,48 @@
+# apps/home/tests/test_fragment_cache.py
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.home import fragment_cache
+from apps.home.checks import check_shared_fragment_cache
+from apps.home.models import PortfolioItem
+
+from .utils import make_category, make_item
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.item = make_item(make_category())
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        return PortfolioItem.objects.get(pk=self.item.pk).title
+
+    def test_fragment_is_reused_until_a_dependency_changes(self):
+        fragment_cache.render_cached("title", [], self.render)
+        fragment_cache.render_cached("title", [], self.render)
+        self.assertEqual(self.renders, 1)
+
+        fragment_cache.touch(fragment_cache.instance_keys(self.item))
+        fragment_cache.render_cached("title", [], self.render)
+        self.assertEqual(self.renders, 2)
+
+    @override_settings(FRAGMENT_CACHE_LOCAL_TIMEOUT=60)
+    def test_per_process_cache_entries_expire(self):
+        fragment_cache.render_cached("title", [], self.render)
+        later = time.time() + 61
+        with mock.patch("django.core.cache.backends.locmem.time") as clock:
+            clock.time.return_value = later
+            fragment_cache.render_cached("title", [], self.render)
+            key = fragment_cache.dependency_key("home.portfolioitem", self.item.pk)
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(self.renders, 2)
+
+    def test_deploy_check_warns_about_per_process_cache(self):
+        self.assertEqual(
+            [error.id for error in check_shared_fragment_cache(None)], ["home.W001"]
+        )
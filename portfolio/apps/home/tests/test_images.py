@@ -0,0 +1,63 @@
+# apps/home/tests/test_images.py
+import base64
+import io
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+from apps.home import images
+from apps.home.models import PortfolioItem
+
+from .utils import MediaTestCase, image_file, make_category, make_item
+
+
+class ImageMetadataTests(MediaTestCase):
+    def setUp(self):
+        self.category = make_category()
+
+    def test_upload_gets_dimensions_and_placeholder(self):
+        item = make_item(self.category, thumbnail=image_file(size=(40, 30)))
+        self.assertEqual((item.thumbnail_width, item.thumbnail_height), (40, 30))
+        self.assertTrue(item.thumbnail_placeholder.startswith("data:image/jpeg"))
+
+    def test_unreadable_file_is_only_tried_once(self):
+        with self.assertLogs("apps.home.images", "WARNING"):
+            item = make_item(self.category, thumbnail="portfolio/missing.png")
+        self.assertIsNone(item.thumbnail_width)
+
+        item = PortfolioItem.objects.get(pk=item.pk)
+        with mock.patch.object(images, "read_image_metadata") as read:
+            item.title = "Renamed"
+            item.save()
+        read.assert_not_called()
+
+    def test_reassigned_file_is_read_again(self):
+        with self.assertLogs("apps.home.images", "WARNING"):
+            item = make_item(self.category, thumbnail="portfolio/missing.png")
+        stored = make_item(self.category, "Other", thumbnail=image_file())
+
+        item = PortfolioItem.objects.get(pk=item.pk)
+        item.thumbnail = stored.thumbnail.name
+        item.save()
+        self.assertEqual(item.thumbnail_width, 20)
+
+    def test_rotated_photo_placeholder_is_upright(self):
+        # Stored landscape, left half red; EXIF 6 displays it rotated 90° CW
+        image = Image.new("RGB", (40, 20), (30, 30, 200))
+        image.paste((200, 30, 30), (0, 0, 20, 20))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", exif=exif)
+        item = make_item(
+            self.category, thumbnail=ContentFile(buffer.getvalue(), name="photo.jpg")
+        )
+        self.assertEqual((item.thumbnail_width, item.thumbnail_height), (20, 40))
+
+        data = item.thumbnail_placeholder.split(",", 1)[1]
+        preview = Image.open(io.BytesIO(base64.b64decode(data)))
+        width, height = preview.size
+        self.assertLess(width, height)
+        red, _, blue = preview.getpixel((width // 2, 1))
+        self.assertGreater(red, blue)  # the left half is now on top
@@ -0,0 +1,35 @@
+# apps/home/tests/test_metrics.py
+from django.test import TestCase, override_settings
+
+from apps.home import metrics
+
+CONTACT_KEY = ("home:contact", "GET", "200")
+
+
+@override_settings(METRICS_DIR=None, METRICS_TOKEN="secret")
+class MetricsTests(TestCase):
+    def count(self):
+        return metrics.REQUESTS.values.get(CONTACT_KEY, 0)
+
+    def test_request_is_counted_per_view(self):
+        before = self.count()
+        durations = metrics.REQUEST_DURATION.values.get(("home:contact",), [0])[-1]
+        self.client.get("/contact/")
+        self.assertEqual(self.count(), before + 1)
+        self.assertEqual(
+            metrics.REQUEST_DURATION.values[("home:contact",)][-1], durations + 1
+        )
+
+    def test_metrics_endpoint_requires_token(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 401)
+        self.client.get("/contact/")
+        before = self.count()
+        response = self.client.get(
+            "/metrics/", headers={"Authorization": "Bearer secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+        line = 'home_requests_total{view="home:contact",method="GET",status="200"}'
+        self.assertIn(f"{line} {before}\n", response.content.decode())
+        # Scrapes are not counted themselves
+        self.assertEqual(self.count(), before)
+        self.assertNotIn(("home:metrics", "GET", "200"), metrics.REQUESTS.values)
@@ -0,0 +1,93 @@
+# apps/home/tests/test_newsletter.py
+from smtplib import SMTPServerDisconnected
+
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+
+from apps.home.models import ContactMessage, Newsletter
+from apps.home.newsletter import NewsletterDispatcher
+
+BACKEND = f"{__name__}.FlakyBackend"
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend whose transport breaks for the addresses in `down`"""
+
+    down = {}  # email -> number of failing attempts left
+    opened = 0
+    delivered = []
+
+    def open(self):
+        FlakyBackend.opened += 1
+
+    def send_messages(self, messages):
+        email = messages[0].to[0]
+        if FlakyBackend.down.get(email):
+            FlakyBackend.down[email] -= 1
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        FlakyBackend.delivered.append(email)
+        return super().send_messages(messages)
+
+
+class NewsletterDispatchTests(TestCase):
+    def setUp(self):
+        FlakyBackend.down, FlakyBackend.opened, FlakyBackend.delivered = {}, 0, []
+        for letter in "abcde":
+            ContactMessage.objects.create(
+                name=letter,
+                email=f"{letter}@example.com",
+                subject="Hi",
+                message="Hi",
+                subscribe_newsletter=True,
+            )
+        self.newsletter = Newsletter.objects.create(subject="News", body="Hello")
+
+    def dispatch(self, batch_size=2, workers=1):
+        return NewsletterDispatcher(
+            self.newsletter, batch_size=batch_size, workers=workers, backend=BACKEND
+        ).run()
+
+    def test_dropped_connection_is_reopened(self):
+        FlakyBackend.down = {"b@example.com": 1}
+        stats = self.dispatch()
+        self.assertEqual(stats.sent, 5)
+        self.assertEqual(FlakyBackend.opened, 2)
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.status, "sent")
+
+    def test_checkpoint_stops_before_undelivered_recipient(self):
+        FlakyBackend.down = {"c@example.com": 2}
+        stats = self.dispatch()
+        self.assertEqual(stats.stopped_at, "c@example.com")
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.status, "paused")
+        self.assertEqual(self.newsletter.last_recipient, "b@example.com")
+        self.assertEqual(self.newsletter.sent_count, 2)
+
+        # Resuming retries c and continues
+        FlakyBackend.delivered = []
+        self.dispatch()
+        self.assertEqual(
+            FlakyBackend.delivered, ["c@example.com", "d@example.com", "e@example.com"]
+        )
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.sent_count, 5)
+
+    def test_parallel_slices_past_a_failure_are_not_resent(self):
+        # Slices [a, b] and [c, d]: b fails, c and d are delivered anyway
+        FlakyBackend.down = {"b@example.com": 2}
+        stats = self.dispatch(batch_size=4, workers=2)
+        self.assertEqual(stats.stopped_at, "b@example.com")
+        self.assertEqual(stats.sent, 3)
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.last_recipient, "a@example.com")
+        self.assertEqual(self.newsletter.sent_count, 3)
+
+        FlakyBackend.delivered = []
+        self.dispatch(batch_size=4, workers=2)
+        self.assertEqual(
+            sorted(FlakyBackend.delivered), ["b@example.com", "e@example.com"]
+        )
+        self.newsletter.refresh_from_db()
+        self.assertEqual(self.newsletter.sent_count, 5)
+        self.assertEqual(self.newsletter.deliveries.count(), 5)
@@ -0,0 +1,52 @@
+# apps/home/tests/test_ordering.py
+from django.test import SimpleTestCase, TestCase
+
+from apps.home.models import PortfolioItem
+from apps.home.ordering import ORDER_GAP, ReorderError, apply_reorder, plan_orders
+
+from .utils import make_category, make_item
+
+
+class PlanOrdersTests(SimpleTestCase):
+    def setUp(self):
+        self.current = {pk: pk * ORDER_GAP for pk in range(1, 6)}
+
+    def test_moving_one_row_writes_only_that_row(self):
+        self.assertEqual(
+            plan_orders(self.current, [1, 5, 2, 3, 4]),
+            {5: ORDER_GAP + ORDER_GAP // 2},
+        )
+        self.assertEqual(plan_orders(self.current, [2, 3, 4, 5, 1]), {1: 6 * ORDER_GAP})
+
+    def test_unchanged_order_writes_nothing(self):
+        self.assertEqual(plan_orders(self.current, [1, 2, 3, 4, 5]), {})
+
+    def test_used_up_gap_respaces_the_group(self):
+        current = {1: 1, 2: 2, 3: 3}
+        changes = plan_orders(current, [1, 3, 2])
+        orders = {**current, **changes}
+        self.assertEqual(sorted(orders, key=orders.get), [1, 3, 2])
+
+
+class ApplyReorderTests(TestCase):
+    def setUp(self):
+        category = make_category()
+        self.items = [
+            make_item(category, f"Item {index}", order=(index + 1) * ORDER_GAP)
+            for index in range(4)
+        ]
+        self.queryset = PortfolioItem.objects.filter(category=category)
+
+    def test_applies_new_order_in_one_bulk_update(self):
+        ids = [item.pk for item in self.items]
+        ids.insert(0, ids.pop())
+        with self.assertNumQueries(4):  # savepoint, lock, update, release
+            written = apply_reorder(self.queryset, ids)
+        self.assertEqual(written, [ids[0]])
+        self.assertEqual(
+            list(self.queryset.order_by("order").values_list("pk", flat=True)), ids
+        )
+
+    def test_partial_ordering_is_rejected(self):
+        with self.assertRaises(ReorderError):
+            apply_reorder(self.queryset, [self.items[0].pk])
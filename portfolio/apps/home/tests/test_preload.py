@@ -0,0 +1,62 @@
+# apps/home/tests/test_preload.py
+import asyncio
+
+from django.templatetags.static import static
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.home import preload
+
+
+class PreloadAnalysisTests(SimpleTestCase):
+    def setUp(self):
+        preload.clear_cache()
+        self.addCleanup(preload.clear_cache)
+
+    def test_index_preloads_styles_scripts_and_hero_image(self):
+        hints = preload.analyze_template("home/index.html")
+        kinds = {hint.get("as") for hint in hints}
+        self.assertTrue({"style", "script", "image"} <= kinds)
+        images = [hint["href"] for hint in hints if hint.get("as") == "image"]
+        # Only the first content image can be the largest contentful paint
+        self.assertEqual(images, [static("img/hero-img.jpg")])
+
+    def test_early_hints_are_sent_when_the_server_supports_them(self):
+        sent = []
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start"})
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "extensions": {"http.response.early_hint": {}},
+        }
+        asyncio.run(preload.EarlyHintsMiddleware(app)(scope, None, send))
+        self.assertEqual(sent[0]["type"], "http.response.early_hint")
+        hero = f"<{static('img/hero-img.jpg')}>; rel=preload; as=image"
+        self.assertIn(hero.encode(), sent[0]["links"])
+        self.assertEqual(sent[1]["type"], "http.response.start")
+
+        sent.clear()
+        del scope["extensions"]
+        asyncio.run(preload.EarlyHintsMiddleware(app)(scope, None, send))
+        self.assertEqual([message["type"] for message in sent], ["http.response.start"])
+
+
+class PreloadHeaderTests(TestCase):
+    def setUp(self):
+        preload.clear_cache()
+        self.addCleanup(preload.clear_cache)
+
+    def test_page_has_preload_link_header(self):
+        response = self.client.get("/")
+        self.assertIn(f"<{static('img/hero-img.jpg')}>", response["Link"])
+
+    @override_settings(PRELOAD_HINTS_ENABLED=False)
+    def test_toggle_disables_link_header(self):
+        response = self.client.get("/")
+        self.assertFalse(response.has_header("Link"))
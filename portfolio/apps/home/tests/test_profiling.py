@@ -0,0 +1,36 @@
+# apps/home/tests/test_profiling.py
+import tempfile
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from apps.home import profiling
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(profile_dir.cleanup)
+        self.enterContext(override_settings(PROFILING_DIR=profile_dir.name))
+
+    def get(self):
+        return self.client.get(
+            "/contact/", headers={profiling.TOKEN_HEADER: profiling.make_token()}
+        )
+
+    def test_off_by_default(self):
+        with override_settings():
+            del settings.PROFILING_ENABLED
+            self.assertNotIn("X-Profile-Id", self.get())
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_signed_request_is_profiled(self):
+        response = self.get()
+        profile = profiling.load_profile(response["X-Profile-Id"])
+        self.assertEqual(profile["path"], "/contact/")
+        self.assertTrue(profile["stacks"])
+
+    @override_settings(PROFILING_MAX_PROFILES=3)
+    def test_only_newest_profiles_are_kept(self):
+        ids = [profiling.save_profile({"path": f"/{index}/"}) for index in range(5)]
+        self.assertEqual(profiling.profile_ids(), ids[:1:-1])
@@ -0,0 +1,61 @@
+# apps/home/tests/test_recommendations.py
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase
+
+from apps.home import recommendations
+from apps.home.models import RelatedItem
+from apps.home.recommendations import compute_related, refresh_related_items
+
+from .utils import make_category, make_item
+
+
+class RelatedItemsTests(TestCase):
+    def setUp(self):
+        category = make_category()
+        self.shop = make_item(category, "Django shop", technologies="Django, Stripe")
+        self.store = make_item(category, "Django store", technologies="Django, Stripe")
+        self.game = make_item(category, "Unity game", technologies="Unity, C#")
+
+    def test_most_similar_item_ranks_first(self):
+        refresh_related_items()
+        first = RelatedItem.objects.filter(item=self.shop).order_by("rank").first()
+        self.assertEqual(first.related, self.store)
+
+    def test_unchanged_lists_are_not_rewritten(self):
+        refresh_related_items()
+        self.assertEqual(refresh_related_items(), 0)
+
+    def test_top_k_below_one_finds_nothing(self):
+        items = [self.shop, self.store, self.game]
+        for top_k in (0, -1):
+            self.assertEqual(
+                compute_related(items, top_k), {item.pk: [] for item in items}
+            )
+        self.assertEqual(len(compute_related(items, 1)[self.shop.pk]), 1)
+        with self.assertRaisesMessage(CommandError, "at least 1"):
+            call_command("compute_related_items", "--top-k", "0")
+
+
+@mock.patch.object(recommendations, "schedule_refresh")
+class RelatedRefreshSchedulingTests(TestCase):
+    def setUp(self):
+        self.item = make_item(make_category(), "Django shop")
+
+    def test_save_schedules_background_refresh_after_commit(self, schedule):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+        schedule.assert_called()
+
+    def test_rollback_does_not_block_later_refreshes(self, schedule):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.item.save()
+                raise RuntimeError
+        schedule.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+        schedule.assert_called()
@@ -0,0 +1,71 @@
+# apps/home/tests/test_server.py
+import json
+import os
+import runpy
+import unittest
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from apps.home import analytics, metrics, warmup
+
+
+class ForkedWorkerTests(SimpleTestCase):
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork()")
+    def test_child_does_not_inherit_per_process_state(self):
+        metrics.REQUESTS.inc(view="home:index", method="GET", status=200)
+        analytics._pending[1] += 1
+        self.addCleanup(analytics._pending.pop, 1, None)
+        warmup._rewarm_targets["item"] = {1}
+        self.addCleanup(warmup._rewarm_targets.pop, "item", None)
+
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # the worker
+            try:
+                os.close(read_end)
+                state = [
+                    metrics.REQUESTS.values,
+                    dict(analytics._pending),
+                    warmup._rewarm_targets,
+                ]
+                os.write(write_end, json.dumps(state).encode())
+            finally:
+                os._exit(0)
+
+        os.close(write_end)
+        with os.fdopen(read_end) as pipe:
+            state = json.loads(pipe.read())
+        os.waitpid(pid, 0)
+        self.assertEqual(state, [{}, {}, {}])
+        # The master keeps its own
+        self.assertTrue(metrics.REQUESTS.values)
+        self.assertEqual(analytics._pending[1], 1)
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def setUp(self):
+        self.config = runpy.run_path(
+            os.path.join(settings.BASE_DIR, "gunicorn.conf.py")
+        )
+
+    def server(self, preload):
+        return mock.Mock(cfg=mock.Mock(preload_app=preload))
+
+    def test_preloaded_master_closes_connections_and_freezes(self):
+        with mock.patch("django.db.connections.close_all") as close_all, mock.patch(
+            "gc.freeze"
+        ) as freeze:
+            self.config["when_ready"](self.server(preload=True))
+        close_all.assert_called_once_with()
+        freeze.assert_called_once_with()
+
+    def test_without_preload_nothing_is_shared(self):
+        with mock.patch("django.db.connections.close_all") as close_all, mock.patch(
+            "gc.freeze"
+        ) as freeze:
+            self.config["when_ready"](self.server(preload=False))
+            self.config["pre_fork"](self.server(preload=False), None)
+        close_all.assert_not_called()
+        freeze.assert_not_called()
@@ -0,0 +1,85 @@
+# apps/home/tests/test_service_worker.py
+import os
+import re
+import tempfile
+from unittest import mock
+
+from django.templatetags.static import static
+from django.test import TestCase, override_settings
+
+from apps.home import service_worker
+
+FILES = {
+    "css/site.css": "body { background: url('../fonts/site.woff2?v=2'); }",
+    "fonts/site.woff2": "font",
+    "img/logo.png": "logo",
+    "vendor/unused.js": "never loaded",
+}
+
+
+class ServiceWorkerTests(TestCase):
+    def setUp(self):
+        static_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(static_dir.cleanup)
+        self.static_dir = static_dir.name
+        for path, content in FILES.items():
+            self.write(path, content)
+        self.enterContext(
+            override_settings(
+                STATICFILES_DIRS=[self.static_dir],
+                SERVICE_WORKER_PATH=os.path.join(self.static_dir, "build", "sw.js"),
+            )
+        )
+        # As if a template used {% static 'css/site.css' %}
+        self.enterContext(
+            mock.patch.object(
+                service_worker,
+                "_referenced_static_paths",
+                side_effect=lambda: {"css/site.css"},
+            )
+        )
+
+    def write(self, path, content):
+        full_path = os.path.join(self.static_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as file:
+            file.write(content)
+
+    def test_manifest_lists_what_the_pages_load(self):
+        urls = [url for url, _ in service_worker.build_manifest()]
+        self.assertEqual(
+            urls,
+            sorted(
+                static(path)
+                for path in ("css/site.css", "fonts/site.woff2", "img/logo.png")
+            ),
+        )
+
+    def test_changed_file_changes_the_version(self):
+        _, version, _ = service_worker.build()
+        self.assertEqual(service_worker.build()[1], version)
+        self.write("img/logo.png", "new logo")
+        _, new_version, _ = service_worker.build()
+        self.assertNotEqual(new_version, version)
+        self.assertIn(f'"{new_version}"', service_worker.load())
+
+    def test_served_uncached_once_built(self):
+        self.assertEqual(self.client.get("/sw.js").status_code, 404)
+        service_worker.build()
+        response = self.client.get("/sw.js")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertIn(static("img/logo.png").encode(), response.content)
+
+    @override_settings(SERVICE_WORKER_ENABLED=True)
+    def test_registered_once_built(self):
+        registration = b"navigator.serviceWorker.register"
+        self.assertNotIn(registration, self.client.get("/").getvalue())
+        service_worker.build()
+        self.assertIn(registration, self.client.get("/").getvalue())
+
+    def test_index_is_not_served_from_the_page_cache(self):
+        pattern = re.compile(service_worker.PAGE_PATTERN)
+        self.assertFalse(pattern.search("/"))
+        self.assertFalse(pattern.search("/contact/"))
+        self.assertTrue(pattern.search("/portfolio/some-item/"))
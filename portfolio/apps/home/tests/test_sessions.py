@@ -0,0 +1,42 @@
+# apps/home/tests/test_sessions.py
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.home.models import ContactMessage
+
+CONTACT = {
+    "name": "Ada Lovelace",
+    "email": "ada@example.com",
+    "subject": "A question",
+    "category": "general",
+    "message": "Could we talk about a project next week?",
+    "urgency": "low",
+    "consent": "on",
+}
+
+
+class AnonymousSessionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_public_pages_do_not_read_sessions(self):
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = "stale-session-key"
+        with CaptureQueriesContext(connection) as queries:
+            for path in ("/", "/contact/"):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                response.getvalue()  # render streamed pages too
+        self.assertFalse(
+            [query for query in queries if "django_session" in query["sql"]]
+        )
+
+    def test_contact_message_does_not_create_a_session(self):
+        response = self.client.post("/contact/", CONTACT)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(ContactMessage.objects.filter(email=CONTACT["email"]).exists())
+        self.assertEqual(Session.objects.count(), 0)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
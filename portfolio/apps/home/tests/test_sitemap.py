@@ -0,0 +1,52 @@
+# apps/home/tests/test_sitemap.py
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from apps.home import sitemap
+from apps.home.checks import check_shared_sitemap_cache
+
+from .utils import make_category, make_item
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = make_category()
+
+    def test_lists_active_items_and_categories(self):
+        make_item(self.category, "Shown")
+        make_item(self.category, "Hidden", is_active=False)
+        document = sitemap.sitemap_document()
+        self.assertIn("/portfolio/shown/", document)
+        self.assertNotIn("/portfolio/hidden/", document)
+        self.assertIn(f"/category/{self.category.slug}/", document)
+
+    def test_rolled_back_change_does_not_block_later_refreshes(self):
+        sitemap.sitemap_document()  # cached from here on
+        try:
+            with transaction.atomic():
+                make_item(self.category, "Discarded")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_item(self.category, "Added")
+        document = sitemap.sitemap_document()
+        self.assertIn("/portfolio/added/", document)
+        self.assertNotIn("/portfolio/discarded/", document)
+
+    def test_per_process_cache_entries_expire(self):
+        self.assertIsNotNone(sitemap.get_timeout())
+        self.assertEqual(
+            [warning.id for warning in check_shared_sitemap_cache(None)],
+            ["home.W002"],
+        )
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_shared_cache_entries_never_expire(self):
+        self.assertIsNone(sitemap.get_timeout())
+        self.assertEqual(check_shared_sitemap_cache(None), [])
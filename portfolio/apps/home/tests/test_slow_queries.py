@@ -0,0 +1,52 @@
+# apps/home/tests/test_slow_queries.py
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.home import slow_queries
+from apps.home.models import ContactMessage, SlowQuery
+
+
+class ExplainTests(TestCase):
+    def test_explain_is_rolled_back(self):
+        def write_too(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if sql.startswith("EXPLAIN"):
+                # Stands in for a statement EXPLAIN ANALYZE runs for real
+                ContactMessage.objects.create(
+                    name="x", email="x@example.com", subject="x", message="x"
+                )
+            return result
+
+        with connection.execute_wrapper(write_too):
+            plan = slow_queries.run_explain(
+                'SELECT * FROM "home_contactmessage" WHERE "email" = %s', ["a"]
+            )
+        self.assertTrue(plan)
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_only_bare_selects_are_analyzed(self):
+        self.assertTrue(slow_queries.BARE_SELECT_RE.match("SELECT 1"))
+        self.assertIsNone(
+            slow_queries.BARE_SELECT_RE.match(
+                "WITH moved AS (DELETE FROM t RETURNING *) SELECT * FROM moved"
+            )
+        )
+
+
+class PruneTests(TestCase):
+    @override_settings(SLOW_QUERY_MAX_ROWS=2)
+    def test_keeps_exactly_the_newest_rows(self):
+        rows = [
+            SlowQuery.objects.create(
+                sql="SELECT 1", fingerprint="f", duration_ms=1, call_site="x"
+            )
+            for _ in range(4)
+        ]
+        # Rows recorded within the same clock tick
+        SlowQuery.objects.update(created_at=timezone.now())
+        slow_queries.prune()
+        self.assertEqual(
+            sorted(SlowQuery.objects.values_list("pk", flat=True)),
+            [rows[2].pk, rows[3].pk],
+        )
@@ -0,0 +1,85 @@
+# apps/home/tests/test_snapshots.py
+import os
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import default_storage
+
+from apps.home import signals, snapshots
+from apps.home.models import PortfolioCategory, PortfolioItem, StoredBlob
+
+from .utils import MediaTestCase, image_file, make_category, make_item
+
+
+class SnapshotImportTests(MediaTestCase):
+    def setUp(self):
+        self.category = make_category()
+        self.kept = make_item(self.category, "Kept", thumbnail=image_file())
+        self.dropped = make_item(
+            self.category, "Dropped", thumbnail=image_file(color=(30, 30, 200))
+        )
+        self.names = {self.kept.thumbnail.name, self.dropped.thumbnail.name}
+
+        spool = tempfile.NamedTemporaryFile(suffix=".tar", delete=False)
+        self.addCleanup(os.remove, spool.name)
+        with spool:
+            snapshots.export_snapshot(spool)
+        self.path = spool.name
+
+    def refcounts(self):
+        return dict(StoredBlob.objects.values_list("name", "refcount"))
+
+    def test_failed_import_removes_the_media_it_stored(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dropped.delete()
+        dropped = self.dropped.thumbnail.name
+        self.assertFalse(default_storage.exists(dropped))
+
+        with mock.patch.object(
+            snapshots, "reconcile_counters", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            snapshots.import_snapshot(self.path, replace=True)
+        self.assertFalse(default_storage.exists(dropped))
+        # Still referenced by the row the rollback kept
+        self.assertTrue(default_storage.exists(self.kept.thumbnail.name))
+        self.assertEqual(self.refcounts(), {self.kept.thumbnail.name: 1})
+
+    def test_media_of_skipped_items_is_not_kept(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dropped.thumbnail = image_file(color=(200, 200, 30))
+            self.dropped.save()
+        replaced = self.names - {self.kept.thumbnail.name}
+        self.assertFalse(any(default_storage.exists(name) for name in replaced))
+
+        results, media = snapshots.import_snapshot(self.path)
+        self.assertEqual(results["items"], (0, 2))
+        self.assertEqual(media, 0)
+        # Stored again for the skipped item, then removed
+        self.assertFalse(any(default_storage.exists(name) for name in replaced))
+        self.assertEqual(
+            self.refcounts(),
+            {self.kept.thumbnail.name: 1, self.dropped.thumbnail.name: 1},
+        )
+
+    def test_replace_skips_per_row_handlers_and_settles_once(self):
+        old_pks = {self.kept.pk, self.dropped.pk}
+        with mock.patch.object(
+            signals, "_invalidate_fragments"
+        ) as per_row, mock.patch.object(
+            snapshots, "notify_bulk_change", wraps=snapshots.notify_bulk_change
+        ) as bulk, self.captureOnCommitCallbacks(
+            execute=True
+        ):
+            results, media = snapshots.import_snapshot(self.path, replace=True)
+        per_row.assert_not_called()
+        self.assertEqual(results["items"], (2, 0))
+        self.assertEqual(media, 2)
+
+        # The deleted rows are reported once, after the imported ones
+        reported = {call.args[0]: set(call.args[1]) for call in bulk.call_args_list}
+        self.assertEqual(reported[PortfolioItem], old_pks)
+        self.assertFalse(PortfolioItem.objects.filter(pk__in=old_pks).exists())
+        # Each blob lost one reference and gained one
+        self.assertEqual(self.refcounts(), dict.fromkeys(self.names, 1))
+        self.assertTrue(all(default_storage.exists(name) for name in self.names))
+        self.assertEqual(PortfolioCategory.objects.get().active_items_count, 2)
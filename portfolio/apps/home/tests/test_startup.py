@@ -0,0 +1,35 @@
+# apps/home/tests/test_startup.py
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+BOOT_SNIPPET = """
+import sys
+import django
+django.setup()
+print(" ".join(
+    name for name in ("numpy", "django.contrib.gis.gdal", "django.contrib.gis.geos")
+    if name in sys.modules
+))
+"""
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_boot_loads_neither_gis_nor_numpy(self):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            "ENABLE_GIS": "False",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", BOOT_SNIPPET],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
@@ -0,0 +1,92 @@
+# apps/home/tests/test_storage.py
+import os
+import time
+
+from django.core.files.storage import default_storage
+
+from apps.home.models import PortfolioItem, StoredBlob
+
+from .utils import MediaTestCase, image_file, make_category, make_item
+
+
+class ContentAddressedStorageTests(MediaTestCase):
+    def setUp(self):
+        self.category = make_category()
+
+    def refcount(self, name):
+        return StoredBlob.objects.get(name=name).refcount
+
+    def test_same_content_is_stored_once(self):
+        first = make_item(self.category, thumbnail=image_file())
+        second = make_item(self.category, "Other", thumbnail=image_file())
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+        self.assertTrue(first.thumbnail.name.startswith("cas/"))
+        self.assertEqual(self.refcount(first.thumbnail.name), 2)
+
+    def test_reuploading_same_content_keeps_refcount(self):
+        item = make_item(self.category, thumbnail=image_file())
+        name = item.thumbnail.name
+
+        item = PortfolioItem.objects.get(pk=item.pk)
+        item.thumbnail = image_file(name="again.png")
+        with self.captureOnCommitCallbacks(execute=True):
+            item.save()
+        self.assertEqual(item.thumbnail.name, name)
+        self.assertEqual(self.refcount(name), 1)
+
+    def test_blob_is_deleted_with_last_reference(self):
+        first = make_item(self.category, thumbnail=image_file())
+        second = make_item(self.category, "Other", thumbnail=image_file())
+        name = first.thumbnail.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.refcount(name), 1)
+        self.assertTrue(default_storage.exists(name))
+
+        second = PortfolioItem.objects.get(pk=second.pk)
+        second.thumbnail = image_file((0, 0, 255))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.save()
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
+        self.assertFalse(default_storage.exists(name))
+        self.assertEqual(self.refcount(second.thumbnail.name), 1)
+
+    def test_fields_left_out_of_update_fields_are_not_counted(self):
+        item = make_item(self.category, thumbnail=image_file())
+        name = item.thumbnail.name
+
+        item = PortfolioItem.objects.get(pk=item.pk)
+        item.thumbnail = image_file((0, 0, 255))
+        item.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            item.save(update_fields=["title"])
+        self.assertEqual(self.refcount(name), 1)
+
+    def test_retaining_a_deleted_blob_fails_without_a_row(self):
+        name = default_storage.save("photo.png", image_file())
+        default_storage.delete(name)
+        with self.assertRaises(FileNotFoundError):
+            default_storage.retain(name)
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
+
+    def test_sweep_deletes_old_unreferenced_blobs_only(self):
+        def stored(color, age):
+            name = default_storage.save("photo.png", image_file(color))
+            then = time.time() - age
+            os.utime(default_storage.path(name), (then, then))
+            return name
+
+        # e.g. the upload of a save that failed
+        orphan = stored((1, 1, 1), age=7200)
+        recent = stored((2, 2, 2), age=60)
+        referenced = make_item(self.category, thumbnail=image_file()).thumbnail.name
+        reused = stored((3, 3, 3), age=7200)
+        os.utime(default_storage.path(referenced), (0, 0))
+        # Uploaded again and about to be retained
+        default_storage.save("again.png", image_file((3, 3, 3)))
+
+        self.assertEqual(default_storage.sweep(grace=3600), [orphan])
+        self.assertFalse(default_storage.exists(orphan))
+        for name in (recent, referenced, reused):
+            self.assertTrue(default_storage.exists(name))
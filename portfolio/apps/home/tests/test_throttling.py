@@ -0,0 +1,72 @@
+# apps/home/tests/test_throttling.py
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.home.throttling import (
+    claim_submission,
+    release_submission,
+    submission_keys,
+    take_token,
+)
+
+
+@override_settings(CONTACT_THROTTLE_RATES={"ip": (5, 600)})
+class TakeTokenTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_then_wait(self):
+        now = 6000.0  # start of a window
+        for _ in range(5):
+            self.assertEqual(take_token("ip", "1.2.3.4", now), 0)
+        self.assertEqual(take_token("ip", "1.2.3.4", now), 600)
+        self.assertEqual(take_token("ip", "5.6.7.8", now), 0)
+
+    def test_previous_window_slides_out(self):
+        for _ in range(5):
+            take_token("ip", "1.2.3.4", 6000.0)
+        # Next window: the previous one still counts for 80% of it
+        self.assertEqual(take_token("ip", "1.2.3.4", 6720.0), 0)
+        wait = take_token("ip", "1.2.3.4", 6720.0)
+        self.assertAlmostEqual(wait, 120)
+        self.assertEqual(take_token("ip", "1.2.3.4", 6720.0 + wait), 0)
+
+    def test_concurrent_requests_cannot_share_a_token(self):
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            waits = list(
+                pool.map(lambda _: take_token("ip", "1.2.3.4", 6000.0), range(20))
+            )
+        self.assertEqual(waits.count(0), 5)
+
+
+class DeduplicationTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def keys(self, message="Hello there", key=None):
+        headers = {"Idempotency-Key": key} if key else {}
+        request = RequestFactory().post(
+            "/contact/",
+            {"email": "ada@example.com", "message": message},
+            headers=headers,
+        )
+        return submission_keys(request)
+
+    def test_fresh_idempotency_key_does_not_bypass_content_hash(self):
+        self.assertTrue(claim_submission(self.keys(key="first")))
+        self.assertFalse(claim_submission(self.keys(key="second")))
+        self.assertFalse(claim_submission(self.keys("Hello  THERE")))
+
+    def test_reused_idempotency_key_is_a_duplicate(self):
+        self.assertTrue(claim_submission(self.keys(key="retry")))
+        self.assertFalse(claim_submission(self.keys("Edited", key="retry")))
+        # The refused claim left the edited content unclaimed
+        self.assertTrue(claim_submission(self.keys("Edited")))
+
+    def test_released_submission_can_be_resent(self):
+        keys = self.keys(key="first")
+        self.assertTrue(claim_submission(keys))
+        release_submission(keys)
+        self.assertTrue(claim_submission(self.keys(key="first")))
@@ -0,0 +1,65 @@
+# apps/home/tests/test_uploads.py
+import io
+import tempfile
+from unittest import mock
+
+from django.test import override_settings
+
+from apps.home import uploads
+from apps.home.models import GalleryUpload
+
+from .utils import MediaTestCase, image_file, make_category, make_item
+
+
+class ChunkedUploadTests(MediaTestCase):
+    def setUp(self):
+        upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_dir.cleanup)
+        self.enterContext(override_settings(GALLERY_UPLOAD_DIR=upload_dir.name))
+        self.content = image_file().read()
+        self.upload = GalleryUpload.objects.create(
+            portfolio_item=make_item(make_category()),
+            filename="photo.png",
+            size=len(self.content),
+        )
+
+    def send(self, upload, start, end):
+        return uploads.append_chunk(
+            upload, io.BytesIO(self.content[start:end]), start, end - start
+        )
+
+    def test_stale_offset_is_rejected(self):
+        stale = GalleryUpload.objects.get(pk=self.upload.pk)
+        self.send(self.upload, 0, 10)
+        # A second request that read the row before the first one appended
+        with self.assertRaisesMessage(uploads.UploadError, "Expected offset 10"):
+            self.send(stale, 0, 10)
+        with open(uploads.part_path(self.upload), "rb") as part:
+            self.assertEqual(part.read(), self.content[:10])
+
+    def test_completed_upload_is_processed(self):
+        self.send(self.upload, 0, 10)
+        with mock.patch.object(uploads, "start_processing") as start:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.send(self.upload, 10, len(self.content))
+        start.assert_called_once_with(self.upload.pk)
+
+        uploads.process_upload(self.upload.pk)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.status, "done")
+        self.assertEqual(self.upload.portfolio_item.gallery_images.count(), 1)
+
+    def test_processing_thread_closes_its_connections(self):
+        with mock.patch.object(uploads.threading, "Thread") as thread:
+            uploads.start_processing(self.upload.pk)
+        # Not a daemon: shutdown waits for it
+        thread.assert_called_once_with(
+            target=uploads._process_in_thread, args=(self.upload.pk,)
+        )
+
+        with mock.patch.object(
+            uploads, "process_upload", side_effect=RuntimeError
+        ), mock.patch.object(uploads.connections, "close_all") as close_all:
+            with self.assertRaises(RuntimeError):
+                uploads._process_in_thread(self.upload.pk)
+        close_all.assert_called_once_with()
@@ -0,0 +1,43 @@
+# apps/home/tests/test_warmup.py
+from unittest import mock
+
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.home import analytics, metrics, warmup
+
+from .utils import MediaTestCase, image_file, make_category, make_item
+
+
+@override_settings(METRICS_DIR=None)
+class WarmupTrafficTests(MediaTestCase):
+    def setUp(self):
+        analytics._pending.clear()
+        self.enterContext(mock.patch.object(analytics, "_start_flusher"))
+        # fetch_page closes its thread's connections; here that is the test's
+        self.enterContext(mock.patch.object(warmup.connections, "close_all"))
+        # The handler's request signals would close the test's connection
+        # (inside its transaction); the test client disconnects them too
+        for signal in (request_started, request_finished):
+            signal.disconnect(close_old_connections)
+            self.addCleanup(signal.connect, close_old_connections)
+        category = make_category()
+        self.item = make_item(category, thumbnail=image_file())
+        make_item(category, "Other", thumbnail=image_file())
+
+    def test_warmup_is_not_counted_in_metrics_or_analytics(self):
+        url = reverse("home:portfolio_detail", args=[self.item.slug])
+        key = ("home:portfolio_detail", "GET", "200")
+        before = metrics.REQUESTS.values.get(key, 0)
+
+        _, status, _, error = warmup.fetch_page(url)
+        self.assertEqual((status, error), (200, None))
+        self.assertEqual(metrics.REQUESTS.values.get(key, 0), before)
+        self.assertEqual(analytics.flush(), 0)
+
+        # The same page fetched by a visitor is counted by both
+        self.client.get(url).getvalue()
+        self.assertEqual(metrics.REQUESTS.values[key], before + 1)
+        self.assertEqual(analytics.flush(), 1)
@@ -0,0 +1,23 @@
+# apps/home/tests/test_warmup_templates.py
+from django.test import SimpleTestCase
+
+from apps.home.warmup import get_engine, template_names, warm_templates
+
+
+class TemplateWarmupTests(SimpleTestCase):
+    def test_site_templates_are_found(self):
+        names = template_names()
+        self.assertIn("main_template.html", names)
+        self.assertIn("home/index.html", names)
+
+    def test_warmed_templates_are_in_the_cached_loader(self):
+        timings = warm_templates(["home/index.html"])
+        self.assertEqual(
+            [(name, error) for name, _, error in timings], [("home/index.html", None)]
+        )
+        loader = get_engine().template_loaders[0]
+        self.assertIn("home/index.html", loader.get_template_cache)
+
+    def test_broken_template_is_reported_not_raised(self):
+        timings = warm_templates(["does/not/exist.html"])
+        self.assertIn("TemplateDoesNotExist", timings[0][2])
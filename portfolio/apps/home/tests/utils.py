@@ -0,0 +1,37 @@
+# apps/home/tests/utils.py
+import io
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from apps.home.models import PortfolioCategory, PortfolioItem
+
+
+def image_file(color=(200, 30, 30), size=(20, 10), name="image.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def make_category(name="Web", **kwargs):
+    return PortfolioCategory.objects.create(name=name, **kwargs)
+
+
+def make_item(category, title="Project", **kwargs):
+    kwargs.setdefault("short_description", f"{title} summary")
+    kwargs.setdefault("full_description", f"{title} description")
+    return PortfolioItem.objects.create(category=category, title=title, **kwargs)
+
+
+class MediaTestCase(TestCase):
+    """TestCase with an empty MEDIA_ROOT of its own"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        super().setUpClass()
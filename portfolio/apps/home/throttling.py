@@ -0,0 +1,130 @@
+# apps/home/throttling.py
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# ----------------------------------------------------------
+# Contact form throttling and de-duplication
+#
+# Both run before the form is validated, so a flood of submissions costs
+# a few cache round trips and never reaches the database or SMTP. The
+# cache has to be shared between workers (CACHES["default"] is Redis when
+# REDIS_URL is set).
+
+KEY_PREFIX = "throttle"
+
+# name -> (burst, seconds): `burst` submissions per `seconds`, over a sliding
+# window
+DEFAULT_RATES = {
+    "ip": (5, 10 * 60),
+    "email": (5, 60 * 60),
+}
+
+DEFAULT_DEDUP_WINDOW = 10 * 60
+
+
+def get_cache():
+    return caches[getattr(settings, "THROTTLE_CACHE_ALIAS", "default")]
+
+
+def get_rate(name):
+    rates = {**DEFAULT_RATES, **getattr(settings, "CONTACT_THROTTLE_RATES", {})}
+    return rates[name]
+
+
+def client_ip(request):
+    """
+    The client address. Behind a proxy, CONTACT_CLIENT_IP_HEADER names the
+    META key it sets (e.g. "HTTP_X_REAL_IP"); the first address is used.
+    """
+    header = getattr(settings, "CONTACT_CLIENT_IP_HEADER", None)
+    if header and request.META.get(header):
+        return request.META[header].split(",")[0].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _hash(value):
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+# ----------------------------------------------------------
+# Sliding-window counters
+def take_token(name, identity, now=None):
+    """
+    Count one submission for `identity`; returns the number of seconds to
+    wait, 0 when the submission is allowed.
+
+    Submissions are counted per window of `seconds`; the previous window's
+    count is weighted by how much of it still overlaps the last `seconds`.
+    Only add() and incr() modify the counter, both atomic on every cache
+    backend, so concurrent requests cannot both take the last token.
+    """
+    if not identity:
+        return 0
+    burst, seconds = get_rate(name)
+    now = time.time() if now is None else now
+    window, offset = divmod(now, seconds)
+
+    cache = get_cache()
+    key = f"{KEY_PREFIX}:{name}:{_hash(identity)}"
+    current = f"{key}:{int(window)}"
+    # Kept for the next window, which reads it as its previous one
+    cache.add(current, 0, timeout=2 * seconds)
+    taken = cache.incr(current)
+    previous = cache.get(f"{key}:{int(window) - 1}", 0)
+    weight = 1 - offset / seconds
+    if previous * weight + taken <= burst:
+        return 0
+
+    cache.decr(current)  # a refused submission takes no token
+    if taken > burst:
+        return seconds - offset  # this window is full
+    # Wait until enough of the previous window has slid out
+    return max(seconds * (1 - (burst - taken) / previous) - offset, 1)
+
+
+def check_contact_rate(request):
+    """Seconds until this client may submit again, 0 if it may now"""
+    email = request.POST.get("email", "").strip().lower()
+    return take_token("ip", client_ip(request)) or take_token("email", email)
+
+
+# ----------------------------------------------------------
+# De-duplication
+def submission_keys(request):
+    """
+    Keys claimed for a submission: a hash of the submitted content, plus
+    the Idempotency-Key header when the form script sends one. The content
+    key is always claimed, so a client sending a fresh key with every POST
+    is still de-duplicated.
+    """
+    fields = ("email", "subject", "message")
+    content = "\0".join(
+        " ".join(request.POST.get(field, "").lower().split()) for field in fields
+    )
+    identities = [f"content:{content}"]
+    idempotency_key = request.headers.get("Idempotency-Key", "").strip()
+    if idempotency_key:
+        identities.append(f"key:{idempotency_key[:200]}")
+    return [f"{KEY_PREFIX}:dedup:{_hash(identity)}" for identity in identities]
+
+
+def claim_submission(keys):
+    """True the first time a submission is seen within the window"""
+    window = getattr(settings, "CONTACT_DEDUP_WINDOW", DEFAULT_DEDUP_WINDOW)
+    cache = get_cache()
+    claimed = []
+    for key in keys:
+        if not cache.add(key, 1, timeout=window):
+            # Seen before under one of its keys; keep the others free
+            cache.delete_many(claimed)
+            return False
+        claimed.append(key)
+    return True
+
+
+def release_submission(keys):
+    """Forget a submission that was rejected, so it can be corrected and resent"""
+    get_cache().delete_many(keys)
@@ -0,0 +1,211 @@
+# apps/home/uploads.py
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile, gettempdir
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connections, transaction
+from PIL import UnidentifiedImageError
+
+from .images import read_image_metadata, set_metadata
+from .models import GalleryUpload, PortfolioImage
+from .ordering import ORDER_GAP, next_order
+from .signals import notify_bulk_change
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent chunks are not serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# Chunked, resumable gallery uploads
+#
+# The admin client creates a GalleryUpload session, then sends the file in
+# chunks with an Upload-Offset header. Chunks are streamed from the request
+# straight onto a .part file, so an interrupted upload resumes from
+# `received`. Chunks for the same upload are serialized by an exclusive lock
+# on the .part file, under which `received` is re-read, so two requests
+# sending the same offset cannot both append. Complete files are processed
+# in a background thread: a single image becomes one PortfolioImage, a .zip
+# becomes one per image inside.
+
+READ_BLOCK_SIZE = 64 * 1024
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+
+class UploadError(Exception):
+    pass
+
+
+def get_upload_dir():
+    path = getattr(
+        settings,
+        "GALLERY_UPLOAD_DIR",
+        os.path.join(gettempdir(), "portfolio", "gallery-uploads"),
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def part_path(upload):
+    return os.path.join(get_upload_dir(), f"{upload.pk}.part")
+
+
+def max_chunk_size():
+    return getattr(settings, "GALLERY_UPLOAD_CHUNK_SIZE", 4 * 1024 * 1024)
+
+
+def append_chunk(upload, stream, offset, length):
+    """
+    Append `length` bytes read from `stream` at `offset`.
+
+    Raises UploadError if the offset does not match what was received so
+    far (the client then asks for the status and resumes from there).
+    """
+    if upload.status != "uploading":
+        raise UploadError(f"Upload is {upload.status}")
+    if length > max_chunk_size() or offset + length > upload.size:
+        raise UploadError("Chunk too large")
+
+    path = part_path(upload)
+    with open(path, "ab") as part:
+        if fcntl is not None:
+            fcntl.flock(part, fcntl.LOCK_EX)  # released when the file is closed
+        # Another request may have appended while this one waited
+        upload.refresh_from_db(fields=["status", "received"])
+        if upload.status != "uploading":
+            raise UploadError(f"Upload is {upload.status}")
+        if offset != upload.received or os.fstat(part.fileno()).st_size < offset:
+            raise UploadError(f"Expected offset {upload.received}")
+
+        part.truncate(offset)  # drop the tail of a chunk that was cut off
+        remaining = length
+        while remaining:
+            block = stream.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            part.write(block)
+            remaining -= len(block)
+        if remaining:
+            raise UploadError("Chunk ended early")
+
+        upload.received = offset + length
+        update_fields = ["received", "updated_at"]
+        if upload.received == upload.size:
+            upload.status = "processing"
+            update_fields.append("status")
+        upload.save(update_fields=update_fields)
+    if upload.status == "processing":
+        transaction.on_commit(lambda: start_processing(upload.pk))
+    return upload
+
+
+# ----------------------------------------------------------
+# Processing
+def start_processing(upload_id):
+    # Not a daemon thread: a worker that is shutting down finishes the upload
+    # instead of leaving it "processing" with a half-imported gallery
+    threading.Thread(target=_process_in_thread, args=(upload_id,)).start()
+
+
+def _process_in_thread(upload_id):
+    try:
+        process_upload(upload_id)
+    finally:
+        connections.close_all()  # this thread's connections
+
+
+def _store_image(file, filename):
+    """Compute metadata and store one image; returns (name, metadata)"""
+    metadata = read_image_metadata(file)
+    name = default_storage.save(
+        f"portfolio/gallery/{os.path.basename(filename)}", File(file)
+    )
+    return name, metadata
+
+
+def _store_zip_member(path, member):
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open(member) as file:
+            # Zip members are not seekable; spool to a temporary file first
+            with SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+                while block := file.read(READ_BLOCK_SIZE):
+                    spool.write(block)
+                return _store_image(spool, member)
+    except (OSError, UnidentifiedImageError, zipfile.BadZipFile) as e:
+        logger.warning("Skipped %s in gallery archive: %s", member, e)
+        return None
+    finally:
+        close_old_connections()
+
+
+def import_gallery_zip(item, path, workers=4):
+    """Create a PortfolioImage for every image in a zip archive, in parallel"""
+    with zipfile.ZipFile(path) as archive:
+        members = sorted(
+            info.filename
+            for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(IMAGE_EXTENSIONS)
+            and not os.path.basename(info.filename).startswith(".")
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stored = list(pool.map(lambda member: _store_zip_member(path, member), members))
+
+    order = next_order(item.gallery_images.all())
+    images = []
+    for member, result in zip(members, stored):
+        if result is None:
+            continue
+        name, metadata = result
+        image = PortfolioImage(portfolio_item=item, image=name, order=order)
+        set_metadata(image, "image", metadata)
+        images.append(image)
+        order += ORDER_GAP
+    with transaction.atomic():
+        images = PortfolioImage.objects.bulk_create(images)
+        # bulk_create() sends no post_save, which is where references are counted
+        if hasattr(default_storage, "retain"):
+            for image in images:
+                default_storage.retain(image.image.name)
+    notify_bulk_change(PortfolioImage, [image.pk for image in images])
+    notify_bulk_change(type(item), [item.pk])
+    return len(images)
+
+
+def process_upload(upload_id):
+    upload = GalleryUpload.objects.select_related("portfolio_item").get(pk=upload_id)
+    path = part_path(upload)
+    try:
+        if upload.filename.lower().endswith(".zip"):
+            workers = getattr(settings, "GALLERY_IMPORT_WORKERS", 4)
+            upload.images_created = import_gallery_zip(
+                upload.portfolio_item, path, workers
+            )
+        else:
+            with open(path, "rb") as file, transaction.atomic():
+                image = PortfolioImage(
+                    portfolio_item=upload.portfolio_item,
+                    order=next_order(upload.portfolio_item.gallery_images.all()),
+                )
+                image.image.save(upload.filename, File(file), save=False)
+                image.save()
+            upload.images_created = 1
+        upload.status = "done"
+    except Exception as e:
+        logger.exception("Processing gallery upload %s failed", upload.pk)
+        upload.status = "failed"
+        upload.error = str(e)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+        upload.save(update_fields=["status", "images_created", "error", "updated_at"])
@@ -1,6 +1,15 @@
 # apps/home/urls.py
 from django.urls import path
-from .views import ContactView, index, portfolio_detail, portfolio_by_category
+from .views import (
+    ContactView,
+    feed_view,
+    index,
+    metrics_view,
+    portfolio_detail,
+    portfolio_by_category,
+    service_worker_view,
+    sitemap_view,
+)
 
 # -----------------------------------------------------
 app_name = "home"
@@ -13,4 +22,9 @@ urlpatterns = [
         portfolio_by_category,
         name="portfolio_category",
     ),
+    path("metrics/", metrics_view, name="metrics"),
+    path("sitemap.xml", sitemap_view, name="sitemap"),
+    path("sitemap-<str:section>.xml", sitemap_view, name="sitemap_section"),
+    path("feed.atom", feed_view, name="feed"),
+    path("sw.js", service_worker_view, name="service_worker"),
 ]
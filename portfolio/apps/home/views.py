@@ -3,11 +3,30 @@ from django.shortcuts import render, get_object_or_404
 from django.conf import settings
 from django.views import View
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.static import serve
+from django.utils.crypto import constant_time_compare
 from django.utils.decorators import method_decorator
+from . import analytics, metrics, service_worker, sitemap
+from .cdn import (
+    CATEGORY_LIST_KEY,
+    ITEM_LIST_KEY,
+    add_surrogate_keys,
+    model_key,
+    model_keys,
+)
 from .forms import ContactForm
-from .models import PortfolioCategory, PortfolioItem
+from .models import PortfolioCategory, PortfolioImage, PortfolioItem
+from .recommendations import get_related_items
+from .storage import IMMUTABLE_CACHE_CONTROL, is_content_addressed
+from .streaming import stream_template
+from .throttling import (
+    check_contact_rate,
+    claim_submission,
+    release_submission,
+    submission_keys,
+)
 
 
 # ----------------------------------------------------------
@@ -16,6 +35,59 @@ def media_admin(request):
     return {"media_url": settings.MEDIA_URL}
 
 
+# ----------------------------------------------------------
+# Media files (development server; content-addressed blobs never change)
+def serve_media(request, path, document_root=None):
+    response = serve(request, path, document_root=document_root)
+    if is_content_addressed(path):
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+# ----------------------------------------------------------
+# Metrics scrape endpoint (Authorization: Bearer <METRICS_TOKEN>)
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token or not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+    return HttpResponse(
+        metrics.render_text(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+# ----------------------------------------------------------
+# Sitemap and Atom feed (pre-generated, see sitemap.py)
+def sitemap_view(request, section=None):
+    document = sitemap.sitemap_document(section)
+    if document is None:
+        raise Http404("No such sitemap")
+    response = HttpResponse(document, content_type="application/xml; charset=utf-8")
+    response["Cache-Control"] = "public, max-age=3600"
+    return response
+
+
+def feed_view(request):
+    response = HttpResponse(
+        sitemap.feed_document(), content_type="application/atom+xml; charset=utf-8"
+    )
+    response["Cache-Control"] = "public, max-age=900"
+    return response
+
+
+# ----------------------------------------------------------
+# Service worker (generated by manage.py build_service_worker)
+def service_worker_view(request):
+    source = service_worker.load()
+    if source is None:
+        raise Http404("Service worker has not been built")
+    response = HttpResponse(source, content_type="application/javascript")
+    # Browsers compare the script byte for byte on every check
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
 # ----------------------------------------------------------
 # Index view
 def index(request):
@@ -26,29 +98,46 @@ def index(request):
     )
     featured_items = portfolio_items.filter(is_featured=True)[:6]
 
+    sort = analytics.sort_order(request)
     context = {
         "categories": categories,
-        "portfolio_items": portfolio_items,
+        "portfolio_items": (
+            analytics.most_viewed(portfolio_items) if sort else portfolio_items
+        ),
         "featured_items": featured_items,
+        "sort": sort,
+        "ranking_version": analytics.ranking_version() if sort else "",
     }
-    return render(request, "home/index.html", context)
+    response = stream_template(request, "home/index.html", context)
+
+    # pk-only queries, so a cached portfolio grid stays query-free
+    surrogate_keys = [ITEM_LIST_KEY, CATEGORY_LIST_KEY]
+    surrogate_keys += model_keys(
+        PortfolioItem, portfolio_items.values_list("pk", flat=True)
+    )
+    surrogate_keys += model_keys(
+        PortfolioCategory, categories.values_list("pk", flat=True)
+    )
+    return add_surrogate_keys(response, surrogate_keys)
 
 
 # ----------------------------------------------------------
 # Portfolio detail view
 def portfolio_detail(request, slug):
+    # Gallery images are loaded inside the cached gallery fragment
     portfolio_item = get_object_or_404(
-        PortfolioItem.objects.select_related("category").prefetch_related(
-            "gallery_images"
-        ),
+        PortfolioItem.objects.select_related("category"),
         slug=slug,
         is_active=True,
     )
+    analytics.record_view(request, portfolio_item.pk)
 
-    # Get related projects (same category)
-    related_items = PortfolioItem.objects.filter(
-        category=portfolio_item.category, is_active=True
-    ).exclude(id=portfolio_item.pk)[:3]
+    # Get related projects (precomputed, falling back to same category)
+    related_items = get_related_items(portfolio_item) or (
+        PortfolioItem.objects.filter(
+            category=portfolio_item.category, is_active=True
+        ).exclude(id=portfolio_item.pk)[:3]
+    )
 
     context = {
         "item": portfolio_item,
@@ -56,7 +145,18 @@ def portfolio_detail(request, slug):
         "technologies": portfolio_item.get_technologies_list(),
         "features": portfolio_item.get_features_list(),
     }
-    return render(request, "home/portfolio_detail.html", context)
+    response = stream_template(request, "home/portfolio_detail.html", context)
+
+    surrogate_keys = [
+        model_key(PortfolioItem, portfolio_item.pk),
+        model_key(PortfolioCategory, portfolio_item.category_id),
+    ]
+    surrogate_keys += model_keys(PortfolioItem, [item.pk for item in related_items])
+    surrogate_keys += model_keys(
+        PortfolioImage,
+        portfolio_item.gallery_images.values_list("pk", flat=True),
+    )
+    return add_surrogate_keys(response, surrogate_keys)
 
 
 # ----------------------------------------------------------
@@ -65,11 +165,18 @@ def portfolio_by_category(request, category_slug):
     category = get_object_or_404(PortfolioCategory, slug=category_slug, is_active=True)
     items = PortfolioItem.objects.filter(category=category, is_active=True)
 
+    sort = analytics.sort_order(request)
     context = {
         "category": category,
-        "items": items,
+        "items": analytics.most_viewed(items) if sort else items,
+        "sort": sort,
+        "ranking_version": analytics.ranking_version() if sort else "",
     }
-    return render(request, "home/portfolio_category.html", context)
+    response = render(request, "home/portfolio_category.html", context)
+
+    surrogate_keys = [model_key(PortfolioCategory, category.pk)]
+    surrogate_keys += model_keys(PortfolioItem, items.values_list("pk", flat=True))
+    return add_surrogate_keys(response, surrogate_keys)
 
 
 # ----------------------------------------------------------
@@ -82,6 +189,44 @@ class ContactView(View):
         )
 
     def post(self, request):
+        is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
+
+        # Throttle and de-duplicate before any validation, DB or mail work
+        retry_after = check_contact_rate(request)
+        if retry_after:
+            metrics.CONTACT_SUBMISSIONS.inc(result="throttled")
+            message = "Too many messages. Please try again later."
+            if is_ajax:
+                response = JsonResponse(
+                    {"success": False, "message": message}, status=429
+                )
+            else:
+                messages.error(request, message)
+                response = render(
+                    request,
+                    "home/partials/contact.html",
+                    {"form": ContactForm(request.POST), "success": False},
+                    status=429,
+                )
+            response["Retry-After"] = str(int(retry_after) + 1)
+            return response
+
+        dedup_keys = submission_keys(request)
+        if not claim_submission(dedup_keys):
+            metrics.CONTACT_SUBMISSIONS.inc(result="duplicate")
+            message = "We have already received this message."
+            if is_ajax:
+                return JsonResponse(
+                    {"success": False, "duplicate": True, "message": message},
+                    status=409,
+                )
+            messages.info(request, message)
+            return render(
+                request,
+                "home/partials/contact.html",
+                {"form": ContactForm(), "success": True},
+            )
+
         form = ContactForm(request.POST)
 
         if form.is_valid():
@@ -91,6 +236,7 @@ class ContactView(View):
 
                 # Send email
                 email_sent = form.send_email()
+                metrics.CONTACT_SUBMISSIONS.inc(result="accepted")
 
                 if email_sent:
                     messages.success(
@@ -117,6 +263,8 @@ class ContactView(View):
                 )
 
             except Exception as e:
+                release_submission(dedup_keys)
+                metrics.CONTACT_SUBMISSIONS.inc(result="error")
                 messages.error(request, f"An error occurred: {str(e)}")
 
                 if request.headers.get("X-Requested-With") == "XMLHttpRequest":
@@ -125,6 +273,8 @@ class ContactView(View):
                     )
         else:
             # Form has validation errors
+            release_submission(dedup_keys)
+            metrics.CONTACT_SUBMISSIONS.inc(result="invalid")
             if request.headers.get("X-Requested-With") == "XMLHttpRequest":
                 return JsonResponse(
                     {
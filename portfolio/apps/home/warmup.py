@@ -0,0 +1,296 @@
+# apps/home/warmup.py
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from urllib.parse import unquote_to_bytes, urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.http.request import split_domain_port, validate_host
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = (".html", ".txt", ".xml")
+
+# Sent with every warmup request; neither the request metrics nor
+# analytics count these
+WARMUP_HEADER = "X-Cache-Warmup"
+
+
+# ----------------------------------------------------------
+# Templates
+def get_engine():
+    return engines["django"].engine
+
+
+def template_names(include_apps=False):
+    """Names of the templates under DIRS (and optionally every app's templates/)"""
+    engine = get_engine()
+    directories = list(engine.dirs)
+    if include_apps:
+        directories += get_app_template_dirs("templates")
+
+    names = []
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    names.append(os.path.relpath(path, directory).replace(os.sep, "/"))
+    return list(dict.fromkeys(names))
+
+
+def warm_templates(names=None, include_apps=False):
+    """
+    Compile templates into the cached loader of this process.
+
+    Returns a list of (name, seconds, error) tuples; error is None when the
+    template compiled.
+    """
+    engine = get_engine()
+    timings = []
+    for name in names or template_names(include_apps):
+        started = time.perf_counter()
+        try:
+            engine.get_template(name)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        timings.append((name, time.perf_counter() - started, error))
+    return timings
+
+
+# ----------------------------------------------------------
+# Models
+def prime_model_caches():
+    """Fill the per-process model metadata and ContentType caches"""
+    from django.contrib.contenttypes.models import ContentType
+
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+    ContentType.objects.get_for_models(*models)
+    return len(models)
+
+
+# ----------------------------------------------------------
+# Pages
+#
+# Pages are fetched by calling this process's WSGI handler, i.e. the full
+# middleware stack, with a request built here, so the fragment cache, the compressed-response
+# cache and (with Redis) every other worker's caches are filled. The CDN
+# is not; it refills from the warmed origin.
+def page_urls():
+    """The index, every active category and every active item"""
+    from .models import PortfolioCategory, PortfolioItem
+
+    urls = [reverse("home:index")]
+    urls += [
+        reverse("home:portfolio_category", args=[slug])
+        for slug in PortfolioCategory.objects.filter(is_active=True).values_list(
+            "slug", flat=True
+        )
+    ]
+    urls += [
+        reverse("home:portfolio_detail", args=[slug])
+        for slug in PortfolioItem.objects.filter(is_active=True).values_list(
+            "slug", flat=True
+        )
+    ]
+    return urls
+
+
+def warmup_host():
+    """SITE_URL's host if ALLOWED_HOSTS accepts it, else the first allowed host"""
+    host = urlsplit(getattr(settings, "SITE_URL", "")).netloc
+    allowed = settings.ALLOWED_HOSTS or ["localhost"]
+    if host and validate_host(split_domain_port(host)[0], allowed):
+        return host
+    return next((h for h in allowed if "*" not in h and not h.startswith(".")), host)
+
+
+@lru_cache(maxsize=None)
+def _handler():
+    return WSGIHandler()
+
+
+def _environ(url):
+    parts = urlsplit(url)
+    host = warmup_host()
+    domain, port = split_domain_port(host)
+    return {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": unquote_to_bytes(parts.path).decode("iso-8859-1"),
+        "QUERY_STRING": parts.query,
+        "SERVER_NAME": domain or "localhost",
+        "SERVER_PORT": port or "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "HTTP_HOST": host,
+        "HTTP_ACCEPT_ENCODING": "gzip, br",
+        "HTTP_" + WARMUP_HEADER.upper().replace("-", "_"): "1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": urlsplit(getattr(settings, "SITE_URL", "")).scheme or "http",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+
+def fetch_page(url):
+    """GET `url` in-process; returns (url, status, seconds, error)"""
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):
+        statuses.append(int(status.split(" ", 1)[0]))
+
+    started = time.perf_counter()
+    try:
+        response = _handler()(_environ(url), start_response)
+        try:
+            # Streamed pages render (and fill caches) while being consumed
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return url, statuses[-1], time.perf_counter() - started, None
+    except Exception as e:
+        return url, None, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+    finally:
+        # Warmup threads are short-lived; close what this one opened
+        connections.close_all()
+
+
+def warm_pages(urls=None, concurrency=None):
+    """
+    Fetch `urls` (default: page_urls()) with at most `concurrency` requests
+    in flight. Returns a list of (url, status, seconds, error) tuples.
+    """
+    if urls is None:
+        urls = page_urls()
+    if concurrency is None:
+        concurrency = getattr(settings, "WARMUP_CONCURRENCY", 4)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        return list(pool.map(fetch_page, urls))
+
+
+# ----------------------------------------------------------
+# Re-warm after invalidation (scheduled from signals.py)
+_rewarm_lock = threading.Lock()
+_rewarm_targets = {}
+_rewarm_timer = None
+
+
+def _reset_after_fork():
+    # A pending Timer thread does not survive fork(); start over
+    global _rewarm_lock, _rewarm_targets, _rewarm_timer
+    _rewarm_lock = threading.Lock()
+    _rewarm_targets = {}
+    _rewarm_timer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def schedule_rewarm(targets):
+    """
+    Re-warm the pages showing the given rows ({model: pks}) in the
+    background. Changes arriving within WARMUP_REWARM_DELAY seconds are
+    warmed together.
+    """
+    global _rewarm_timer
+    if not getattr(settings, "WARMUP_REWARM_ENABLED", False):
+        return
+    with _rewarm_lock:
+        for model, pks in targets.items():
+            _rewarm_targets.setdefault(model, set()).update(pks)
+        if _rewarm_timer is None:
+            _rewarm_timer = threading.Timer(
+                getattr(settings, "WARMUP_REWARM_DELAY", 2.0), _run_rewarm
+            )
+            _rewarm_timer.daemon = True
+            _rewarm_timer.start()
+
+
+def rewarm_urls(targets):
+    """Active pages that render any of the given rows"""
+    from .models import PortfolioCategory, PortfolioImage, PortfolioItem
+
+    item_pks = set(targets.get(PortfolioItem, ()))
+    category_pks = set(targets.get(PortfolioCategory, ()))
+    if targets.get(PortfolioImage):
+        item_pks.update(
+            PortfolioImage.objects.filter(pk__in=targets[PortfolioImage]).values_list(
+                "portfolio_item_id", flat=True
+            )
+        )
+
+    urls = [reverse("home:index")]
+    items = PortfolioItem.objects.filter(pk__in=item_pks, is_active=True)
+    for slug, category_pk in items.values_list("slug", "category_id"):
+        urls.append(reverse("home:portfolio_detail", args=[slug]))
+        category_pks.add(category_pk)
+    categories = PortfolioCategory.objects.filter(pk__in=category_pks, is_active=True)
+    for slug in categories.values_list("slug", flat=True):
+        urls.append(reverse("home:portfolio_category", args=[slug]))
+    return urls
+
+
+def _run_rewarm():
+    global _rewarm_timer
+    with _rewarm_lock:
+        targets = dict(_rewarm_targets)
+        _rewarm_targets.clear()
+        _rewarm_timer = None
+    try:
+        urls = rewarm_urls(targets)
+        results = warm_pages(urls)
+    except Exception:
+        logger.exception("Re-warming pages failed")
+        return
+    finally:
+        connections.close_all()
+    for url, status, seconds, error in results:
+        if error or status != 200:
+            logger.warning("Re-warming %s failed: %s", url, error or status)
+        else:
+            logger.debug("Re-warmed %s in %.1f ms", url, seconds * 1000)
+    logger.info("Re-warmed %d pages", len(results))
+
+
+# ----------------------------------------------------------
+# Worker boot hook (called from wsgi.py / asgi.py)
+def warm_on_boot():
+    if not getattr(settings, "TEMPLATE_WARMUP_ON_BOOT", False):
+        return
+    started = time.perf_counter()
+    timings = warm_templates()
+    for name, seconds, error in timings:
+        if error:
+            logger.warning("Template warmup failed for %s: %s", name, error)
+        else:
+            logger.debug("Compiled %s in %.1f ms", name, seconds * 1000)
+    if getattr(settings, "TEMPLATE_WARMUP_PRIME_MODELS", False):
+        try:
+            prime_model_caches()
+        except Exception as e:
+            logger.warning("Model cache warmup failed: %s", e)
+    logger.info(
+        "Warmed %d templates in %.1f ms",
+        len(timings),
+        (time.perf_counter() - started) * 1000,
+    )
@@ -0,0 +1,78 @@
+# gunicorn.conf.py
+import gc
+import multiprocessing
+
+# Not `from decouple import config`: gunicorn reads every module-level name
+# as a setting, and `config` is one
+import decouple
+
+# ----------------------------------------------------------
+# Production server
+#
+#   gunicorn -c gunicorn.conf.py      (from this directory)
+#
+# The app is imported once in the master (preload_app), including the
+# template warmup in portfolio/wsgi.py, so workers start already warm and
+# share those pages with the master copy-on-write. Before the first fork
+# the master's database connections are closed and gc.freeze() moves
+# everything loaded so far out of the collector's reach, so collections in
+# the workers do not write to (and copy) the shared pages. Per-process
+# state in apps/home (metrics, buffered page views, the slow-query queue,
+# re-warm timers) is reset in each child by os.register_at_fork hooks.
+#
+# Workers are recycled after GUNICORN_MAX_REQUESTS requests plus up to
+# GUNICORN_MAX_REQUESTS_JITTER more, so they do not all restart at once;
+# a recycled worker is forked from the warm master again.
+#
+# With preload_app, HUP re-forks workers from the code already loaded in
+# the master: deploys need a restart (or USR2 + QUIT of the old master).
+#
+# `manage.py benchmark_server` starts this configuration with and without
+# GUNICORN_PRELOAD and reports cold start and per-worker memory.
+
+wsgi_app = "portfolio.wsgi:application"
+
+bind = decouple.config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = decouple.config(
+    "WEB_CONCURRENCY", default=multiprocessing.cpu_count() * 2 + 1, cast=int
+)
+# More than one thread switches to the gthread worker
+threads = decouple.config("GUNICORN_THREADS", default=1, cast=int)
+
+preload_app = decouple.config("GUNICORN_PRELOAD", default=True, cast=bool)
+
+max_requests = decouple.config("GUNICORN_MAX_REQUESTS", default=1000, cast=int)
+max_requests_jitter = decouple.config(
+    "GUNICORN_MAX_REQUESTS_JITTER", default=100, cast=int
+)
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = decouple.config("GUNICORN_ACCESS_LOG", default=None)
+errorlog = "-"
+
+
+def _close_database_connections(server):
+    # A connection opened in the master (warmup queries) must not be shared
+    # by the workers' forked copies of its socket
+    if server.cfg.preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+# ----------------------------------------------------------
+# Server hooks
+def when_ready(server):
+    """Runs in the master after the app is loaded, before the first fork"""
+    _close_database_connections(server)
+    if server.cfg.preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info("Froze %d objects before forking", gc.get_freeze_count())
+
+
+def pre_fork(server, worker):
+    _close_database_connections(server)
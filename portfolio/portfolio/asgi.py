@@ -14,3 +14,13 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio.settings")
 
 application = get_asgi_application()
+
+# Compile templates before this worker accepts traffic
+from apps.home.warmup import warm_on_boot  # noqa: E402
+
+warm_on_boot()
+
+# Send 103 Early Hints for critical assets where the server supports them
+from apps.home.preload import EarlyHintsMiddleware  # noqa: E402
+
+application = EarlyHintsMiddleware(application)
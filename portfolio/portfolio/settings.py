@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,13 +47,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.home.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.home.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.home.middleware.PreloadLinkMiddleware",
+    "apps.home.middleware.SlowQueryMiddleware",
+    "apps.home.middleware.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "portfolio.urls"
@@ -80,9 +86,17 @@ WSGI_APPLICATION = "portfolio.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# The PostGIS backend loads the native GDAL/GEOS/PROJ libraries in every
+# process, so it is only used once a spatial feature is switched on.
+ENABLE_GIS = config("ENABLE_GIS", default=False, cast=bool)
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.contrib.gis.db.backends.postgis",
+        "ENGINE": (
+            "django.contrib.gis.db.backends.postgis"
+            if ENABLE_GIS
+            else "django.db.backends.postgresql"
+        ),
         "NAME": "portfolio",
         "USER": "postgres",
         "PASSWORD": "1234",
@@ -132,16 +146,167 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, "static/"),)
 MEDIA_URL = "media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
 
+# Uploads are stored once per content hash (see apps/home/storage.py)
+STORAGES = {
+    "default": {
+        "BACKEND": "apps.home.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
-# GIS Libraries Path
-GDAL_LIBRARY_PATH = os.environ.get("GDAL_LIBRARY_PATH", r"C:\OSGeo4W\bin\gdal311.dll")
-GEOS_LIBRARY_PATH = os.environ.get("GEOS_LIBRARY_PATH", r"C:\OSGeo4W\bin\geos_c.dll")
-PROJ_LIBRARY_PATH = os.environ.get("PROJ_LIBRARY_PATH", r"C:\OSGeo4W\bin\proj.dll")
+# Template warmup at worker boot (see apps/home/warmup.py)
+TEMPLATE_WARMUP_ON_BOOT = config("TEMPLATE_WARMUP_ON_BOOT", default=True, cast=bool)
+TEMPLATE_WARMUP_PRIME_MODELS = config(
+    "TEMPLATE_WARMUP_PRIME_MODELS", default=False, cast=bool
+)
+
+# Page warmup (manage.py warm_cache) and background re-warm of the pages
+# affected by a content edit, WARMUP_REWARM_DELAY seconds after it
+WARMUP_CONCURRENCY = config("WARMUP_CONCURRENCY", default=4, cast=int)
+WARMUP_REWARM_ENABLED = config("WARMUP_REWARM_ENABLED", default=True, cast=bool)
+WARMUP_REWARM_DELAY = 2.0
+
+
+# Related projects are rebuilt in the background this many seconds after an
+# edit (see apps/home/recommendations.py)
+RELATED_REFRESH_DELAY = 2.0
+
+
+# Template fragment cache ({% cachefragment %}, see apps/home/fragment_cache.py)
+FRAGMENT_CACHE_ALIAS = "default"
+FRAGMENT_CACHE_TIMEOUT = 60 * 60
+# Upper bound for fragments and their version tokens when the cache is
+# per-process (no REDIS_URL): how long other workers may serve a stale one
+FRAGMENT_CACHE_LOCAL_TIMEOUT = 60
+
+
+# Preload Link headers / 103 Early Hints (see apps/home/preload.py)
+PRELOAD_HINTS_ENABLED = config("PRELOAD_HINTS_ENABLED", default=True, cast=bool)
+PRELOAD_MANIFEST = config("PRELOAD_MANIFEST", default="")
+
+
+# Streaming HTML and gzip/brotli compression (see apps/home/compression.py)
+STREAMING_TEMPLATES_ENABLED = config(
+    "STREAMING_TEMPLATES_ENABLED", default=True, cast=bool
+)
+COMPRESSION_CACHE_ALIAS = "default"
+# Up to this many random bytes pad gzip responses that may carry a secret
+# (CSRF token, session), against BREACH
+COMPRESSION_MAX_RANDOM_BYTES = 100
+
+
+# Cache
+# Redis is shared by all workers, which the contact throttling relies on;
+# without REDIS_URL every process has its own local-memory cache.
+REDIS_URL = config("REDIS_URL", default="")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
+# Contact form throttling (see apps/home/throttling.py)
+# name -> (burst, seconds): `burst` submissions per sliding window of `seconds`
+CONTACT_THROTTLE_RATES = {
+    "ip": (5, 10 * 60),
+    "email": (5, 60 * 60),
+}
+CONTACT_DEDUP_WINDOW = 10 * 60
+CONTACT_CLIENT_IP_HEADER = config("CONTACT_CLIENT_IP_HEADER", default="") or None
+
+
+# Sessions and messages
+# Flash messages travel in a signed cookie, so anonymous visitors never get a
+# django_session row. Sessions (the admin) are read through the cache and
+# written through to the database.
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+
+# Per-request profiling (see apps/home/profiling.py); off unless
+# PROFILING_ENABLED is set, and then only for signed or staff requests
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+PROFILING_DIR = config(
+    "PROFILING_DIR",
+    default=os.path.join(tempfile.gettempdir(), "portfolio", "profiles"),
+)
+PROFILING_MAX_PROFILES = 50
+
+
+# Metrics (see apps/home/metrics.py), scraped from /metrics/ with
+# "Authorization: Bearer <METRICS_TOKEN>"; disabled while the token is empty
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+METRICS_DIR = config(
+    "METRICS_DIR", default=os.path.join(tempfile.gettempdir(), "portfolio", "metrics")
+)
+
+
+# Slow-query capture (see apps/home/slow_queries.py)
+SLOW_QUERY_ENABLED = config("SLOW_QUERY_ENABLED", default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config("SLOW_QUERY_THRESHOLD_MS", default=100, cast=int)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = 0.1
+SLOW_QUERY_MAX_ROWS = 1000
+
+
+# Page-view analytics (see apps/home/analytics.py); views are counted in
+# memory and written to ItemDailyViews every ANALYTICS_FLUSH_INTERVAL seconds
+ANALYTICS_ENABLED = config("ANALYTICS_ENABLED", default=True, cast=bool)
+ANALYTICS_FLUSH_INTERVAL = config("ANALYTICS_FLUSH_INTERVAL", default=30, cast=int)
+ANALYTICS_MAX_PENDING = 10000
+ANALYTICS_POPULAR_DAYS = 30
+
+
+# sitemap.xml and Atom feed (see apps/home/sitemap.py); SITE_URL is the
+# public origin their absolute URLs are built on
+SITE_URL = config("SITE_URL", default="http://localhost:8000")
+SITEMAP_BUCKET_SIZE = 10000
+# How long a per-process cache (no REDIS_URL) keeps the prebuilt sitemap and
+# feed; other workers may serve them stale for that long after an edit
+SITEMAP_LOCAL_TIMEOUT = 5 * 60
+
+
+# Service worker (see apps/home/service_worker.py); build it with
+# "manage.py build_service_worker" after collectstatic on every deploy
+SERVICE_WORKER_ENABLED = config("SERVICE_WORKER_ENABLED", default=False, cast=bool)
+SERVICE_WORKER_PATH = os.path.join(BASE_DIR, "build", "sw.js")
+
+
+# CDN purge by surrogate key (see apps/home/cdn.py)
+CDN_PURGE_BACKEND = config(
+    "CDN_PURGE_BACKEND", default="apps.home.cdn.NullPurgeBackend"
+)
+CDN_PURGE_URL = config("CDN_PURGE_URL", default="")
+CDN_PURGE_TOKEN = config("CDN_PURGE_TOKEN", default="")
+
+
+# GIS Libraries Path (only read when ENABLE_GIS is on)
+if ENABLE_GIS:
+    GDAL_LIBRARY_PATH = os.environ.get(
+        "GDAL_LIBRARY_PATH", r"C:\OSGeo4W\bin\gdal311.dll"
+    )
+    GEOS_LIBRARY_PATH = os.environ.get(
+        "GEOS_LIBRARY_PATH", r"C:\OSGeo4W\bin\geos_c.dll"
+    )
+    PROJ_LIBRARY_PATH = os.environ.get("PROJ_LIBRARY_PATH", r"C:\OSGeo4W\bin\proj.dll")
 
 
 # Email settings
@@ -19,8 +19,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from apps.home.views import serve_media
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("apps.home.urls"),name="home"),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+] + static(settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT)
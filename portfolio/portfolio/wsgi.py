@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio.settings")
 
 application = get_wsgi_application()
+
+# Compile templates before this worker accepts traffic
+from apps.home.warmup import warm_on_boot  # noqa: E402
+
+warm_on_boot()
@@ -0,0 +1,140 @@
+/* Chunked, resumable gallery uploads for the portfolio item admin. */
+(function () {
+  "use strict";
+
+  var RETRY_DELAY = 2000;
+  var MAX_RETRIES = 10;
+
+  function csrfToken() {
+    var match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    return match ? decodeURIComponent(match[1]) : "";
+  }
+
+  function request(method, url, body, headers) {
+    headers = Object.assign({ "X-CSRFToken": csrfToken() }, headers || {});
+    return fetch(url, {
+      method: method,
+      body: body,
+      headers: headers,
+      credentials: "same-origin",
+    }).then(function (response) {
+      return response.json().then(function (data) {
+        data.httpStatus = response.status;
+        return data;
+      });
+    });
+  }
+
+  function sessionKey(file) {
+    return "gallery-upload:" + [file.name, file.size, file.lastModified].join(":");
+  }
+
+  function Upload(file, container, progress) {
+    this.file = file;
+    this.createUrl = container.dataset.createUrl;
+    this.statusTemplate = container.dataset.statusUrl;
+    this.row = document.createElement("li");
+    progress.appendChild(this.row);
+    this.retries = 0;
+  }
+
+  Upload.prototype.report = function (text) {
+    this.row.textContent = this.file.name + ": " + text;
+  };
+
+  Upload.prototype.statusUrl = function () {
+    return this.statusTemplate.replace("00000000-0000-0000-0000-000000000000", this.id);
+  };
+
+  Upload.prototype.start = function () {
+    var self = this;
+    var saved = localStorage.getItem(sessionKey(this.file));
+    if (saved) {
+      // Resume an upload interrupted in an earlier page load
+      this.id = saved;
+      return request("GET", this.statusUrl()).then(function (data) {
+        if (data.httpStatus === 200 && data.status === "uploading") {
+          return self.send(data);
+        }
+        localStorage.removeItem(sessionKey(self.file));
+        self.id = null;
+        return self.create();
+      });
+    }
+    return this.create();
+  };
+
+  Upload.prototype.create = function () {
+    var self = this;
+    var body = JSON.stringify({ filename: this.file.name, size: this.file.size });
+    return request("POST", this.createUrl, body, {
+      "Content-Type": "application/json",
+    }).then(function (data) {
+      if (data.httpStatus !== 201) {
+        throw new Error(data.error || "Could not start upload");
+      }
+      self.id = data.id;
+      localStorage.setItem(sessionKey(self.file), self.id);
+      return self.send(data);
+    });
+  };
+
+  Upload.prototype.send = function (state) {
+    var self = this;
+    if (state.offset >= this.file.size) {
+      localStorage.removeItem(sessionKey(this.file));
+      this.report("uploaded, processing in the background");
+      return Promise.resolve();
+    }
+    var end = Math.min(state.offset + state.chunk_size, this.file.size);
+    this.report(Math.floor((state.offset / this.file.size) * 100) + "%");
+    return request("PUT", this.statusUrl(), this.file.slice(state.offset, end), {
+      "Content-Type": "application/octet-stream",
+      "Upload-Offset": String(state.offset),
+    })
+      .then(function (data) {
+        if (data.httpStatus !== 200 && data.httpStatus !== 409) {
+          throw new Error(data.error || "Upload failed");
+        }
+        self.retries = 0;
+        // 409 carries the offset the server expects; continue from there
+        return self.send(data);
+      })
+      .catch(function (error) {
+        if (++self.retries > MAX_RETRIES) {
+          throw error;
+        }
+        self.report("connection lost, retrying…");
+        return new Promise(function (resolve) {
+          setTimeout(resolve, RETRY_DELAY);
+        }).then(function () {
+          return request("GET", self.statusUrl()).then(function (data) {
+            return self.send(data);
+          });
+        });
+      });
+  };
+
+  document.addEventListener("DOMContentLoaded", function () {
+    var container = document.getElementById("gallery-upload");
+    if (!container) {
+      return;
+    }
+    var input = document.getElementById("gallery-upload-input");
+    var progress = document.getElementById("gallery-upload-progress");
+
+    input.addEventListener("change", function () {
+      var files = Array.prototype.slice.call(input.files);
+      input.value = "";
+      // One file at a time keeps each chunk request short on slow links
+      files.reduce(function (previous, file) {
+        var upload = new Upload(file, container, progress);
+        return previous.then(function () {
+          return upload.start().catch(function (error) {
+            upload.report("failed: " + error.message);
+          });
+        });
+      }, Promise.resolve());
+    });
+  });
+})();
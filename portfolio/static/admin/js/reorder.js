@@ -0,0 +1,69 @@
+/* Drag-and-drop reordering of categories, projects and gallery images. */
+(function () {
+  "use strict";
+
+  function csrfToken() {
+    var match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    return match ? decodeURIComponent(match[1]) : "";
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    var list = document.getElementById("reorder-list");
+    var save = document.getElementById("reorder-save");
+    var status = document.getElementById("reorder-status");
+    if (!list || !save) {
+      return;
+    }
+    var dragged = null;
+
+    list.addEventListener("dragstart", function (event) {
+      dragged = event.target.closest("li");
+      dragged.classList.add("dragging");
+      event.dataTransfer.effectAllowed = "move";
+    });
+
+    list.addEventListener("dragend", function () {
+      dragged.classList.remove("dragging");
+      dragged = null;
+    });
+
+    list.addEventListener("dragover", function (event) {
+      var target = event.target.closest("li");
+      if (!dragged || !target || target === dragged) {
+        return;
+      }
+      event.preventDefault();
+      var box = target.getBoundingClientRect();
+      var after = event.clientY > box.top + box.height / 2;
+      list.insertBefore(dragged, after ? target.nextSibling : target);
+      status.textContent = "Unsaved changes";
+    });
+
+    save.addEventListener("click", function () {
+      var ids = Array.prototype.map.call(list.querySelectorAll("li[data-pk]"), function (row) {
+        return Number(row.dataset.pk);
+      });
+      save.disabled = true;
+      status.textContent = "Saving…";
+      fetch(window.location.pathname, {
+        method: "POST",
+        body: JSON.stringify({ ids: ids }),
+        headers: { "Content-Type": "application/json", "X-CSRFToken": csrfToken() },
+        credentials: "same-origin",
+      })
+        .then(function (response) {
+          return response.json().then(function (data) {
+            status.textContent = response.ok
+              ? "Saved (" + data.updated + " row" + (data.updated === 1 ? "" : "s") + " updated)"
+              : "Error: " + data.error;
+          });
+        })
+        .catch(function () {
+          status.textContent = "Error: the order was not saved";
+        })
+        .then(function () {
+          save.disabled = false;
+        });
+    });
+  });
+})();
@@ -0,0 +1,142 @@
+{% autoescape off %}/* Service worker generated by manage.py build_service_worker; do not edit. */
+"use strict";
+
+var VERSION = {{ version_json }};
+var PRECACHE = "precache-" + VERSION;
+var PAGES = "pages-v1";
+var MEDIA = "media-v1";
+var CURRENT_CACHES = [PRECACHE, PAGES, MEDIA];
+
+// [url, revision] of every precached static file
+var PRECACHE_ENTRIES = {{ precache_json }};
+var PRECACHE_URLS = PRECACHE_ENTRIES.map(function (entry) {
+  return new URL(entry[0], self.location).href;
+});
+
+var PAGE_PATTERN = new RegExp({{ page_pattern_json }});
+var MEDIA_PREFIX = {{ media_prefix_json }};
+var MAX_PAGES = {{ max_pages }};
+var MAX_MEDIA = {{ max_media }};
+
+self.addEventListener("install", function (event) {
+  event.waitUntil(
+    caches.open(PRECACHE).then(function (cache) {
+      return cache.addAll(
+        PRECACHE_URLS.map(function (url) {
+          return new Request(url, { cache: "reload" });
+        })
+      );
+    }).then(function () {
+      return self.skipWaiting();
+    })
+  );
+});
+
+self.addEventListener("activate", function (event) {
+  event.waitUntil(
+    caches.keys().then(function (names) {
+      return Promise.all(
+        names.filter(function (name) {
+          return CURRENT_CACHES.indexOf(name) === -1;
+        }).map(function (name) {
+          return caches.delete(name);
+        })
+      );
+    }).then(function () {
+      return self.clients.claim();
+    })
+  );
+});
+
+function trim(cacheName, maxEntries) {
+  return caches.open(cacheName).then(function (cache) {
+    return cache.keys().then(function (keys) {
+      if (keys.length > maxEntries) {
+        return cache.delete(keys[0]).then(function () {
+          return trim(cacheName, maxEntries);
+        });
+      }
+    });
+  });
+}
+
+function isPage(url, request) {
+  return request.mode === "navigate" && PAGE_PATTERN.test(url.pathname);
+}
+
+// A page that varies on cookies (session, CSRF token) is not shared
+function isCacheable(response) {
+  var vary = (response.headers.get("Vary") || "").toLowerCase();
+  return response.ok && !/(^|,)\s*(cookie|\*)\s*(,|$)/.test(vary);
+}
+
+// Static files: served from the precache of this version
+function precached(request) {
+  return caches.open(PRECACHE).then(function (cache) {
+    return cache.match(request, { ignoreSearch: true }).then(function (response) {
+      return response || fetch(request);
+    });
+  });
+}
+
+// Content-addressed media never changes under the same URL
+function cacheFirst(event) {
+  return caches.open(MEDIA).then(function (cache) {
+    return cache.match(event.request).then(function (response) {
+      if (response) {
+        return response;
+      }
+      return fetch(event.request).then(function (response) {
+        if (response.ok) {
+          cache.put(event.request, response.clone());
+          event.waitUntil(trim(MEDIA, MAX_MEDIA));
+        }
+        return response;
+      });
+    });
+  });
+}
+
+// Portfolio pages: answer from the cache, refresh it in the background
+function staleWhileRevalidate(event) {
+  return caches.open(PAGES).then(function (cache) {
+    return cache.match(event.request).then(function (cached) {
+      var network = fetch(event.request).then(function (response) {
+        if (isCacheable(response)) {
+          return cache.put(event.request, response.clone()).then(function () {
+            return trim(PAGES, MAX_PAGES);
+          }).then(function () {
+            return response;
+          });
+        }
+        return response;
+      });
+      if (cached) {
+        event.waitUntil(network.catch(function () {}));
+        return cached;
+      }
+      return network;
+    });
+  });
+}
+
+self.addEventListener("fetch", function (event) {
+  var request = event.request;
+  if (request.method !== "GET") {
+    return;
+  }
+  var url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    return;
+  }
+  url.hash = "";
+  var withoutQuery = url.origin + url.pathname;
+  if (PRECACHE_URLS.indexOf(withoutQuery) !== -1) {
+    event.respondWith(precached(request));
+  } else if (url.pathname.indexOf(MEDIA_PREFIX) === 0) {
+    event.respondWith(cacheFirst(event));
+  } else if (isPage(url, request)) {
+    event.respondWith(staleWhileRevalidate(event));
+  }
+});
+{% endautoescape %}